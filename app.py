@@ -7,6 +7,7 @@ import streamlit as st
 import asyncio
 import os
 import sys
+import uuid
 from datetime import datetime
 
 # Add project root to path
@@ -33,6 +34,10 @@ if "messages" not in st.session_state:
     
 if "orchestrator" not in st.session_state:
     st.session_state.orchestrator = None
+
+# Each browser tab is its own conversation on the shared orchestrator
+if "session_id" not in st.session_state:
+    st.session_state.session_id = uuid.uuid4().hex
     
 if "query_count" not in st.session_state:
     st.session_state.query_count = 0
@@ -41,6 +46,12 @@ if "tools_used" not in st.session_state:
     st.session_state.tools_used = []
 
 
+@st.cache_resource(show_spinner=False)
+def get_shared_orchestrator(groq_api_key: str):
+    """One orchestrator (and one set of MCP servers) shared by all users."""
+    return CollegeAssistantOrchestrator(groq_api_key)
+
+
 def initialize_orchestrator():
     """Initialize the orchestrator with API key."""
     groq_api_key = os.getenv("GROQ_API_KEY")
@@ -52,7 +63,7 @@ def initialize_orchestrator():
     
     try:
         with st.spinner("🔧 Initializing AI Assistant..."):
-            st.session_state.orchestrator = CollegeAssistantOrchestrator(groq_api_key)
+            st.session_state.orchestrator = get_shared_orchestrator(groq_api_key)
         st.success("✅ Assistant ready!")
         return True
     except Exception as e:
@@ -62,7 +73,9 @@ def initialize_orchestrator():
 
 async def process_query_async(query: str):
     """Process user query asynchronously."""
-    return await st.session_state.orchestrator.process_query(query, verbose=False)
+    return await st.session_state.orchestrator.process_query(
+        st.session_state.session_id, query, verbose=False
+    )
 
 
 def process_query(query: str):
@@ -110,7 +123,7 @@ with st.sidebar:
     if st.button("🔄 Clear Chat", use_container_width=True):
         st.session_state.messages = []
         if st.session_state.orchestrator:
-            st.session_state.orchestrator.reset_conversation()
+            st.session_state.orchestrator.reset_conversation(st.session_state.session_id)
         st.rerun()
     
     st.markdown("---")
@@ -213,13 +226,14 @@ with tab1:
                 try:
                     # Process query - but we need to track tools used
                     # Store the conversation history before processing
-                    hist_before = len(st.session_state.orchestrator.conversation_history)
+                    session_id = st.session_state.session_id
+                    hist_before = len(st.session_state.orchestrator.get_history(session_id))
                     
                     response = process_query(user_input)
                     
                     # Extract tools used from conversation history
                     tools_in_this_query = []
-                    hist_after = st.session_state.orchestrator.conversation_history
+                    hist_after = st.session_state.orchestrator.get_history(session_id)
                     
                     # Find the assistant message with tool_calls
                     for msg in hist_after[hist_before:]:
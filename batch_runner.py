@@ -0,0 +1,216 @@
+"""
+Batch query runner
+Runs queries from a JSONL file through the orchestrator with several concurrent sessions,
+writes answers, tools used and per-stage timings to an output JSONL, and can resume
+
+Input lines:
+    {"id": "q1", "query": "What is the sick leave policy?"}
+    {"id": "q2", "query": "Who is EMP006's manager?", "session_id": "conv-7"}
+
+Lines sharing a session_id run in file order as one conversation; all other
+lines get a session of their own.
+
+Usage:
+    python batch_runner.py queries.jsonl -o answers.jsonl --concurrency 8
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from typing import Any, Dict, List
+
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from orchestrator import CollegeAssistantOrchestrator
+
+
+def load_queries(path: str) -> List[Dict[str, Any]]:
+    """Read input JSONL, filling in ids and session ids"""
+
+    queries = []
+    with open(path, "r", encoding="utf-8") as f:
+        for line_no, line in enumerate(f, 1):
+            if not line.strip():
+                continue
+            item = json.loads(line)
+            if "query" not in item:
+                raise ValueError(f"{path}:{line_no}: missing 'query'")
+            item["id"] = str(item.get("id", line_no))
+            item["session_id"] = item.get("session_id") or f"batch-{item['id']}"
+            queries.append(item)
+    return queries
+
+
+def load_completed(path: str) -> set:
+    """Ids already answered successfully in a previous run"""
+
+    done = set()
+    if not os.path.exists(path):
+        return done
+
+    with open(path, "r", encoding="utf-8") as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                # A line cut short by an interruption
+                continue
+            if not record.get("error"):
+                done.add(str(record["id"]))
+    return done
+
+
+def percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    index = min(int(round(pct / 100 * (len(ordered) - 1))), len(ordered) - 1)
+    return ordered[index]
+
+
+class BatchRunner:
+    """Processes session groups concurrently and appends results to a JSONL file"""
+
+    def __init__(self, orchestrator: CollegeAssistantOrchestrator, output_path: str,
+                 concurrency: int = 4, priority: int = 20):
+        self.orchestrator = orchestrator
+        self.output_path = output_path
+        self.semaphore = asyncio.Semaphore(concurrency)
+        # Batch work yields to interactive users in the admission queue
+        self.priority = priority
+        self.latencies: List[float] = []
+        self.errors = 0
+        self._end_partial_line()
+
+    def _end_partial_line(self):
+        """Terminate a line cut short by an interruption, so new records start on their own line"""
+        if not os.path.exists(self.output_path) or os.path.getsize(self.output_path) == 0:
+            return
+        with open(self.output_path, "rb+") as f:
+            f.seek(-1, os.SEEK_END)
+            if f.read(1) != b"\n":
+                f.write(b"\n")
+
+    def _write(self, record: Dict[str, Any]):
+        with open(self.output_path, "a", encoding="utf-8") as f:
+            f.write(json.dumps(record, default=str) + "\n")
+            f.flush()
+
+    async def run_one(self, item: Dict[str, Any]) -> Dict[str, Any]:
+        session_id = item["session_id"]
+        history_before = len(self.orchestrator.get_history(session_id))
+
+        start = time.perf_counter()
+        answer, error = None, None
+        try:
+            # Shed turns raise ServerBusy, so they are recorded as errors and
+            # retried on resume instead of saving the busy message as an answer
+            answer = await self.orchestrator.process_query(
+                session_id, item["query"], verbose=False, priority=self.priority,
+                raise_on_shed=True
+            )
+        except Exception as e:
+            error = f"{type(e).__name__}: {e}"
+        latency = time.perf_counter() - start
+
+        tools_used = []
+        for msg in self.orchestrator.get_history(session_id)[history_before:]:
+            if msg.get("role") == "assistant" and "tool_calls" in msg:
+                tools_used.extend(tc["function"]["name"] for tc in msg["tool_calls"])
+
+        return {
+            "id": item["id"],
+            "session_id": session_id,
+            "query": item["query"],
+            "answer": answer,
+            "tools_used": tools_used,
+            "latency_seconds": round(latency, 4),
+            "timings": self.orchestrator.get_last_turn_stats(session_id) if error is None else None,
+            "error": error
+        }
+
+    async def run_session(self, items: List[Dict[str, Any]], done: set):
+        async with self.semaphore:
+            for item in items:
+                record = await self.run_one(item)
+
+                # Earlier turns of a partly finished conversation are replayed
+                # to rebuild its history, but not written twice
+                if item["id"] in done:
+                    continue
+
+                self._write(record)
+                if record["error"]:
+                    self.errors += 1
+                    print(f"❌ {item['id']}: {record['error']}")
+                else:
+                    self.latencies.append(record["latency_seconds"])
+                    print(f"✅ {item['id']} ({record['latency_seconds']:.2f}s, "
+                          f"tools: {', '.join(record['tools_used']) or 'none'})")
+
+    async def run(self, queries: List[Dict[str, Any]], done: set):
+        sessions: Dict[str, List[Dict[str, Any]]] = {}
+        for item in queries:
+            sessions.setdefault(item["session_id"], []).append(item)
+
+        pending = [
+            items for items in sessions.values()
+            if not all(item["id"] in done for item in items)
+        ]
+
+        await asyncio.gather(*(self.run_session(items, done) for items in pending))
+
+
+async def main():
+    parser = argparse.ArgumentParser(
+        description="Run queries from a JSONL file through the orchestrator"
+    )
+    parser.add_argument("input", help="input JSONL with one {\"query\": ...} per line")
+    parser.add_argument("-o", "--output", default="batch_output.jsonl", help="output JSONL (appended)")
+    parser.add_argument("-c", "--concurrency", type=int, default=4, help="concurrent sessions")
+    parser.add_argument("--no-resume", action="store_true", help="ignore ids already in the output file")
+    args = parser.parse_args()
+
+    groq_api_key = os.getenv("GROQ_API_KEY")
+    if not groq_api_key and os.getenv("LLM_MODE", "live") != "replay":
+        print("❌ Error: GROQ_API_KEY not found in environment variables")
+        return
+
+    queries = load_queries(args.input)
+    done = set() if args.no_resume else load_completed(args.output)
+
+    print("\n" + "="*60)
+    print(f"📦 Batch run: {len(queries)} queries, {len(done)} already done, "
+          f"concurrency {args.concurrency}")
+    print("="*60 + "\n")
+
+    orchestrator = CollegeAssistantOrchestrator(groq_api_key)
+    runner = BatchRunner(orchestrator, args.output, args.concurrency)
+
+    start = time.perf_counter()
+    try:
+        await runner.run(queries, done)
+    except (KeyboardInterrupt, asyncio.CancelledError):
+        print("\n⏸️ Interrupted — rerun the same command to resume")
+    finally:
+        orchestrator.close()
+    elapsed = time.perf_counter() - start
+
+    completed = len(runner.latencies)
+    print("\n" + "="*60)
+    print("📊 Batch summary")
+    print("="*60)
+    print(f"   Completed:  {completed} ({runner.errors} errors)")
+    print(f"   Wall time:  {elapsed:.2f}s")
+    if elapsed > 0:
+        print(f"   Throughput: {completed / elapsed:.2f} queries/s")
+    for pct in (50, 90, 95, 99):
+        print(f"   p{pct}:        {percentile(runner.latencies, pct):.2f}s")
+    print(f"   Output:     {args.output}\n")
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
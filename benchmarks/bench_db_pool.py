@@ -0,0 +1,91 @@
+"""
+Benchmark: connection-per-query vs pooled SQLite connections
+
+Builds a large synthetic employee database in a temporary file and measures
+per-call latency of the database tools with a fresh connection per query
+(the old behaviour, pool_size=0) and with the pooled, WAL-tuned connections.
+
+Usage:
+    python benchmarks/bench_db_pool.py [--employees 100000] [--calls 2000]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+os.chdir(PROJECT_ROOT)
+
+from mcp_servers.database_server import DatabaseMCPServer
+from setup_database import department_names, generate_database
+
+DEPARTMENTS = department_names(8)
+
+
+def time_calls(fn, calls: int):
+    latencies = []
+    for i in range(calls):
+        start = time.perf_counter()
+        fn(i)
+        latencies.append((time.perf_counter() - start) * 1000)
+    latencies.sort()
+    return {
+        "mean": statistics.mean(latencies),
+        "p50": latencies[len(latencies) // 2],
+        "p95": latencies[int(len(latencies) * 0.95)]
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=100000)
+    parser.add_argument("--calls", type=int, default=2000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "employees.db")
+        print(f"📦 Building synthetic database ({args.employees} employees)...")
+        generate_database(db_path, args.employees, departments=len(DEPARTMENTS), verbose=False)
+        os.environ["EMPLOYEE_DB_PATH"] = db_path
+
+        rng = random.Random(1)
+        width = max(3, len(str(args.employees)))
+        ids = [f"EMP{rng.randint(1, args.employees):0{width}d}" for _ in range(args.calls)]
+
+        # Silence the per-call progress prints
+        stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+        try:
+            results = {}
+            for label, pool_size in (("per-call connect", 0), ("pooled", 4)):
+                server = DatabaseMCPServer(pool_size=pool_size)
+                results[label] = {
+                    "get_employee_info": time_calls(lambda i: server.get_employee_info(ids[i]), args.calls),
+                    "get_leave_balance": time_calls(lambda i: server.get_leave_balance(ids[i]), args.calls),
+                    "search_employees": time_calls(
+                        lambda i: server.search_employees(department=DEPARTMENTS[i % len(DEPARTMENTS)], limit=10),
+                        max(args.calls // 20, 10)
+                    )
+                }
+                server.pool.close()
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+
+    print(f"\n{'tool':<20} {'mode':<18} {'mean ms':>9} {'p50 ms':>9} {'p95 ms':>9}")
+    print("-" * 68)
+    for tool in ("get_employee_info", "get_leave_balance", "search_employees"):
+        for label, by_tool in results.items():
+            r = by_tool[tool]
+            print(f"{tool:<20} {label:<18} {r['mean']:9.3f} {r['p50']:9.3f} {r['p95']:9.3f}")
+        before = results["per-call connect"][tool]["mean"]
+        after = results["pooled"][tool]["mean"]
+        print(f"{'':<20} {'speedup':<18} {before / after:8.1f}x\n")
+
+
+if __name__ == "__main__":
+    main()
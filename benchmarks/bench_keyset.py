@@ -0,0 +1,117 @@
+"""
+Benchmark: OFFSET vs keyset pagination, and buffered vs streamed exports
+
+Pages through the employee directory of a large synthetic database with the
+old LIMIT/OFFSET query and with search_employees' keyset cursors, reporting
+the latency of pages at increasing depth. Then exports every employee once
+by fetching all rows into a list and once through iter_employees, reporting
+the peak Python memory of each.
+
+Usage:
+    python benchmarks/bench_keyset.py [--employees 200000] [--page-size 25]
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+import tracemalloc
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+os.chdir(PROJECT_ROOT)
+
+from mcp_servers.database_server import DEFAULT_EMPLOYEE_FIELDS, DatabaseMCPServer
+from setup_database import generate_database
+
+OFFSET_QUERY = """
+SELECT emp_id, name, department, position FROM employees
+ORDER BY name, emp_id LIMIT ? OFFSET ?
+"""
+
+
+def median_ms(fn, repeat: int = 5) -> float:
+    latencies = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        fn()
+        latencies.append((time.perf_counter() - start) * 1000)
+    return statistics.median(latencies)
+
+
+def peak_mb(fn) -> float:
+    tracemalloc.start()
+    try:
+        fn()
+        return tracemalloc.get_traced_memory()[1] / 1e6
+    finally:
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=200000)
+    parser.add_argument("--page-size", type=int, default=25)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "employees.db")
+        print(f"📦 Building synthetic database ({args.employees} employees)...")
+        generate_database(db_path, args.employees, verbose=False)
+        os.environ["EMPLOYEE_DB_PATH"] = db_path
+
+        stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+        try:
+            server = DatabaseMCPServer()
+            conn = sqlite3.connect(db_path)
+
+            # Keyset cursors for each depth, collected by paging through once
+            depths = [d for d in (1, 10, 100, 1000, 4000) if d * args.page_size < args.employees]
+            cursors, cursor, page = {}, None, 0
+            while page < max(depths):
+                page += 1
+                if page in depths:
+                    cursors[page] = cursor
+                cursor = server.search_employees(limit=args.page_size, cursor=cursor)["next_cursor"]
+
+            rows = []
+            for depth in depths:
+                offset = (depth - 1) * args.page_size
+                offset_ms = median_ms(lambda: conn.execute(OFFSET_QUERY, (args.page_size, offset)).fetchall())
+                keyset_ms = median_ms(lambda: server.search_employees(limit=args.page_size, cursor=cursors[depth]))
+                rows.append((depth, offset, offset_ms, keyset_ms))
+
+            def buffered():
+                columns = ", ".join(DEFAULT_EMPLOYEE_FIELDS).replace("employee_id", "emp_id")
+                results = conn.execute(f"SELECT {columns} FROM employees ORDER BY name, emp_id").fetchall()
+                return len([dict(zip(DEFAULT_EMPLOYEE_FIELDS, row)) for row in results])
+
+            def streamed():
+                return sum(len(chunk) for chunk in server.iter_employees(chunk_size=1000))
+
+            export = {
+                "fetchall + list": (median_ms(buffered, 1), peak_mb(buffered)),
+                "iter_employees": (median_ms(streamed, 1), peak_mb(streamed))
+            }
+            conn.close()
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+
+    print(f"\n{'page':>6} {'offset':>9} {'OFFSET ms':>10} {'keyset ms':>10} {'speedup':>8}")
+    print("-" * 48)
+    for depth, offset, offset_ms, keyset_ms in rows:
+        print(f"{depth:6d} {offset:9d} {offset_ms:10.3f} {keyset_ms:10.3f} {offset_ms / keyset_ms:7.1f}x")
+
+    print(f"\n{'export':<18} {'seconds':>9} {'peak MB':>9}")
+    print("-" * 38)
+    for label, (ms, mb) in export.items():
+        print(f"{label:<18} {ms / 1000:9.2f} {mb:9.1f}")
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""
+Benchmark: LIKE '%term%' scan vs FTS5 name search
+
+Runs the same name searches through search_employees on a large synthetic
+database, once with the LIKE fallback and once with the bm25-ranked FTS5
+index, and reports latency plus how many results each path returns.
+
+Usage:
+    python benchmarks/bench_name_search.py [--employees 100000] [--repeat 20]
+"""
+
+import argparse
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+os.chdir(PROJECT_ROOT)
+
+from mcp_servers.database_server import DatabaseMCPServer
+from setup_database import generate_database
+
+
+def pick_searches(db_path: str):
+    """Full names, surnames and prefixes that exist in the synthetic data"""
+    conn = sqlite3.connect(db_path)
+    total = conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0]
+    # Spread over the table, whatever its size (rows repeat on tiny databases)
+    names = [conn.execute("SELECT name FROM employees ORDER BY rowid LIMIT 1 OFFSET ?",
+                          ((total * k // 4 + 100) % total,)).fetchone()[0]
+             for k in range(3)]
+    conn.close()
+
+    first, last = names[0].split()[0], names[0].split()[-1]
+    return [names[1], names[2].split()[-1], f"{first} {last[:3]}", last[:4], first, "me"]
+
+
+def time_search(server: DatabaseMCPServer, term: str, repeat: int):
+    latencies, count = [], 0
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = server.search_employees(name_contains=term, limit=25)
+        latencies.append((time.perf_counter() - start) * 1000)
+        count = result["count"]
+    return statistics.median(latencies), count
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--employees", type=int, default=100000)
+    parser.add_argument("--repeat", type=int, default=20)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "employees.db")
+        print(f"📦 Building synthetic database ({args.employees} employees)...")
+        generate_database(db_path, args.employees, verbose=False)
+
+        os.environ["EMPLOYEE_DB_PATH"] = db_path
+        stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+        try:
+            server = DatabaseMCPServer()
+            rows = []
+            for term in pick_searches(db_path):
+                server.full_text = False
+                like_ms, like_count = time_search(server, term, args.repeat)
+                server.full_text = True
+                fts_ms, fts_count = time_search(server, term, args.repeat)
+                rows.append((term, like_ms, like_count, fts_ms, fts_count))
+        finally:
+            sys.stdout.close()
+            sys.stdout = stdout
+
+    print(f"\n{'search':<14} {'LIKE ms':>9} {'rows':>5} {'FTS5 ms':>9} {'rows':>5} {'speedup':>8}")
+    print("-" * 56)
+    for term, like_ms, like_count, fts_ms, fts_count in rows:
+        print(f"{term:<14} {like_ms:9.3f} {like_count:5d} {fts_ms:9.3f} {fts_count:5d} "
+              f"{like_ms / fts_ms:7.1f}x")
+    print("\nrows = first page (limit 25). LIKE matches substrings anywhere; FTS5 matches "
+          "word prefixes, best bm25 matches first.\n")
+
+
+if __name__ == "__main__":
+    main()
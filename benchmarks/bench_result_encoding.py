@@ -0,0 +1,165 @@
+"""
+Benchmark: JSON vs compact tabular encoding of tool results
+
+Measures prompt tokens for each tool payload on the bundled data and checks
+answer parity: offline, every value the model could need must still be present;
+with --llm (needs GROQ_API_KEY), the same question is answered from both
+encodings and the answers are compared against expected facts.
+
+Usage:
+    python benchmarks/bench_result_encoding.py [--llm]
+"""
+
+import argparse
+import json
+import os
+import re
+import shutil
+import sys
+import tempfile
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+os.chdir(PROJECT_ROOT)
+
+from mcp_servers.database_server import DatabaseMCPServer
+from mcp_servers.filesystem_server import FilesystemMCPServer
+from orchestration.encoding import BOOKKEEPING_KEYS, encode_compact
+
+try:
+    import tiktoken
+    _ENCODER = tiktoken.get_encoding("cl100k_base")
+
+    def count_tokens(text: str) -> int:
+        return len(_ENCODER.encode(text))
+
+    TOKENIZER = "tiktoken cl100k_base"
+except ImportError:
+    _TOKEN_RE = re.compile(r"\w+|[^\w\s]")
+
+    def count_tokens(text: str) -> int:
+        return len(_TOKEN_RE.findall(text))
+
+    TOKENIZER = "regex approximation (pip install tiktoken for exact counts)"
+
+
+# (label, callable, question, facts the answer must mention)
+def build_cases(db: DatabaseMCPServer, fs: FilesystemMCPServer):
+    return [
+        ("all employees", lambda: db.search_employees(limit=200),
+         "List every employee in Finance with their position.",
+         ["Rahul Gupta", "Meera Nair"]),
+        ("engineering", lambda: db.search_employees(department="Engineering"),
+         "Who is the DevOps Engineer?",
+         ["Amit Patel"]),
+        ("all fields", lambda: db.search_employees(fields=["employee_id", "name", "email", "manager"], limit=200),
+         "What is Sneha Reddy's email address?",
+         ["sneha.reddy@company.com"]),
+        ("employee info", lambda: db.get_employee_info("EMP006"),
+         "Who is EMP006's manager?",
+         ["EMP001"]),
+        ("department summary", lambda: db.get_department_summary(),
+         "How many people work in Engineering?",
+         ["3"]),
+        ("announcements", lambda: fs.list_announcements(),
+         "Which announcement files exist?",
+         ["holiday_2024.txt", "team_event.txt"]),
+    ]
+
+
+def _values(data):
+    """All scalar values the model could be asked about"""
+    if isinstance(data, dict):
+        for key, value in data.items():
+            if key in BOOKKEEPING_KEYS:
+                continue
+            yield from _values(value)
+    elif isinstance(data, list):
+        for item in data:
+            yield from _values(item)
+    elif data is not None and not isinstance(data, bool):
+        yield str(data)
+
+
+def offline_parity(result, encoded: str) -> bool:
+    return all(value in encoded for value in _values(result))
+
+
+def llm_answer(client, question: str, payload: str) -> str:
+    response = client.chat.completions.create(
+        model="llama-3.3-70b-versatile",
+        messages=[
+            {"role": "system", "content": "Answer using only the tool result provided."},
+            {"role": "user", "content": f"Tool result:\n{payload}\n\nQuestion: {question}"}
+        ],
+        max_tokens=300,
+        temperature=0
+    )
+    return response.choices[0].message.content or ""
+
+
+def report(db, fs, llm: bool):
+    client = None
+    if llm:
+        from groq import Groq
+        client = Groq(api_key=os.getenv("GROQ_API_KEY"))
+
+    print("\n" + "="*72)
+    print(f"📏 Tool payload tokens — {TOKENIZER}")
+    print("="*72)
+    print(f"{'case':<20}{'json':>8}{'compact':>9}{'saved':>8}  parity")
+    print("-"*72)
+
+    total_json = total_compact = 0
+    all_parity = True
+
+    for label, call, question, facts in build_cases(db, fs):
+        result = call()
+        as_json = json.dumps(result)
+        as_compact = encode_compact(result)
+
+        tokens_json = count_tokens(as_json)
+        tokens_compact = count_tokens(as_compact)
+        total_json += tokens_json
+        total_compact += tokens_compact
+
+        parity = offline_parity(result, as_compact)
+        if client:
+            answer_json = llm_answer(client, question, as_json)
+            answer_compact = llm_answer(client, question, as_compact)
+            parity = parity and all(
+                (fact in answer_json) == (fact in answer_compact) for fact in facts
+            )
+        all_parity = all_parity and parity
+
+        saved = 1 - tokens_compact / tokens_json if tokens_json else 0.0
+        print(f"{label:<20}{tokens_json:>8}{tokens_compact:>9}{saved:>7.0%}  {'✅' if parity else '❌'}")
+
+    print("-"*72)
+    saved = 1 - total_compact / total_json if total_json else 0.0
+    print(f"{'TOTAL':<20}{total_json:>8}{total_compact:>9}{saved:>7.0%}  {'✅' if all_parity else '❌'}")
+    print("="*72 + "\n")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--llm", action="store_true", help="also compare real answers via Groq")
+    args = parser.parse_args()
+
+    # DatabaseMCPServer migrates its database on startup; work on a copy so
+    # the bundled data/employees.db stays untouched
+    with tempfile.TemporaryDirectory() as tmp:
+        db_path = os.path.join(tmp, "employees.db")
+        shutil.copy(os.getenv("EMPLOYEE_DB_PATH", "data/employees.db"), db_path)
+        os.environ["EMPLOYEE_DB_PATH"] = db_path
+
+        db = DatabaseMCPServer()
+        try:
+            report(db, FilesystemMCPServer(), args.llm)
+        finally:
+            db.pool.close()
+            db.cache.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,122 @@
+"""
+Benchmark: sequential vs concurrent MCP server startup
+
+Cold start runs each mode in a fresh Python process (imports, embedding model and
+Chroma load included); warm start repeats the construction inside one process
+once everything is imported and cached. Reports per-server startup seconds, time
+until the first server can answer queries, and time until all are ready.
+
+Usage:
+    python benchmarks/bench_startup.py [--repeat 3] [--skip-cold]
+"""
+
+import argparse
+import json
+import os
+import subprocess
+import sys
+import time
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+os.chdir(PROJECT_ROOT)
+
+SERVER_NAMES = ("database", "filesystem", "rag")
+
+
+def server_factories():
+    from mcp_servers.database_server import DatabaseMCPServer
+    from mcp_servers.filesystem_server import FilesystemMCPServer
+    from mcp_servers.rag_server import RAGServer
+
+    return {"database": DatabaseMCPServer, "filesystem": FilesystemMCPServer, "rag": RAGServer}
+
+
+def run_sequential(start: float):
+    """Build servers one after another, as the orchestrator used to"""
+
+    timings, ready_at = {}, {}
+    for name, factory in server_factories().items():
+        server_start = time.perf_counter()
+        factory()
+        timings[name] = time.perf_counter() - server_start
+        ready_at[name] = time.perf_counter() - start
+    return timings, ready_at
+
+
+def run_parallel(start: float):
+    """Build servers with ServerStartup and wait for all of them"""
+
+    from orchestration.startup import ServerStartup
+
+    startup = ServerStartup(server_factories())
+    startup.wait()
+    # Count imports (cold start) in ready_at, like the sequential run
+    offset = startup.started - start
+    return startup.timings, {name: at + offset for name, at in startup.ready_at.items()}
+
+
+def measure(mode: str, start: float):
+    # Server progress prints would drown the report
+    stdout, sys.stdout = sys.stdout, open(os.devnull, "w")
+    try:
+        timings, ready_at = (run_parallel if mode == "parallel" else run_sequential)(start)
+    finally:
+        sys.stdout.close()
+        sys.stdout = stdout
+
+    return {
+        "servers": {name: round(timings[name], 3) for name in SERVER_NAMES},
+        "first_ready": round(min(ready_at.values()), 3),
+        "all_ready": round(max(ready_at.values()), 3)
+    }
+
+
+def cold(mode: str):
+    """Measure one mode in a fresh interpreter"""
+
+    output = subprocess.run(
+        [sys.executable, os.path.abspath(__file__), "--child", mode],
+        capture_output=True, text=True, check=True
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def print_row(label: str, result):
+    servers = "  ".join(f"{name} {result['servers'][name]:6.2f}s" for name in SERVER_NAMES)
+    print(f"{label:<22} first ready {result['first_ready']:6.2f}s   "
+          f"all ready {result['all_ready']:6.2f}s   ({servers})")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--repeat", type=int, default=3, help="warm runs per mode (best is reported)")
+    parser.add_argument("--skip-cold", action="store_true", help="only measure warm starts")
+    parser.add_argument("--child", choices=("sequential", "parallel"), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        start = time.perf_counter()
+        print(json.dumps(measure(args.child, start)))
+        return
+
+    print("\n" + "="*60)
+    print("🚀 MCP server startup")
+    print("="*60)
+
+    if not args.skip_cold:
+        print("\nCold start (fresh process, imports included)")
+        for mode in ("sequential", "parallel"):
+            print_row(mode, cold(mode))
+
+    print(f"\nWarm start (best of {args.repeat})")
+    # Import everything and load the models once
+    measure("sequential", time.perf_counter())
+    for mode in ("sequential", "parallel"):
+        runs = [measure(mode, time.perf_counter()) for _ in range(args.repeat)]
+        print_row(mode, min(runs, key=lambda r: r["all_ready"]))
+    print()
+
+
+if __name__ == "__main__":
+    main()
@@ -4,13 +4,61 @@ Provides tools to query employee information and leave balances
 """
 
 import os
+import sys
 import sqlite3
-from typing import Dict, List, Optional
-from datetime import datetime
+from contextlib import nullcontext
+from typing import Dict, Iterator, List, Optional, Sequence
+from datetime import date, datetime
 from dotenv import load_dotenv
 
+# Add project root to path (also when run as a script)
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_servers.department_stats import has_department_stats, stats_source
+from mcp_servers.employee_cache import DEFAULT_CACHE_SIZE, EmployeeCache
+from mcp_servers.employee_search import BM25_WEIGHTS, FTS_TABLE, build_match_query, has_search_index
+from mcp_servers.migrations import LATEST_VERSION, migrate
+from mcp_servers.org_hierarchy import MAX_DEPTH, chain_cte, has_hierarchy, reports_cte
+from mcp_servers.pagination import clamp_limit, decode_keyset_cursor, encode_cursor, resolve_fields
+from mcp_servers.sqlite_pool import DEFAULT_POOL_SIZE, SQLitePool
+
 load_dotenv()
 
+# Result field -> employees column, for field projection
+EMPLOYEE_FIELDS = {
+    "employee_id": "emp_id",
+    "name": "name",
+    "department": "department",
+    "position": "position",
+    "join_date": "join_date",
+    "manager": "manager",
+    "email": "email"
+}
+DEFAULT_EMPLOYEE_FIELDS = ["employee_id", "name", "department", "position"]
+
+# Most IDs one bulk lookup accepts
+MAX_BULK_IDS = 100
+
+
+def normalize_ids(employee_ids) -> List[str]:
+    """
+    Clean up a bulk lookup's ID list: a list or comma-separated string,
+    stripped and de-duplicated in order
+    
+    Raises:
+        ValueError: If there are no IDs or more than MAX_BULK_IDS
+    """
+    
+    if isinstance(employee_ids, str):
+        employee_ids = employee_ids.split(",")
+    ids = list(dict.fromkeys(str(i).strip() for i in employee_ids or [] if str(i).strip()))
+    
+    if not ids:
+        raise ValueError("employee_ids must contain at least one ID")
+    if len(ids) > MAX_BULK_IDS:
+        raise ValueError(f"At most {MAX_BULK_IDS} employee IDs per call (got {len(ids)})")
+    return ids
+
 class DatabaseMCPServer:
     """
     Employee Database as MCP-style server
@@ -19,15 +67,33 @@ class DatabaseMCPServer:
     1. get_employee_info - Get employee details by ID
     2. get_leave_balance - Get leave balance for employee
     3. get_department_summary - Get employee count by department
+    4. search_employees - Search employees by department or name
+    5. get_reports - Direct and indirect reports of a manager
+    6. get_management_chain - An employee's managers up to the CEO
+    7. get_team_size - How many people report to a manager
+    8. get_department_stats - Headcount, tenure and leave totals per department
+    9. get_employees_info - Employee details for many IDs at once
+    10. get_leave_balances - Leave balances for many IDs at once
     """
     
-    def __init__(self):
-        """Initialize database connection"""
+    def __init__(self, pool_size: Optional[int] = None, cache_size: Optional[int] = None):
+        """
+        Initialize database connection
+        
+        Args:
+            pool_size: Long-lived read connections to keep (default DB_POOL_SIZE or 4;
+                       0 opens a new connection per query)
+            cache_size: Employee and leave balance lookups to cache (default
+                        EMPLOYEE_CACHE_SIZE or 1024; 0 disables the cache)
+        """
         
         print("🔄 Initializing Database Server...")
         
         self.db_path = os.getenv("EMPLOYEE_DB_PATH", "data/employees.db")
         
+        # Optional orchestration.tracing.Tracer, attached by the orchestrator
+        self.tracer = None
+        
         # Verify database exists
         if not os.path.exists(self.db_path):
             raise FileNotFoundError(
@@ -35,22 +101,78 @@ class DatabaseMCPServer:
                 f"   Please run: python setup_database.py"
             )
         
+        # Bring the schema up to date; name search falls back to LIKE if the
+        # full-text index is missing, org-chart tools to recursive queries if
+        # the closure table is, department stats to a GROUP BY scan
+        self.full_text, self.closure, self.department_stats = self._migrate()
+        
+        if pool_size is None:
+            pool_size = int(os.getenv("DB_POOL_SIZE", str(DEFAULT_POOL_SIZE)))
+        self.pool = SQLitePool(self.db_path, pool_size)
+        
+        if cache_size is None:
+            cache_size = int(os.getenv("EMPLOYEE_CACHE_SIZE", str(DEFAULT_CACHE_SIZE)))
+        self.cache = EmployeeCache(self.db_path, cache_size)
+        
         # Test connection
         try:
-            conn = sqlite3.connect(self.db_path)
-            cursor = conn.cursor()
-            cursor.execute("SELECT COUNT(*) FROM employees")
-            emp_count = cursor.fetchone()[0]
-            conn.close()
+            with self.pool.connection() as conn:
+                emp_count = conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0]
             print(f"✅ Connected to database ({emp_count} employees)")
         except Exception as e:
             raise ConnectionError(f"❌ Database connection failed: {e}")
         
         print("✅ Database Server initialized successfully!")
     
+    def _migrate(self):
+        """
+        Apply pending schema migrations (needs write access to the database)
+        
+        Returns:
+            Whether the full-text search index, org-chart closure table and
+            department_stats table are available
+        """
+        
+        conn = sqlite3.connect(self.db_path)
+        try:
+            try:
+                migrate(conn)
+            except sqlite3.Error as e:
+                print(f"  ⚠️ Could not migrate database to version {LATEST_VERSION}: {e}")
+            return has_search_index(conn), has_hierarchy(conn), has_department_stats(conn)
+        finally:
+            conn.close()
+    
     def _get_connection(self):
-        """Get database connection"""
-        return sqlite3.connect(self.db_path)
+        """Borrow a pooled database connection (use as a context manager)"""
+        return self.pool.connection()
+    
+    def _span(self, name: str, **attributes):
+        """Open a tracing span if a tracer is attached"""
+        if self.tracer is None:
+            return nullcontext()
+        return self.tracer.span(name, **attributes)
+    
+    def _query(self, tool: str, sql: str, params=(), fetch: str = "all"):
+        """
+        Run one SQL query and return its rows
+        
+        Args:
+            tool: Name of the calling tool (recorded on the trace span)
+            sql: SQL statement
+            params: Query parameters
+            fetch: "all" for a list of rows, "one" for a single row (or None)
+        """
+        
+        with self._span("db.query", tool=tool) as span:
+            with self._get_connection() as conn:
+                cursor = conn.execute(sql, params)
+                rows = cursor.fetchone() if fetch == "one" else cursor.fetchall()
+            
+            if span:
+                span.set(rows=(1 if rows else 0) if fetch == "one" else len(rows))
+        
+        return rows
     
     def get_employee_info(self, employee_id: str) -> Dict:
         """
@@ -65,18 +187,16 @@ class DatabaseMCPServer:
         
         print(f"  👤 Getting info for employee: {employee_id}")
         
+        return self.cache.get(("get_employee_info", employee_id),
+                              lambda: self._load_employee_info(employee_id))
+    
+    def _load_employee_info(self, employee_id: str) -> Dict:
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
+            result = self._query("get_employee_info", """
             SELECT emp_id, name, department, position, join_date, manager, email
             FROM employees
             WHERE emp_id = ?
-            """, (employee_id,))
-            
-            result = cursor.fetchone()
-            conn.close()
+            """, (employee_id,), fetch="one")
             
             if result:
                 return {
@@ -118,20 +238,18 @@ class DatabaseMCPServer:
         
         print(f"  📊 Getting leave balance for: {employee_id}")
         
+        return self.cache.get(("get_leave_balance", employee_id),
+                              lambda: self._load_leave_balance(employee_id))
+    
+    def _load_leave_balance(self, employee_id: str) -> Dict:
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            
             # Get employee name + leave balance
-            cursor.execute("""
+            result = self._query("get_leave_balance", """
             SELECT e.name, l.casual_leave, l.earned_leave, l.sick_leave, l.last_updated
             FROM employees e
             JOIN leave_balance l ON e.emp_id = l.emp_id
             WHERE e.emp_id = ?
-            """, (employee_id,))
-            
-            result = cursor.fetchone()
-            conn.close()
+            """, (employee_id,), fetch="one")
             
             if result:
                 total_leaves = result[1] + result[2] + result[3]
@@ -162,6 +280,100 @@ class DatabaseMCPServer:
                 "tool": "get_leave_balance"
             }
     
+    def get_employees_info(self, employee_ids: List[str]) -> Dict:
+        """
+        Tool 9: Get details for several employees in one query
+        
+        Args:
+            employee_ids: Employee IDs (at most MAX_BULK_IDS)
+        
+        Returns:
+            Dict with the employees found, in request order, and the IDs not found
+        """
+        
+        print(f"  👥 Getting info for {len(employee_ids or [])} employees")
+        
+        try:
+            ids = normalize_ids(employee_ids)
+            placeholders = ", ".join("?" * len(ids))
+            results = self._query("get_employees_info", f"""
+            SELECT emp_id, name, department, position, join_date, manager, email
+            FROM employees
+            WHERE emp_id IN ({placeholders})
+            """, ids)
+            
+            by_id = {
+                row[0]: dict(zip(("employee_id", "name", "department", "position",
+                                  "join_date", "manager", "email"), row))
+                for row in results
+            }
+            employees = [by_id[i] for i in ids if i in by_id]
+            
+            return {
+                "employees": employees,
+                "count": len(employees),
+                "not_found": [i for i in ids if i not in by_id],
+                "tool": "get_employees_info"
+            }
+            
+        except Exception as e:
+            return {
+                "error": True,
+                "message": str(e),
+                "tool": "get_employees_info"
+            }
+    
+    def get_leave_balances(self, employee_ids: List[str]) -> Dict:
+        """
+        Tool 10: Get leave balances for several employees in one query
+        
+        Args:
+            employee_ids: Employee IDs (at most MAX_BULK_IDS)
+        
+        Returns:
+            Dict with the balances found, in request order, and the IDs not found
+        """
+        
+        print(f"  📊 Getting leave balances for {len(employee_ids or [])} employees")
+        
+        try:
+            ids = normalize_ids(employee_ids)
+            placeholders = ", ".join("?" * len(ids))
+            results = self._query("get_leave_balances", f"""
+            SELECT e.emp_id, e.name, l.casual_leave, l.earned_leave, l.sick_leave, l.last_updated
+            FROM employees e
+            JOIN leave_balance l ON e.emp_id = l.emp_id
+            WHERE e.emp_id IN ({placeholders})
+            """, ids)
+            
+            by_id = {
+                row[0]: {
+                    "employee_id": row[0],
+                    "name": row[1],
+                    "casual_leave": row[2],
+                    "earned_leave": row[3],
+                    "sick_leave": row[4],
+                    "total_leaves": row[2] + row[3] + row[4],
+                    "last_updated": row[5]
+                }
+                for row in results
+            }
+            balances = [by_id[i] for i in ids if i in by_id]
+            
+            return {
+                "balances": balances,
+                "count": len(balances),
+                "not_found": [i for i in ids if i not in by_id],
+                "tool": "get_leave_balances"
+            }
+            
+        except Exception as e:
+            return {
+                "error": True,
+                "message": str(e),
+                "tool": "get_leave_balances"
+            }
+    
     def get_department_summary(self) -> Dict:
         """
         Tool 3: Get employee count by department
@@ -173,19 +385,12 @@ class DatabaseMCPServer:
         print("  📈 Getting department summary...")
         
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
-            
-            cursor.execute("""
-            SELECT department, COUNT(*) as count
-            FROM employees
-            GROUP BY department
-            ORDER BY count DESC
+            results = self._query("get_department_summary", f"""
+            SELECT department, headcount
+            FROM {stats_source(self.department_stats)}
+            ORDER BY headcount DESC, department
             """)
             
-            results = cursor.fetchall()
-            conn.close()
-            
             departments = {}
             total_employees = 0
             
@@ -207,65 +412,374 @@ class DatabaseMCPServer:
                 "tool": "get_department_summary"
             }
     
+    def get_department_stats(self, department: Optional[str] = None) -> Dict:
+        """
+        Tool 8: Headcount, average tenure and remaining leave per department
+        
+        Args:
+            department: Only this department (optional; default all)
+        
+        Returns:
+            Dict with one entry per department
+        """
+        
+        print(f"  📊 Getting department stats (dept={department})")
+        
+        try:
+            query = f"SELECT * FROM {stats_source(self.department_stats)}"
+            params = ()
+            if department:
+                query += " WHERE department = ?"
+                params = (department,)
+            results = self._query("get_department_stats", query + " ORDER BY headcount DESC, department",
+                                  params)
+            
+            if department and not results:
+                return {
+                    "department": department,
+                    "found": False,
+                    "message": f"Department {department} not found",
+                    "tool": "get_department_stats"
+                }
+            
+            today = (date.today() - date(1970, 1, 1)).days
+            departments = {}
+            for name, headcount, join_days, casual, earned, sick, with_balance in results:
+                departments[name] = {
+                    "headcount": headcount,
+                    "average_tenure_years": round((today - join_days / headcount) / 365.25, 1),
+                    "casual_leave_remaining": casual,
+                    "earned_leave_remaining": earned,
+                    "sick_leave_remaining": sick,
+                    "average_leave_remaining": round((casual + earned + sick) / with_balance, 1)
+                                               if with_balance else None
+                }
+            
+            return {
+                "departments": departments,
+                "department_count": len(departments),
+                "found": True,
+                "tool": "get_department_stats"
+            }
+            
+        except Exception as e:
+            return {
+                "error": True,
+                "message": str(e),
+                "tool": "get_department_stats"
+            }
+    
+    def _employee_page(self,
+                       department: Optional[str],
+                       name_contains: Optional[str],
+                       fields: List[str],
+                       limit: int,
+                       after: Optional[Sequence] = None):
+        """
+        One keyset page of matching employees
+        
+        Rows are ordered by (name, emp_id), or by (bm25 rank, name, emp_id) for
+        full-text matches; each page seeks past the previous page's last key
+        instead of skipping rows with OFFSET.
+        
+        Args:
+            after: Sort key of the previous page's last row (None for the first page)
+        
+        Returns:
+            (employees, sort key of the last row if more rows follow, else None)
+        """
+        
+        columns = ", ".join(f"e.{EMPLOYEE_FIELDS[f]}" for f in fields)
+        match = build_match_query(name_contains, "name") if name_contains and self.full_text else None
+        params = []
+        
+        if match:
+            # Index lookup, ranked by bm25 (name hits weigh most)
+            weights = ", ".join(str(w) for w in BM25_WEIGHTS)
+            key = [f"bm25({FTS_TABLE}, {weights})", "e.name", "e.emp_id"]
+            query = (f"SELECT {columns}, {', '.join(key)} FROM {FTS_TABLE} "
+                     f"JOIN employees e ON e.rowid = {FTS_TABLE}.rowid "
+                     f"WHERE {FTS_TABLE} MATCH ?")
+            params.append(match)
+        else:
+            key = ["e.name", "e.emp_id"]
+            query = f"SELECT {columns}, {', '.join(key)} FROM employees e WHERE 1=1"
+            if name_contains:
+                query += " AND e.name LIKE ?"
+                params.append(f"%{name_contains}%")
+        
+        if department:
+            query += " AND e.department = ?"
+            params.append(department)
+        
+        if after is not None:
+            if len(after) != len(key):
+                raise ValueError("Cursor does not belong to this search")
+            query += f" AND ({', '.join(key)}) > ({', '.join('?' * len(key))})"
+            params.extend(after)
+        
+        # One extra row tells us whether another page exists
+        query += f" ORDER BY {', '.join(key)} LIMIT ?"
+        params.append(limit + 1)
+        
+        results = self._query("search_employees", query, params)
+        
+        next_after = None
+        if len(results) > limit:
+            results = results[:limit]
+            next_after = list(results[-1][-len(key):])
+        
+        employees = [dict(zip(fields, row)) for row in results]
+        return employees, next_after
+    
     def search_employees(self, 
                         department: Optional[str] = None,
-                        name_contains: Optional[str] = None) -> Dict:
+                        name_contains: Optional[str] = None,
+                        fields: Optional[List[str]] = None,
+                        limit: Optional[int] = None,
+                        cursor: Optional[str] = None) -> Dict:
         """
         Tool 4 (Bonus): Search employees by criteria
         
         Args:
             department: Filter by department
-            name_contains: Filter by name (partial match)
+            name_contains: Filter by name (word or prefix match, best matches first)
+            fields: Fields to return per employee (default: id, name, department, position)
+            limit: Page size (default 25, max 200)
+            cursor: next_cursor from a previous page
         
         Returns:
-            Dict with matching employees
+            Dict with one page of matching employees and a next_cursor
         """
         
         print(f"  🔍 Searching employees (dept={department}, name={name_contains})")
         
         try:
-            conn = self._get_connection()
-            cursor = conn.cursor()
+            fields = resolve_fields(fields, list(EMPLOYEE_FIELDS), DEFAULT_EMPLOYEE_FIELDS)
+            employees, next_after = self._employee_page(
+                department, name_contains, fields, clamp_limit(limit),
+                decode_keyset_cursor(cursor)
+            )
             
-            query = "SELECT emp_id, name, department, position FROM employees WHERE 1=1"
-            params = []
+            return {
+                "employees": employees,
+                "count": len(employees),
+                "next_cursor": encode_cursor({"after": next_after}) if next_after else None,
+                "tool": "search_employees"
+            }
             
-            if department:
-                query += " AND department = ?"
-                params.append(department)
+        except Exception as e:
+            return {
+                "error": True,
+                "message": str(e),
+                "tool": "search_employees"
+            }
+    
+    def iter_employees(self,
+                       department: Optional[str] = None,
+                       name_contains: Optional[str] = None,
+                       fields: Optional[List[str]] = None,
+                       chunk_size: int = 1000) -> Iterator[List[Dict]]:
+        """
+        Stream every matching employee in chunks (for exports and batch jobs)
+        
+        Each chunk is its own keyset query, so memory stays at one chunk and no
+        connection or read transaction is held between chunks.
+        
+        Args:
+            department: Filter by department
+            name_contains: Filter by name (same matching as search_employees)
+            fields: Fields per employee (default: id, name, department, position)
+            chunk_size: Employees per yielded list
+        
+        Yields:
+            Lists of up to chunk_size employee dicts, in search_employees order
+        
+        Raises:
+            ValueError: If a requested field is unknown
+        """
+        
+        fields = resolve_fields(fields, list(EMPLOYEE_FIELDS), DEFAULT_EMPLOYEE_FIELDS)
+        chunk_size = max(1, int(chunk_size))
+        after = None
+        
+        while True:
+            employees, after = self._employee_page(department, name_contains, fields, chunk_size, after)
+            if employees:
+                yield employees
+            if after is None:
+                return
+    
+    def _employee_exists(self, tool: str, employee_id: str) -> bool:
+        return self._query(tool, "SELECT 1 FROM employees WHERE emp_id = ?",
+                           (employee_id,), fetch="one") is not None
+    
+    def _not_found(self, tool: str, employee_id: str) -> Dict:
+        return {
+            "employee_id": employee_id,
+            "found": False,
+            "message": f"Employee {employee_id} not found",
+            "tool": tool
+        }
+    
+    def get_reports(self,
+                    employee_id: str,
+                    direct_only: bool = False,
+                    fields: Optional[List[str]] = None,
+                    limit: Optional[int] = None,
+                    cursor: Optional[str] = None) -> Dict:
+        """
+        Tool 5: Everyone who reports to a manager, directly or indirectly
+        
+        Args:
+            employee_id: Manager's employee ID (e.g., EMP010)
+            direct_only: Only direct reports
+            fields: Fields to return per employee (default: id, name, department, position)
+            limit: Page size (default 25, max 200)
+            cursor: next_cursor from a previous page
+        
+        Returns:
+            Dict with one page of reports, nearest level first; each has a
+            "level" (1 = direct report)
+        """
+        
+        print(f"  🌳 Getting reports for: {employee_id}")
+        
+        try:
+            fields = resolve_fields(fields, list(EMPLOYEE_FIELDS), DEFAULT_EMPLOYEE_FIELDS)
+            limit = clamp_limit(limit)
+            after = decode_keyset_cursor(cursor)
             
-            if name_contains:
-                query += " AND name LIKE ?"
-                params.append(f"%{name_contains}%")
+            columns = ", ".join(f"e.{EMPLOYEE_FIELDS[f]}" for f in fields)
+            cte, params = reports_cte(self.closure, employee_id, 1 if direct_only else MAX_DEPTH)
+            query = cte + f"""
+            SELECT {columns}, h.depth, e.name, e.emp_id FROM h
+            JOIN employees e ON e.emp_id = h.descendant
+            """
+            if after is not None:
+                if len(after) != 3:
+                    raise ValueError(f"Invalid cursor: {cursor}")
+                query += " WHERE (h.depth, e.name, e.emp_id) > (?, ?, ?)"
+                params = (*params, *after)
+            results = self._query("get_reports", query + " ORDER BY h.depth, e.name, e.emp_id LIMIT ?",
+                                  (*params, limit + 1))
             
-            query += " ORDER BY name"
+            if not results and after is None and not self._employee_exists("get_reports", employee_id):
+                return self._not_found("get_reports", employee_id)
             
-            cursor.execute(query, params)
-            results = cursor.fetchall()
-            conn.close()
+            next_cursor = None
+            if len(results) > limit:
+                results = results[:limit]
+                next_cursor = encode_cursor({"after": list(results[-1][-3:])})
             
-            employees = []
-            for row in results:
-                employees.append({
-                    "employee_id": row[0],
-                    "name": row[1],
-                    "department": row[2],
-                    "position": row[3]
-                })
+            reports = [{**dict(zip(fields, row)), "level": row[-3]} for row in results]
             
             return {
-                "employees": employees,
-                "count": len(employees),
-                "tool": "search_employees"
+                "employee_id": employee_id,
+                "reports": reports,
+                "count": len(reports),
+                "next_cursor": next_cursor,
+                "found": True,
+                "tool": "get_reports"
             }
             
         except Exception as e:
             return {
                 "error": True,
                 "message": str(e),
-                "tool": "search_employees"
+                "tool": "get_reports"
+            }
+    
+    def get_management_chain(self, employee_id: str) -> Dict:
+        """
+        Tool 6: An employee's managers, from their direct manager to the top
+        
+        Args:
+            employee_id: Employee ID (e.g., EMP006)
+        
+        Returns:
+            Dict with the chain, nearest manager first
+        """
+        
+        print(f"  🪜 Getting management chain for: {employee_id}")
+        
+        try:
+            cte, params = chain_cte(self.closure, employee_id)
+            results = self._query("get_management_chain", cte + """
+            SELECT e.emp_id, e.name, e.department, e.position, h.depth FROM h
+            JOIN employees e ON e.emp_id = h.ancestor
+            ORDER BY h.depth
+            """, params)
+            
+            if not results and not self._employee_exists("get_management_chain", employee_id):
+                return self._not_found("get_management_chain", employee_id)
+            
+            chain = [
+                {"employee_id": row[0], "name": row[1], "department": row[2],
+                 "position": row[3], "level": row[4]}
+                for row in results
+            ]
+            
+            return {
+                "employee_id": employee_id,
+                "chain": chain,
+                "levels": len(chain),
+                "found": True,
+                "tool": "get_management_chain"
+            }
+            
+        except Exception as e:
+            return {
+                "error": True,
+                "message": str(e),
+                "tool": "get_management_chain"
+            }
+    
+    def get_team_size(self, employee_id: str) -> Dict:
+        """
+        Tool 7: Count a manager's direct and indirect reports
+        
+        Args:
+            employee_id: Manager's employee ID (e.g., EMP010)
+        
+        Returns:
+            Dict with direct_reports, total_reports and levels below the manager
+        """
+        
+        print(f"  👥 Getting team size for: {employee_id}")
+        
+        try:
+            cte, params = reports_cte(self.closure, employee_id, MAX_DEPTH)
+            total, direct, levels = self._query("get_team_size", cte + """
+            SELECT COUNT(*), COALESCE(SUM(depth = 1), 0), COALESCE(MAX(depth), 0) FROM h
+            """, params, fetch="one")
+            
+            if not total and not self._employee_exists("get_team_size", employee_id):
+                return self._not_found("get_team_size", employee_id)
+            
+            return {
+                "employee_id": employee_id,
+                "direct_reports": direct,
+                "total_reports": total,
+                "levels": levels,
+                "found": True,
+                "tool": "get_team_size"
+            }
+            
+        except Exception as e:
+            return {
+                "error": True,
+                "message": str(e),
+                "tool": "get_team_size"
             }
     
+    def get_stats(self) -> Dict:
+        """Connection pool and lookup cache statistics"""
+        return {
+            "pool": self.pool.get_stats(),
+            "employee_cache": self.cache.get_stats()
+        }
+    
     def get_tool_descriptions(self) -> List[Dict]:
         """
         Get descriptions of available tools (for LLM to understand)
@@ -295,6 +809,28 @@ class DatabaseMCPServer:
                     "Check casual leave for EMP005"
                 ]
             },
+            {
+                "name": "get_employees_info",
+                "description": f"Get details for several employees in one call (up to {MAX_BULK_IDS}). Prefer this over repeated get_employee_info calls.",
+                "parameters": {
+                    "employee_ids": "List of employee IDs (e.g., [\"EMP001\", \"EMP006\"])"
+                },
+                "examples": [
+                    "Who are EMP001, EMP003 and EMP006?",
+                    "Give me the emails of everyone on my team"
+                ]
+            },
+            {
+                "name": "get_leave_balances",
+                "description": f"Get leave balances for several employees in one call (up to {MAX_BULK_IDS}). Prefer this over repeated get_leave_balance calls.",
+                "parameters": {
+                    "employee_ids": "List of employee IDs (e.g., [\"EMP001\", \"EMP006\"])"
+                },
+                "examples": [
+                    "Compare leave balances of EMP001 and EMP006",
+                    "How much leave does my team have left?"
+                ]
+            },
             {
                 "name": "get_department_summary",
                 "description": "Get employee count by department. Use when user asks about team size or department statistics.",
@@ -305,18 +841,71 @@ class DatabaseMCPServer:
                     "Which department has most employees?"
                 ]
             },
+            {
+                "name": "get_department_stats",
+                "description": "Get headcount, average tenure and total remaining casual, earned and sick leave per department. Use for department analytics.",
+                "parameters": {
+                    "department": "Department name (optional, default all departments)"
+                },
+                "examples": [
+                    "What is the average tenure in Sales?",
+                    "How much sick leave is left in Finance in total?",
+                    "Which department has the longest-serving staff?"
+                ]
+            },
             {
                 "name": "search_employees",
-                "description": "Search employees by department or name. Use when user wants to find employees matching criteria.",
+                "description": "Search employees by department or name. Use when user wants to find employees matching criteria. Results are paginated.",
                 "parameters": {
                     "department": "Department name (optional)",
-                    "name_contains": "Name search term (optional)"
+                    "name_contains": "Name search: whole words or prefixes, e.g. 'raj kum' (optional)",
+                    "fields": f"Fields to return (optional): {', '.join(EMPLOYEE_FIELDS)}",
+                    "limit": "Page size (optional, default 25, max 200)",
+                    "cursor": "next_cursor from the previous page (optional)"
                 },
                 "examples": [
                     "Show all employees in Engineering",
                     "Find employees with 'Kumar' in their name",
                     "List all HR department employees"
                 ]
+            },
+            {
+                "name": "get_reports",
+                "description": "List the people who report to a manager, directly or indirectly, nearest level first. Results are paginated.",
+                "parameters": {
+                    "employee_id": "Manager's employee ID (e.g., EMP010)",
+                    "direct_only": "Only direct reports (optional, default false)",
+                    "fields": f"Fields to return (optional): {', '.join(EMPLOYEE_FIELDS)}",
+                    "limit": "Page size (optional, default 25, max 200)",
+                    "cursor": "next_cursor from the previous page (optional)"
+                },
+                "examples": [
+                    "Who reports to EMP010?",
+                    "List everyone in EMP001's team",
+                    "Who are EMP009's direct reports?"
+                ]
+            },
+            {
+                "name": "get_management_chain",
+                "description": "Get an employee's managers from their direct manager up to the CEO.",
+                "parameters": {
+                    "employee_id": "Employee ID (e.g., EMP006)"
+                },
+                "examples": [
+                    "Who is EMP006's skip-level manager?",
+                    "Show the management chain for EMP007"
+                ]
+            },
+            {
+                "name": "get_team_size",
+                "description": "Count a manager's direct reports and everyone under them.",
+                "parameters": {
+                    "employee_id": "Manager's employee ID (e.g., EMP010)"
+                },
+                "examples": [
+                    "How big is EMP001's team?",
+                    "How many people report to EMP010 in total?"
+                ]
             }
         ]
     
@@ -344,13 +933,44 @@ class DatabaseMCPServer:
                 return {"error": True, "message": "employee_id parameter required"}
             return self.get_leave_balance(employee_id)
         
+        elif tool_name in ("get_employees_info", "get_leave_balances"):
+            employee_ids = kwargs.get("employee_ids")
+            if not employee_ids:
+                return {"error": True, "message": "employee_ids parameter required"}
+            if tool_name == "get_employees_info":
+                return self.get_employees_info(employee_ids)
+            return self.get_leave_balances(employee_ids)
+        
         elif tool_name == "get_department_summary":
             return self.get_department_summary()
         
+        elif tool_name == "get_department_stats":
+            return self.get_department_stats(kwargs.get("department"))
+        
         elif tool_name == "search_employees":
-            department = kwargs.get("department")
-            name_contains = kwargs.get("name_contains")
-            return self.search_employees(department, name_contains)
+            return self.search_employees(
+                kwargs.get("department"),
+                kwargs.get("name_contains"),
+                fields=kwargs.get("fields"),
+                limit=kwargs.get("limit"),
+                cursor=kwargs.get("cursor")
+            )
+        
+        elif tool_name in ("get_reports", "get_management_chain", "get_team_size"):
+            employee_id = kwargs.get("employee_id", "")
+            if not employee_id:
+                return {"error": True, "message": "employee_id parameter required"}
+            if tool_name == "get_management_chain":
+                return self.get_management_chain(employee_id)
+            if tool_name == "get_team_size":
+                return self.get_team_size(employee_id)
+            return self.get_reports(
+                employee_id,
+                direct_only=bool(kwargs.get("direct_only", False)),
+                fields=kwargs.get("fields"),
+                limit=kwargs.get("limit"),
+                cursor=kwargs.get("cursor")
+            )
         
         else:
             return {
@@ -420,7 +1040,18 @@ def test_database_server():
         print(f"   - {emp['employee_id']}: {emp['name']} ({emp['position']})")
     
     print("\n" + "-"*60)
-    print("Test 5: Tool Descriptions")
+    print("Test 5: Org Chart")
+    print("-"*60)
+    
+    result = server.get_management_chain("EMP006")
+    chain = " → ".join(f"{m['name']} ({m['position']})" for m in result['chain'])
+    print(f"\n🪜 EMP006 reports up through: {chain}")
+    
+    result = server.get_team_size("EMP010")
+    print(f"👥 EMP010: {result['direct_reports']} direct, {result['total_reports']} total reports")
+    
+    print("\n" + "-"*60)
+    print("Test 6: Tool Descriptions")
     print("-"*60)
     
     tools = server.get_tool_descriptions()
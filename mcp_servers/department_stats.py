@@ -0,0 +1,136 @@
+"""
+Materialized department aggregates
+department_stats keeps one row of running totals per department, updated by
+triggers on employees and leave_balance, so department-level questions read a
+handful of rows instead of grouping the whole employees table on every call.
+"""
+
+import sqlite3
+
+STATS_TABLE = "department_stats"
+
+# join_date as whole days since 1970-01-01; integer sums never drift
+_DAYS = "CAST(julianday({}) - 2440587.5 AS INTEGER)"
+
+# Add (sign = +1) or remove (sign = -1) one employee, with their leave balance
+# if they have one
+_EMPLOYEE_DELTA = f"""
+    INSERT INTO {STATS_TABLE} (department, headcount, join_days_total,
+                               casual_leave_total, earned_leave_total, sick_leave_total,
+                               with_leave_balance)
+    SELECT {{row}}.department, {{sign}}, {{sign}} * {_DAYS.format("{row}.join_date")},
+           {{sign}} * COALESCE(SUM(casual_leave), 0), {{sign}} * COALESCE(SUM(earned_leave), 0),
+           {{sign}} * COALESCE(SUM(sick_leave), 0), {{sign}} * COUNT(*)
+    FROM leave_balance WHERE emp_id = {{row}}.emp_id
+    ON CONFLICT (department) DO UPDATE SET
+        headcount = headcount + excluded.headcount,
+        join_days_total = join_days_total + excluded.join_days_total,
+        casual_leave_total = casual_leave_total + excluded.casual_leave_total,
+        earned_leave_total = earned_leave_total + excluded.earned_leave_total,
+        sick_leave_total = sick_leave_total + excluded.sick_leave_total,
+        with_leave_balance = with_leave_balance + excluded.with_leave_balance;
+"""
+
+# Add or remove one leave balance in its employee's department
+_BALANCE_DELTA = f"""
+    UPDATE {STATS_TABLE} SET
+        casual_leave_total = casual_leave_total + {{sign}} * {{row}}.casual_leave,
+        earned_leave_total = earned_leave_total + {{sign}} * {{row}}.earned_leave,
+        sick_leave_total = sick_leave_total + {{sign}} * {{row}}.sick_leave,
+        with_leave_balance = with_leave_balance + {{sign}}
+    WHERE department = (SELECT department FROM employees WHERE emp_id = {{row}}.emp_id);
+"""
+
+# The same totals computed from scratch (a full scan): fills the table, and
+# stands in for it when it is missing
+AGGREGATE_SQL = f"""
+    SELECT e.department AS department,
+           COUNT(*) AS headcount,
+           SUM({_DAYS.format("e.join_date")}) AS join_days_total,
+           COALESCE(SUM(l.casual_leave), 0) AS casual_leave_total,
+           COALESCE(SUM(l.earned_leave), 0) AS earned_leave_total,
+           COALESCE(SUM(l.sick_leave), 0) AS sick_leave_total,
+           COUNT(l.emp_id) AS with_leave_balance
+    FROM employees e LEFT JOIN leave_balance l ON l.emp_id = e.emp_id
+    GROUP BY e.department
+"""
+
+_DROP_EMPTY = f"DELETE FROM {STATS_TABLE} WHERE headcount <= 0;"
+
+
+def _employee_delta(row: str, sign: int) -> str:
+    return _EMPLOYEE_DELTA.format(row=row, sign=sign)
+
+
+def _balance_delta(row: str, sign: int) -> str:
+    return _BALANCE_DELTA.format(row=row, sign=sign)
+
+
+STATS_STATEMENTS = [
+    f"""
+    CREATE TABLE IF NOT EXISTS {STATS_TABLE} (
+        department TEXT PRIMARY KEY,
+        headcount INTEGER NOT NULL DEFAULT 0,
+        join_days_total INTEGER NOT NULL DEFAULT 0,
+        casual_leave_total INTEGER NOT NULL DEFAULT 0,
+        earned_leave_total INTEGER NOT NULL DEFAULT 0,
+        sick_leave_total INTEGER NOT NULL DEFAULT 0,
+        with_leave_balance INTEGER NOT NULL DEFAULT 0
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {STATS_TABLE}_employee_insert AFTER INSERT ON employees BEGIN
+        {_employee_delta("new", 1)}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {STATS_TABLE}_employee_delete AFTER DELETE ON employees BEGIN
+        {_employee_delta("old", -1)}
+        {_DROP_EMPTY}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {STATS_TABLE}_employee_update
+    AFTER UPDATE OF emp_id, department, join_date ON employees BEGIN
+        {_employee_delta("old", -1)}
+        {_employee_delta("new", 1)}
+        {_DROP_EMPTY}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {STATS_TABLE}_balance_insert AFTER INSERT ON leave_balance BEGIN
+        {_balance_delta("new", 1)}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {STATS_TABLE}_balance_delete AFTER DELETE ON leave_balance BEGIN
+        {_balance_delta("old", -1)}
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {STATS_TABLE}_balance_update AFTER UPDATE ON leave_balance BEGIN
+        {_balance_delta("old", -1)}
+        {_balance_delta("new", 1)}
+    END
+    """,
+    # Totals for rows that already exist
+    f"INSERT INTO {STATS_TABLE} {AGGREGATE_SQL}",
+]
+
+
+def create_department_stats(conn: sqlite3.Connection):
+    """Create the summary table and its triggers, and total up existing rows"""
+
+    for statement in STATS_STATEMENTS:
+        conn.execute(statement)
+
+
+def stats_source(materialized: bool) -> str:
+    """FROM-clause source with department_stats' columns"""
+    return STATS_TABLE if materialized else f"({AGGREGATE_SQL})"
+
+
+def has_department_stats(conn: sqlite3.Connection) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (STATS_TABLE,)
+    ).fetchone() is not None
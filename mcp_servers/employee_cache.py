@@ -0,0 +1,102 @@
+"""
+Read-through cache for per-employee lookups
+Entries are checked against SQLite's PRAGMA data_version before every read:
+the value changes whenever any other connection (in this process or another)
+commits, so a write anywhere empties the cache on the next lookup.
+"""
+
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+DEFAULT_CACHE_SIZE = 1024
+
+
+class EmployeeCache:
+    """
+    LRU cache of tool results keyed by (tool, emp_id)
+
+    Args:
+        db_path: Database whose changes invalidate the cache
+        max_entries: Entries to keep (0 disables caching)
+    """
+
+    def __init__(self, db_path: str, max_entries: int = DEFAULT_CACHE_SIZE):
+        self.max_entries = max_entries
+
+        self._entries: "OrderedDict[Hashable, Dict[str, Any]]" = OrderedDict()
+        self._version = None
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "invalidations": 0, "evictions": 0}
+
+        # data_version is per connection, so one connection does all the
+        # checks; it never writes, so its own commits can't mask anyone's
+        self._watch = None
+        if max_entries:
+            self._watch = sqlite3.connect(db_path, check_same_thread=False)
+            self._watch.execute("PRAGMA query_only = ON")
+
+    def _check_version(self) -> int:
+        """Drop every entry if the database changed (call with the lock held)"""
+
+        version = self._watch.execute("PRAGMA data_version").fetchone()[0]
+        if version != self._version:
+            if self._entries:
+                self._entries.clear()
+                self.stats["invalidations"] += 1
+            self._version = version
+        return version
+
+    def get(self, key: Hashable, load: Callable[[], Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        Return the cached result for key, or load and cache it
+
+        Args:
+            key: Cache key, e.g. ("get_employee_info", "EMP001")
+            load: Runs the query; error results are returned but not cached
+        """
+
+        if not self.max_entries:
+            return load()
+
+        with self._lock:
+            version = self._check_version()
+            entry = self._entries.get(key)
+            if entry is not None:
+                self._entries.move_to_end(key)
+                self.stats["hits"] += 1
+                return dict(entry)
+            self.stats["misses"] += 1
+
+        result = load()
+
+        with self._lock:
+            # If a write landed while loading, the result may already be stale
+            if not result.get("error") and self._check_version() == version:
+                self._entries[key] = dict(result)
+                while len(self._entries) > self.max_entries:
+                    self._entries.popitem(last=False)
+                    self.stats["evictions"] += 1
+
+        return result
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def close(self):
+        self.clear()
+        if self._watch is not None:
+            self._watch.close()
+            self._watch = None
+            self.max_entries = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["entries"] = len(self._entries)
+        stats["max_entries"] = self.max_entries
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = round(stats["hits"] / lookups, 3) if lookups else 0.0
+        return stats
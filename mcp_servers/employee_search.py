@@ -0,0 +1,86 @@
+"""
+Full-text employee search
+An FTS5 index over name, email and position, kept in sync with the employees
+table by triggers, so name search is an index lookup ranked by bm25 instead of
+a LIKE '%term%' table scan
+"""
+
+import re
+import sqlite3
+from typing import Optional
+
+FTS_TABLE = "employees_fts"
+
+# bm25 column weights: a name hit outranks a position hit, which outranks email
+BM25_WEIGHTS = (10.0, 1.0, 2.0)
+
+# One statement per entry, so callers can run them inside their own transaction
+SEARCH_INDEX_STATEMENTS = [
+    f"""
+    CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5(
+        name, email, position,
+        content='employees', content_rowid='rowid',
+        tokenize='unicode61', prefix='2 3'
+    )
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS employees_fts_insert AFTER INSERT ON employees BEGIN
+        INSERT INTO {FTS_TABLE}(rowid, name, email, position)
+        VALUES (new.rowid, new.name, new.email, new.position);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS employees_fts_delete AFTER DELETE ON employees BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, email, position)
+        VALUES ('delete', old.rowid, old.name, old.email, old.position);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS employees_fts_update AFTER UPDATE OF name, email, position ON employees BEGIN
+        INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, email, position)
+        VALUES ('delete', old.rowid, old.name, old.email, old.position);
+        INSERT INTO {FTS_TABLE}(rowid, name, email, position)
+        VALUES (new.rowid, new.name, new.email, new.position);
+    END
+    """,
+    # Index rows that already exist
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}) VALUES ('rebuild')",
+]
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+
+def create_search_index(conn: sqlite3.Connection):
+    """Create the FTS table and triggers, and index existing rows"""
+
+    for statement in SEARCH_INDEX_STATEMENTS:
+        conn.execute(statement)
+
+
+def has_search_index(conn: sqlite3.Connection) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (FTS_TABLE,)
+    ).fetchone() is not None
+
+
+def build_match_query(term: str, column: Optional[str] = None) -> Optional[str]:
+    """
+    Turn free text into an FTS5 query: every word must match, as a prefix
+
+    "raj kum" -> "raj"* AND "kum"*  (matches "Rajesh Kumar")
+
+    Args:
+        term: User search text
+        column: Restrict matches to one indexed column (e.g. "name")
+
+    Returns:
+        MATCH expression, or None if the text has no searchable words
+    """
+
+    tokens = _TOKEN_RE.findall(term.lower())
+    if not tokens:
+        return None
+
+    prefix = f"{column} : " if column else ""
+    # Quoting keeps FTS5 operators (AND, NEAR, ...) in user text literal
+    return " AND ".join(f'{prefix}"{token}"*' for token in tokens)
@@ -12,9 +12,15 @@ from dotenv import load_dotenv
 # Fix working directory to project root
 PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 os.chdir(PROJECT_ROOT)
+sys.path.append(PROJECT_ROOT)
+
+from mcp_servers.pagination import paginate_list, project, resolve_fields
 
 load_dotenv()
 
+ANNOUNCEMENT_FIELDS = ["filename", "size", "modified", "path"]
+MATCH_FIELDS = ["filename", "content", "modified"]
+
 class FilesystemMCPServer:
     """
     Filesystem as MCP-style server
@@ -43,42 +49,59 @@ class FilesystemMCPServer:
         
         print(f"✅ Filesystem Server initialized ({len(files)} announcement files)")
     
-    def list_announcements(self) -> Dict:
+    def _scan_announcements(self) -> List[Dict]:
+        """All announcement files with their metadata, newest first"""
+        
+        files = []
+        
+        if os.path.exists(self.announcements_path):
+            for filename in os.listdir(self.announcements_path):
+                filepath = os.path.join(self.announcements_path, filename)
+                
+                if os.path.isfile(filepath):
+                    # Get file info
+                    stat = os.stat(filepath)
+                    modified = datetime.fromtimestamp(stat.st_mtime)
+                    size = stat.st_size
+                    
+                    files.append({
+                        "filename": filename,
+                        "size": size,
+                        "modified": modified.strftime("%Y-%m-%d %H:%M:%S"),
+                        "path": filepath
+                    })
+            
+            # Sort by modified date (newest first)
+            files.sort(key=lambda x: x['modified'], reverse=True)
+        
+        return files
+    
+    def list_announcements(self,
+                           fields: Optional[List[str]] = None,
+                           limit: Optional[int] = None,
+                           cursor: Optional[str] = None) -> Dict:
         """
         Tool 1: List all announcement files
         
+        Args:
+            fields: Fields to return per file (default: all)
+            limit: Page size (default 25, max 200)
+            cursor: next_cursor from a previous page
+        
         Returns:
-            Dict with list of announcement files
+            Dict with one page of announcement files and a next_cursor
         """
         
         print("  📋 Listing announcement files...")
         
         try:
-            files = []
-            
-            if os.path.exists(self.announcements_path):
-                for filename in os.listdir(self.announcements_path):
-                    filepath = os.path.join(self.announcements_path, filename)
-                    
-                    if os.path.isfile(filepath):
-                        # Get file info
-                        stat = os.stat(filepath)
-                        modified = datetime.fromtimestamp(stat.st_mtime)
-                        size = stat.st_size
-                        
-                        files.append({
-                            "filename": filename,
-                            "size": size,
-                            "modified": modified.strftime("%Y-%m-%d %H:%M:%S"),
-                            "path": filepath
-                        })
-                
-                # Sort by modified date (newest first)
-                files.sort(key=lambda x: x['modified'], reverse=True)
+            fields = resolve_fields(fields, ANNOUNCEMENT_FIELDS, ANNOUNCEMENT_FIELDS)
+            files, next_cursor = paginate_list(self._scan_announcements(), fields, limit, cursor)
             
             return {
                 "announcements": files,
                 "count": len(files),
+                "next_cursor": next_cursor,
                 "tool": "list_announcements"
             }
             
@@ -137,43 +160,50 @@ class FilesystemMCPServer:
                 "tool": "read_announcement"
             }
     
-    def get_recent_announcements(self, limit: int = 3) -> Dict:
+    def get_recent_announcements(self,
+                                 limit: int = 3,
+                                 fields: Optional[List[str]] = None,
+                                 cursor: Optional[str] = None) -> Dict:
         """
         Tool 3: Get most recent announcements
         
         Args:
             limit: Number of recent announcements to return (default: 3)
+            fields: Fields to return (default: filename, content, modified)
+            cursor: next_cursor from a previous page
         
         Returns:
-            Dict with recent announcements and their content
+            Dict with recent announcements, their content and a next_cursor
         """
         
         print(f"  📰 Getting {limit} most recent announcements...")
         
         try:
-            # First list all files
-            all_files = self.list_announcements()
-            
-            if all_files.get('error'):
-                return all_files
+            fields = resolve_fields(fields, MATCH_FIELDS, MATCH_FIELDS)
+            files, next_cursor = paginate_list(
+                self._scan_announcements(), ANNOUNCEMENT_FIELDS, limit, cursor
+            )
             
-            files = all_files['announcements'][:limit]
-            
-            # Read content of each
+            # Read content of each (only if it was asked for)
             announcements = []
             for file_info in files:
-                content_result = self.read_announcement(file_info['filename'])
+                item = {
+                    "filename": file_info['filename'],
+                    "modified": file_info['modified']
+                }
                 
-                if content_result.get('found'):
-                    announcements.append({
-                        "filename": file_info['filename'],
-                        "content": content_result['content'],
-                        "modified": file_info['modified']
-                    })
+                if "content" in fields:
+                    content_result = self.read_announcement(file_info['filename'])
+                    if not content_result.get('found'):
+                        continue
+                    item["content"] = content_result['content']
+                
+                announcements.append(project(item, fields))
             
             return {
                 "announcements": announcements,
                 "count": len(announcements),
+                "next_cursor": next_cursor,
                 "tool": "get_recent_announcements"
             }
             
@@ -184,29 +214,33 @@ class FilesystemMCPServer:
                 "tool": "get_recent_announcements"
             }
     
-    def search_announcements(self, keyword: str) -> Dict:
+    def search_announcements(self,
+                             keyword: str,
+                             fields: Optional[List[str]] = None,
+                             limit: Optional[int] = None,
+                             cursor: Optional[str] = None) -> Dict:
         """
         Tool 4 (Bonus): Search announcements by keyword
         
         Args:
             keyword: Keyword to search for
+            fields: Fields to return per match (default: filename, content, modified)
+            limit: Page size (default 25, max 200)
+            cursor: next_cursor from a previous page
         
         Returns:
-            Dict with matching announcements
+            Dict with one page of matching announcements and a next_cursor
         """
         
         print(f"  🔍 Searching announcements for: {keyword}")
         
         try:
-            all_files = self.list_announcements()
-            
-            if all_files.get('error'):
-                return all_files
+            fields = resolve_fields(fields, MATCH_FIELDS, MATCH_FIELDS)
             
             matches = []
             keyword_lower = keyword.lower()
             
-            for file_info in all_files['announcements']:
+            for file_info in self._scan_announcements():
                 # Read file content
                 content_result = self.read_announcement(file_info['filename'])
                 
@@ -223,9 +257,12 @@ class FilesystemMCPServer:
                             "modified": file_info['modified']
                         })
             
+            matches, next_cursor = paginate_list(matches, fields, limit, cursor)
+            
             return {
                 "matches": matches,
                 "count": len(matches),
+                "next_cursor": next_cursor,
                 "keyword": keyword,
                 "tool": "search_announcements"
             }
@@ -244,8 +281,12 @@ class FilesystemMCPServer:
         return [
             {
                 "name": "list_announcements",
-                "description": "List all company announcement files. Use when user wants to see what announcements are available.",
-                "parameters": {},
+                "description": "List all company announcement files. Use when user wants to see what announcements are available. Results are paginated.",
+                "parameters": {
+                    "fields": f"Fields to return (optional): {', '.join(ANNOUNCEMENT_FIELDS)}",
+                    "limit": "Page size (optional, default 25, max 200)",
+                    "cursor": "next_cursor from the previous page (optional)"
+                },
                 "examples": [
                     "What announcements are available?",
                     "Show me all company announcements",
@@ -268,7 +309,9 @@ class FilesystemMCPServer:
                 "name": "get_recent_announcements",
                 "description": "Get the most recent company announcements (default: 3). Use when user asks for latest updates.",
                 "parameters": {
-                    "limit": "Number of announcements to retrieve (optional, default: 3)"
+                    "limit": "Number of announcements to retrieve (optional, default: 3)",
+                    "fields": f"Fields to return (optional): {', '.join(MATCH_FIELDS)}",
+                    "cursor": "next_cursor from the previous page (optional)"
                 },
                 "examples": [
                     "What are the latest announcements?",
@@ -280,7 +323,10 @@ class FilesystemMCPServer:
                 "name": "search_announcements",
                 "description": "Search announcements by keyword. Use when user is looking for specific information.",
                 "parameters": {
-                    "keyword": "Search keyword"
+                    "keyword": "Search keyword",
+                    "fields": f"Fields to return (optional): {', '.join(MATCH_FIELDS)}",
+                    "limit": "Page size (optional, default 25, max 200)",
+                    "cursor": "next_cursor from the previous page (optional)"
                 },
                 "examples": [
                     "Find announcements about holidays",
@@ -303,7 +349,11 @@ class FilesystemMCPServer:
         """
         
         if tool_name == "list_announcements":
-            return self.list_announcements()
+            return self.list_announcements(
+                fields=kwargs.get("fields"),
+                limit=kwargs.get("limit"),
+                cursor=kwargs.get("cursor")
+            )
         
         elif tool_name == "read_announcement":
             filename = kwargs.get("filename", "")
@@ -313,13 +363,22 @@ class FilesystemMCPServer:
         
         elif tool_name == "get_recent_announcements":
             limit = kwargs.get("limit", 3)
-            return self.get_recent_announcements(limit)
+            return self.get_recent_announcements(
+                limit,
+                fields=kwargs.get("fields"),
+                cursor=kwargs.get("cursor")
+            )
         
         elif tool_name == "search_announcements":
             keyword = kwargs.get("keyword", "")
             if not keyword:
                 return {"error": True, "message": "keyword parameter required"}
-            return self.search_announcements(keyword)
+            return self.search_announcements(
+                keyword,
+                fields=kwargs.get("fields"),
+                limit=kwargs.get("limit"),
+                cursor=kwargs.get("cursor")
+            )
         
         else:
             return {
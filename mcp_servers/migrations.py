@@ -0,0 +1,124 @@
+"""
+Versioned schema migrations for the employee database
+The schema version lives in PRAGMA user_version; each migration runs once, in
+its own transaction, and only ever adds to the schema (no data is dropped)
+
+Usage:
+    python mcp_servers/migrations.py [path/to/employees.db]
+"""
+
+import os
+import sqlite3
+import sys
+from typing import Callable, List, Tuple
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from mcp_servers.department_stats import create_department_stats
+from mcp_servers.employee_search import create_search_index
+from mcp_servers.org_hierarchy import add_rename_trigger, create_hierarchy
+
+
+# Leave history: one row per leave taken (balances stay in leave_balance)
+LEAVE_LEDGER_TABLE_SQL = """
+CREATE TABLE IF NOT EXISTS leave_ledger (
+    entry_id INTEGER PRIMARY KEY,
+    emp_id TEXT NOT NULL,
+    leave_type TEXT NOT NULL,
+    days INTEGER NOT NULL,
+    start_date TEXT NOT NULL,
+    status TEXT NOT NULL DEFAULT 'approved',
+    FOREIGN KEY (emp_id) REFERENCES employees(emp_id)
+)
+"""
+
+
+def _add_leave_ledger(conn: sqlite3.Connection):
+    conn.execute(LEAVE_LEDGER_TABLE_SQL)
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_leave_ledger_employee "
+                 "ON leave_ledger(emp_id, start_date)")
+
+
+def _add_lookup_indexes(conn: sqlite3.Connection):
+    # search_employees(department=...) pages in (name, emp_id) order, and
+    # get_department_summary groups by department: both read only this index
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_employees_department "
+                 "ON employees(department, name, emp_id)")
+    # Reporting chains: who reports to a manager
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_employees_manager "
+                 "ON employees(manager, emp_id)")
+    # Tenure / joined-between queries
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_employees_join_date "
+                 "ON employees(join_date, emp_id)")
+
+
+def _add_name_index(conn: sqlite3.Connection):
+    # Unfiltered employee listings seek to the next (name, emp_id) page
+    conn.execute("CREATE INDEX IF NOT EXISTS idx_employees_name ON employees(name, emp_id)")
+
+
+# (version, description, apply) in order; never edit one that has shipped,
+# add a new one instead
+MIGRATIONS: List[Tuple[int, str, Callable[[sqlite3.Connection], None]]] = [
+    (1, "full-text search index on name, email, position", create_search_index),
+    (2, "indexes on department, manager and join_date", _add_lookup_indexes),
+    (3, "leave history ledger", _add_leave_ledger),
+    (4, "org chart closure table", create_hierarchy),
+    (5, "department_stats summary table", create_department_stats),
+    (6, "name index for keyset pagination", _add_name_index),
+    (7, "org chart follows employee ID changes", add_rename_trigger),
+]
+
+LATEST_VERSION = MIGRATIONS[-1][0]
+
+
+def get_version(conn: sqlite3.Connection) -> int:
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, verbose: bool = True) -> Tuple[int, int]:
+    """
+    Apply every migration newer than the database's version
+
+    Returns:
+        (version before, version after)
+    """
+
+    start = get_version(conn)
+    version = start
+
+    for target, description, apply in MIGRATIONS:
+        if target <= version:
+            continue
+        if verbose:
+            print(f"  🧱 Migration {target}: {description}")
+        # Explicit BEGIN: sqlite3 would otherwise autocommit each DDL statement
+        conn.execute("BEGIN")
+        try:
+            apply(conn)
+            # PRAGMA can't take parameters; target is an int from MIGRATIONS
+            conn.execute(f"PRAGMA user_version = {int(target)}")
+        except BaseException:
+            conn.rollback()
+            raise
+        conn.commit()
+        version = target
+
+    return start, version
+
+
+def migrate_file(db_path: str, verbose: bool = True) -> Tuple[int, int]:
+    conn = sqlite3.connect(db_path)
+    try:
+        return migrate(conn, verbose)
+    finally:
+        conn.close()
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else "data/employees.db"
+    before, after = migrate_file(path)
+    if before == after:
+        print(f"✅ {path} is up to date (version {after})")
+    else:
+        print(f"✅ Migrated {path} from version {before} to {after}")
@@ -0,0 +1,191 @@
+"""
+Org-chart queries
+A closure table holds one row per (manager, report) pair at every distance, kept
+in sync with employees.manager by triggers, so "everyone under X" and "X's
+management chain" are single indexed lookups whatever the depth of the org.
+Without the table the same queries fall back to recursive CTEs over employees.
+"""
+
+import sqlite3
+
+HIERARCHY_TABLE = "employee_hierarchy"
+
+# Recursion guard for the CTEs, in case the data contains a management cycle
+MAX_DEPTH = 64
+
+HIERARCHY_STATEMENTS = [
+    # depth 0 is the employee themself, 1 a direct report, 2 a report's report...
+    f"""
+    CREATE TABLE IF NOT EXISTS {HIERARCHY_TABLE} (
+        ancestor TEXT NOT NULL,
+        descendant TEXT NOT NULL,
+        depth INTEGER NOT NULL,
+        PRIMARY KEY (ancestor, descendant)
+    ) WITHOUT ROWID
+    """,
+    f"CREATE INDEX IF NOT EXISTS idx_{HIERARCHY_TABLE}_descendant ON {HIERARCHY_TABLE}(descendant, depth)",
+    # New employee: a path from each of the manager's ancestors, and link any
+    # existing reports that were added before them
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {HIERARCHY_TABLE}_insert AFTER INSERT ON employees BEGIN
+        INSERT INTO {HIERARCHY_TABLE}(ancestor, descendant, depth)
+        VALUES (new.emp_id, new.emp_id, 0);
+        INSERT INTO {HIERARCHY_TABLE}(ancestor, descendant, depth)
+        SELECT ancestor, new.emp_id, depth + 1 FROM {HIERARCHY_TABLE}
+        WHERE descendant = new.manager;
+        INSERT INTO {HIERARCHY_TABLE}(ancestor, descendant, depth)
+        SELECT up.ancestor, down.descendant, up.depth + down.depth + 1
+        FROM employees report
+        JOIN {HIERARCHY_TABLE} up ON up.descendant = new.emp_id
+        JOIN {HIERARCHY_TABLE} down ON down.ancestor = report.emp_id
+        WHERE report.manager = new.emp_id;
+    END
+    """,
+    # Removing someone cuts every path that went through them
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {HIERARCHY_TABLE}_delete AFTER DELETE ON employees BEGIN
+        DELETE FROM {HIERARCHY_TABLE}
+        WHERE descendant IN (SELECT descendant FROM {HIERARCHY_TABLE} WHERE ancestor = old.emp_id)
+          AND ancestor IN (SELECT ancestor FROM {HIERARCHY_TABLE} WHERE descendant = old.emp_id);
+    END
+    """,
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {HIERARCHY_TABLE}_no_cycles BEFORE UPDATE OF manager ON employees
+    WHEN EXISTS (SELECT 1 FROM {HIERARCHY_TABLE} WHERE ancestor = new.emp_id AND descendant = new.manager)
+    BEGIN
+        SELECT RAISE(ABORT, 'manager change would create a reporting cycle');
+    END
+    """,
+    # A manager change moves the employee's whole subtree
+    f"""
+    CREATE TRIGGER IF NOT EXISTS {HIERARCHY_TABLE}_move AFTER UPDATE OF manager ON employees
+    WHEN new.manager IS NOT old.manager BEGIN
+        DELETE FROM {HIERARCHY_TABLE}
+        WHERE descendant IN (SELECT descendant FROM {HIERARCHY_TABLE} WHERE ancestor = new.emp_id)
+          AND ancestor IN (SELECT ancestor FROM {HIERARCHY_TABLE}
+                           WHERE descendant = new.emp_id AND depth > 0);
+        INSERT INTO {HIERARCHY_TABLE}(ancestor, descendant, depth)
+        SELECT up.ancestor, down.descendant, up.depth + down.depth + 1
+        FROM {HIERARCHY_TABLE} up
+        JOIN {HIERARCHY_TABLE} down ON down.ancestor = new.emp_id
+        WHERE up.descendant = new.manager;
+    END
+    """,
+    # Paths for rows that already exist
+    f"""
+    INSERT OR IGNORE INTO {HIERARCHY_TABLE}(ancestor, descendant, depth)
+    WITH RECURSIVE paths(ancestor, descendant, depth) AS (
+        SELECT emp_id, emp_id, 0 FROM employees
+        UNION ALL
+        SELECT boss.emp_id, paths.descendant, paths.depth + 1
+        FROM paths
+        JOIN employees e ON e.emp_id = paths.ancestor
+        JOIN employees boss ON boss.emp_id = e.manager
+        WHERE paths.depth < {MAX_DEPTH}
+    )
+    SELECT ancestor, descendant, depth FROM paths
+    """,
+]
+
+# An employee ID change: paths through the old ID go, as on delete, and the new
+# ID is linked in as on insert. Reports still pointing at the old ID are left
+# without a manager, exactly as employees.manager now says. Added by its own
+# migration, so databases created before it get it too
+RENAME_TRIGGER = f"""
+CREATE TRIGGER IF NOT EXISTS {HIERARCHY_TABLE}_rename AFTER UPDATE OF emp_id ON employees
+WHEN new.emp_id IS NOT old.emp_id BEGIN
+    DELETE FROM {HIERARCHY_TABLE}
+    WHERE descendant IN (SELECT descendant FROM {HIERARCHY_TABLE} WHERE ancestor = old.emp_id)
+      AND ancestor IN (SELECT ancestor FROM {HIERARCHY_TABLE} WHERE descendant = old.emp_id);
+    INSERT INTO {HIERARCHY_TABLE}(ancestor, descendant, depth)
+    VALUES (new.emp_id, new.emp_id, 0);
+    INSERT INTO {HIERARCHY_TABLE}(ancestor, descendant, depth)
+    SELECT ancestor, new.emp_id, depth + 1 FROM {HIERARCHY_TABLE}
+    WHERE descendant = new.manager;
+    INSERT INTO {HIERARCHY_TABLE}(ancestor, descendant, depth)
+    SELECT up.ancestor, down.descendant, up.depth + down.depth + 1
+    FROM employees report
+    JOIN {HIERARCHY_TABLE} up ON up.descendant = new.emp_id
+    JOIN {HIERARCHY_TABLE} down ON down.ancestor = report.emp_id
+    WHERE report.manager = new.emp_id;
+END
+"""
+
+# CTEs named h, one per question, with (employee ID, ...) as parameters.
+# Reports: h(descendant, depth), down to a maximum depth
+REPORTS_CLOSURE = f"""
+WITH h(descendant, depth) AS (
+    SELECT descendant, depth FROM {HIERARCHY_TABLE}
+    WHERE ancestor = ? AND depth BETWEEN 1 AND ?
+)
+"""
+
+REPORTS_RECURSIVE = """
+WITH RECURSIVE h(descendant, depth) AS (
+    SELECT emp_id, 1 FROM employees WHERE manager = ?
+    UNION ALL
+    SELECT e.emp_id, h.depth + 1 FROM h
+    JOIN employees e ON e.manager = h.descendant
+    WHERE h.depth < ?
+)
+"""
+
+# Management chain: h(ancestor, depth), nearest manager first
+CHAIN_CLOSURE = f"""
+WITH h(ancestor, depth) AS (
+    SELECT ancestor, depth FROM {HIERARCHY_TABLE}
+    WHERE descendant = ? AND depth > 0
+)
+"""
+
+CHAIN_RECURSIVE = f"""
+WITH RECURSIVE h(ancestor, depth) AS (
+    SELECT manager, 1 FROM employees WHERE emp_id = ? AND manager IS NOT NULL
+    UNION ALL
+    SELECT e.manager, h.depth + 1 FROM h
+    JOIN employees e ON e.emp_id = h.ancestor
+    WHERE e.manager IS NOT NULL AND h.depth < {MAX_DEPTH}
+)
+"""
+
+
+def create_hierarchy(conn: sqlite3.Connection):
+    """Create the closure table and triggers, and fill in existing employees"""
+
+    for statement in HIERARCHY_STATEMENTS:
+        conn.execute(statement)
+
+
+def add_rename_trigger(conn: sqlite3.Connection):
+    """Keep the closure table in sync when an employee's ID changes"""
+
+    conn.execute(RENAME_TRIGGER)
+
+
+def has_hierarchy(conn: sqlite3.Connection) -> bool:
+    return conn.execute(
+        "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = ?", (HIERARCHY_TABLE,)
+    ).fetchone() is not None
+
+
+def reports_cte(closure: bool, employee_id: str, max_depth: int):
+    """
+    CTE of an employee's reports down to max_depth levels
+
+    Returns:
+        (sql, params) defining h(descendant, depth)
+    """
+
+    sql = REPORTS_CLOSURE if closure else REPORTS_RECURSIVE
+    return sql, (employee_id, min(max_depth, MAX_DEPTH))
+
+
+def chain_cte(closure: bool, employee_id: str):
+    """
+    CTE of an employee's managers up to the top of the org
+
+    Returns:
+        (sql, params) defining h(ancestor, depth)
+    """
+
+    return (CHAIN_CLOSURE if closure else CHAIN_RECURSIVE), (employee_id,)
@@ -0,0 +1,117 @@
+"""
+Shared helpers for list-returning MCP tools
+Field projection, page limits and opaque continuation cursors
+"""
+
+import base64
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_PAGE_SIZE = 25
+MAX_PAGE_SIZE = 200
+
+
+def encode_cursor(state: Dict[str, Any]) -> str:
+    """Encode pagination state as an opaque, URL-safe token"""
+    raw = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: Optional[str]) -> Dict[str, Any]:
+    """
+    Decode a token produced by encode_cursor
+
+    Raises:
+        ValueError: If the cursor is malformed
+    """
+
+    if not cursor:
+        return {}
+
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+    except Exception:
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+    if not isinstance(state, dict):
+        raise ValueError(f"Invalid cursor: {cursor}")
+
+    return state
+
+
+def decode_keyset_cursor(cursor: Optional[str]) -> Optional[List[Any]]:
+    """
+    Sort key of the last row already returned, from a keyset cursor
+
+    Raises:
+        ValueError: If the cursor is malformed or not a keyset cursor
+    """
+
+    if not cursor:
+        return None
+
+    after = decode_cursor(cursor).get("after")
+    if not isinstance(after, list):
+        raise ValueError(f"Invalid cursor: {cursor}")
+    return after
+
+
+def clamp_limit(limit: Optional[int]) -> int:
+    """Apply the default page size and the hard maximum"""
+
+    if limit is None:
+        return DEFAULT_PAGE_SIZE
+    return max(1, min(int(limit), MAX_PAGE_SIZE))
+
+
+def resolve_fields(fields: Optional[Sequence[str]],
+                   allowed: Sequence[str],
+                   default: Sequence[str]) -> List[str]:
+    """
+    Validate a requested field list
+
+    Raises:
+        ValueError: If any requested field is not allowed
+    """
+
+    if not fields:
+        return list(default)
+
+    if isinstance(fields, str):
+        fields = [f.strip() for f in fields.split(",") if f.strip()]
+
+    unknown = [f for f in fields if f not in allowed]
+    if unknown:
+        raise ValueError(
+            f"Unknown field(s): {', '.join(unknown)}. Available: {', '.join(allowed)}"
+        )
+
+    return list(dict.fromkeys(fields))
+
+
+def project(item: Dict[str, Any], fields: Sequence[str]) -> Dict[str, Any]:
+    """Keep only the requested keys of one result row"""
+    return {field: item[field] for field in fields if field in item}
+
+
+def paginate_list(items: List[Dict[str, Any]],
+                  fields: Sequence[str],
+                  limit: Optional[int],
+                  cursor: Optional[str]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """
+    Slice an in-memory list into one projected page
+
+    Returns:
+        (page, next_cursor) where next_cursor is None on the last page
+    """
+
+    offset = int(decode_cursor(cursor).get("offset", 0))
+    limit = clamp_limit(limit)
+
+    page = [project(item, fields) for item in items[offset:offset + limit]]
+    next_cursor = None
+    if offset + limit < len(items):
+        next_cursor = encode_cursor({"offset": offset + limit})
+
+    return page, next_cursor
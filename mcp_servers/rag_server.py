@@ -5,6 +5,7 @@ No more hallucination!
 """
 
 import asyncio
+from contextlib import nullcontext
 from typing import Dict, Any, List
 from langchain_community.vectorstores import Chroma
 from langchain_huggingface import HuggingFaceEmbeddings
@@ -19,6 +20,9 @@ class RAGMCPServer:
         
         self.chroma_dir = chroma_dir
         
+        # Optional orchestration.tracing.Tracer, attached by the orchestrator
+        self.tracer = None
+        
         # Initialize embeddings
         self.embeddings = HuggingFaceEmbeddings(
             model_name="sentence-transformers/all-MiniLM-L6-v2"
@@ -37,6 +41,12 @@ class RAGMCPServer:
             print("   Run: python setup_vector_db.py")
             raise FileNotFoundError(f"Vector store not found. Run setup_vector_db.py first.")
     
+    def _span(self, name: str, **attributes):
+        """Open a tracing span if a tracer is attached"""
+        if self.tracer is None:
+            return nullcontext()
+        return self.tracer.span(name, **attributes)
+    
     async def query_documents(
         self, 
         query: str, 
@@ -51,18 +61,43 @@ class RAGMCPServer:
             top_k: Number of results to return
             doc_type: Filter by type ('policy', 'announcement', or None for all)
         """
+        return self.search_documents(query, top_k, doc_type)
+    
+    def search_documents(
+        self,
+        query: str,
+        top_k: int = 3,
+        doc_type: str = None
+    ) -> Dict[str, Any]:
+        """
+        Blocking version of query_documents.
+        
+        Safe to run in a worker thread (e.g. asyncio.to_thread) so the
+        embedding + vector search does not block the event loop.
+        """
         try:
             # Build filter
             filter_dict = None
             if doc_type:
                 filter_dict = {"type": doc_type}
             
-            # Perform similarity search
-            results = self.vectorstore.similarity_search(
-                query,
-                k=top_k,
-                filter=filter_dict
-            )
+            # Embed the query, then search by vector (separate spans when traced)
+            with self._span("rag.embed", query_chars=len(query)) as span:
+                embedding = self.embeddings.embed_query(query)
+                if span:
+                    span.set(dimensions=len(embedding))
+            
+            with self._span("rag.vector_search", top_k=top_k, doc_type=doc_type) as span:
+                results = self.vectorstore.similarity_search_by_vector(
+                    embedding,
+                    k=top_k,
+                    filter=filter_dict
+                )
+                if span:
+                    span.set(
+                        results=len(results),
+                        result_chars=sum(len(doc.page_content) for doc in results)
+                    )
             
             if not results:
                 return {
@@ -105,6 +140,10 @@ class RAGMCPServer:
     
     async def get_policy_summary(self, policy_name: str) -> Dict[str, Any]:
         """Get summary of a specific policy document."""
+        return self.summarize_policy(policy_name)
+    
+    def summarize_policy(self, policy_name: str) -> Dict[str, Any]:
+        """Blocking version of get_policy_summary."""
         try:
             # Search for the specific policy
             results = self.vectorstore.similarity_search(
@@ -142,6 +181,111 @@ class RAGMCPServer:
                 "error": str(e),
                 "summary": None
             }
+    
+    def list_policies(self) -> Dict[str, Any]:
+        """List the policy documents indexed in the vector store."""
+        try:
+            stored = self.vectorstore.get(where={"type": "policy"}, include=["metadatas"])
+            sources = sorted({
+                os.path.basename(meta.get("source", "unknown"))
+                for meta in stored.get("metadatas") or []
+            })
+            
+            return {
+                "success": True,
+                "policies": sources,
+                "count": len(sources)
+            }
+            
+        except Exception as e:
+            return {
+                "success": False,
+                "error": str(e),
+                "policies": []
+            }
+    
+    def get_tool_descriptions(self) -> List[Dict]:
+        """
+        Get descriptions of available tools (for LLM to understand)
+        """
+        return [
+            {
+                "name": "query_policies",
+                "description": "Semantic search over HR policy documents (leave, salary, POSH).",
+                "parameters": {
+                    "query": "Natural language question",
+                    "top_k": "Number of chunks to return (optional, default: 3)"
+                }
+            },
+            {
+                "name": "query_announcements",
+                "description": "Semantic search over company announcements.",
+                "parameters": {
+                    "query": "Natural language question",
+                    "top_k": "Number of chunks to return (optional, default: 3)"
+                }
+            },
+            {
+                "name": "query_documents",
+                "description": "Semantic search over all documents (policies + announcements).",
+                "parameters": {
+                    "query": "Natural language question",
+                    "top_k": "Number of chunks to return (optional, default: 3)",
+                    "doc_type": "'policy', 'announcement' or omit for all (optional)"
+                }
+            },
+            {
+                "name": "get_policy_summary",
+                "description": "Get the main passages of one policy document.",
+                "parameters": {
+                    "policy_name": "Policy name or file name (e.g. Leave-Policy)"
+                }
+            },
+            {
+                "name": "list_policies",
+                "description": "List the indexed policy documents.",
+                "parameters": {}
+            }
+        ]
+    
+    def call_tool(self, tool_name: str, **kwargs) -> Dict[str, Any]:
+        """
+        Generic (blocking) tool calling interface
+        
+        Args:
+            tool_name: Name of the tool to call
+            **kwargs: Tool-specific arguments
+        
+        Returns:
+            Tool response
+        """
+        
+        top_k = kwargs.get("top_k", 3)
+        
+        if tool_name in ("query_policies", "query_announcements", "query_documents"):
+            query = kwargs.get("query", "")
+            if not query:
+                return {"success": False, "error": "query parameter required"}
+            doc_type = {
+                "query_policies": "policy",
+                "query_announcements": "announcement"
+            }.get(tool_name, kwargs.get("doc_type"))
+            return self.search_documents(query, top_k, doc_type)
+        
+        elif tool_name == "get_policy_summary":
+            policy_name = kwargs.get("policy_name", "")
+            if not policy_name:
+                return {"success": False, "error": "policy_name parameter required"}
+            return self.summarize_policy(policy_name)
+        
+        elif tool_name == "list_policies":
+            return self.list_policies()
+        
+        else:
+            return {
+                "success": False,
+                "error": f"Unknown tool: {tool_name}"
+            }
 
 
 # For backward compatibility
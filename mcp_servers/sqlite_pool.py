@@ -0,0 +1,149 @@
+"""
+Pool of long-lived SQLite connections
+Reuses connections (and their page cache and parsed schema) across tool calls
+instead of opening one per query; safe to share between threads
+"""
+
+import queue
+import sqlite3
+import threading
+from contextlib import contextmanager
+from typing import Any, Dict
+
+DEFAULT_POOL_SIZE = 4
+
+# Applied to every pooled connection
+READ_PRAGMAS = (
+    "PRAGMA mmap_size = 268435456",   # 256 MB memory-mapped reads
+    "PRAGMA cache_size = -16000",     # 16 MB page cache per connection
+    "PRAGMA temp_store = MEMORY",
+)
+
+
+def enable_wal(db_path: str) -> bool:
+    """
+    Switch the database to WAL journaling (persistent, so only needed once)
+
+    Readers then never block on a writer. Returns False if the file cannot be
+    switched, e.g. because it is on a read-only filesystem.
+    """
+
+    try:
+        conn = sqlite3.connect(db_path)
+        try:
+            mode = conn.execute("PRAGMA journal_mode = WAL").fetchone()[0]
+        finally:
+            conn.close()
+        return mode.lower() == "wal"
+    except sqlite3.Error:
+        return False
+
+
+class SQLitePool:
+    """
+    Fixed-size pool of connections handed out one caller at a time
+
+    Args:
+        db_path: Path to the SQLite file
+        size: Number of connections (0 = open a fresh connection per call)
+        read_only: Open connections with query_only, so they can never write
+    """
+
+    def __init__(self, db_path: str, size: int = None, read_only: bool = True):
+        self.db_path = db_path
+        self.size = DEFAULT_POOL_SIZE if size is None else size
+        self.read_only = read_only
+
+        self._idle: "queue.LifoQueue[sqlite3.Connection]" = queue.LifoQueue()
+        self._created = 0
+        self._lock = threading.Lock()
+        self.stats = {"checkouts": 0, "waits": 0, "opened": 0}
+
+        self.wal = enable_wal(db_path) if self.size else False
+
+    def _connect(self) -> sqlite3.Connection:
+        # Connections move between threads, but only one uses each at a time
+        conn = sqlite3.connect(self.db_path, check_same_thread=False)
+        for pragma in READ_PRAGMAS:
+            conn.execute(pragma)
+        if self.read_only:
+            conn.execute("PRAGMA query_only = ON")
+        return conn
+
+    def _checkout(self) -> sqlite3.Connection:
+        waiting = False
+        while True:
+            try:
+                # Poll while waiting, in case a broken connection frees a slot
+                return self._idle.get(timeout=0.1) if waiting else self._idle.get_nowait()
+            except queue.Empty:
+                pass
+
+            with self._lock:
+                create = self._created < self.size
+                if create:
+                    self._created += 1
+                    self.stats["opened"] += 1
+                elif not waiting:
+                    self.stats["waits"] += 1
+                    waiting = True
+
+            if create:
+                try:
+                    return self._connect()
+                except Exception:
+                    with self._lock:
+                        self._created -= 1
+                    raise
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection for the duration of the with-block"""
+
+        with self._lock:
+            self.stats["checkouts"] += 1
+
+        if not self.size:
+            # Unpooled: a plain connection per call (the pre-pool behaviour)
+            conn = sqlite3.connect(self.db_path)
+            try:
+                yield conn
+            finally:
+                conn.close()
+            return
+
+        conn = self._checkout()
+        healthy = True
+        try:
+            yield conn
+        except sqlite3.Error:
+            healthy = False
+            raise
+        finally:
+            if healthy:
+                if conn.in_transaction:
+                    conn.rollback()
+                self._idle.put(conn)
+            else:
+                # Don't hand a connection in an unknown state to the next caller
+                conn.close()
+                with self._lock:
+                    self._created -= 1
+
+    def close(self):
+        while True:
+            try:
+                self._idle.get_nowait().close()
+            except queue.Empty:
+                break
+        with self._lock:
+            self._created = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["size"] = self.size
+            stats["open"] = self._created
+        stats["idle"] = self._idle.qsize()
+        stats["wal"] = self.wal
+        return stats
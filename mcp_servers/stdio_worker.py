@@ -0,0 +1,170 @@
+"""
+MCP stdio worker
+Runs one MCP server (database, filesystem or rag) as a separate process speaking
+MCP JSON-RPC 2.0 over stdin/stdout, one JSON message per line
+
+Usage:
+    python mcp_servers/stdio_worker.py database
+    python mcp_servers/stdio_worker.py rag
+"""
+
+import json
+import os
+import sys
+import traceback
+from typing import Any, Dict, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.append(PROJECT_ROOT)
+
+PROTOCOL_VERSION = "2024-11-05"
+
+# JSON-RPC error codes
+PARSE_ERROR = -32700
+INVALID_REQUEST = -32600
+METHOD_NOT_FOUND = -32601
+INVALID_PARAMS = -32602
+INTERNAL_ERROR = -32603
+
+SERVER_NAMES = ("database", "filesystem", "rag")
+
+
+class MethodNotFound(Exception):
+    """Unknown JSON-RPC method"""
+
+
+def create_server(name: str):
+    """Build the in-process server object for a worker"""
+
+    if name == "database":
+        from mcp_servers.database_server import DatabaseMCPServer
+        return DatabaseMCPServer()
+    if name == "filesystem":
+        from mcp_servers.filesystem_server import FilesystemMCPServer
+        return FilesystemMCPServer()
+    if name == "rag":
+        from mcp_servers.rag_server import RAGMCPServer
+        return RAGMCPServer()
+
+    raise ValueError(f"Unknown server: {name} (expected one of {', '.join(SERVER_NAMES)})")
+
+
+def to_mcp_tool(description: Dict[str, Any]) -> Dict[str, Any]:
+    """Convert a get_tool_descriptions() entry into an MCP tool definition"""
+
+    return {
+        "name": description["name"],
+        "description": description["description"],
+        "inputSchema": {
+            "type": "object",
+            "properties": {
+                param: {"description": text}
+                for param, text in description.get("parameters", {}).items()
+            }
+        }
+    }
+
+
+class StdioWorker:
+    """Serves one MCP server over a pair of line-oriented streams"""
+
+    def __init__(self, name: str, server, stdin, stdout):
+        self.name = name
+        self.server = server
+        self.stdin = stdin
+        self.stdout = stdout
+
+    def _send(self, message: Dict[str, Any]):
+        self.stdout.write(json.dumps(message, default=str) + "\n")
+        self.stdout.flush()
+
+    def _error(self, request_id, code: int, message: str):
+        self._send({
+            "jsonrpc": "2.0",
+            "id": request_id,
+            "error": {"code": code, "message": message}
+        })
+
+    def handle(self, method: str, params: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Dispatch one request; returns the JSON-RPC result"""
+
+        if method == "initialize":
+            return {
+                "protocolVersion": PROTOCOL_VERSION,
+                "capabilities": {"tools": {}},
+                "serverInfo": {"name": f"intellihr-{self.name}", "version": "1.0.0"}
+            }
+
+        if method == "ping":
+            return {}
+
+        if method == "tools/list":
+            return {"tools": [to_mcp_tool(t) for t in self.server.get_tool_descriptions()]}
+
+        if method == "tools/call":
+            name = params.get("name")
+            if not name:
+                raise ValueError("tools/call requires a tool name")
+
+            result = self.server.call_tool(name, **(params.get("arguments") or {}))
+            is_error = bool(result.get("error")) if isinstance(result, dict) else False
+
+            return {
+                "content": [{"type": "text", "text": json.dumps(result, default=str)}],
+                "isError": is_error
+            }
+
+        raise MethodNotFound(method)
+
+    def serve(self):
+        """Read requests until stdin closes"""
+
+        for line in self.stdin:
+            if not line.strip():
+                continue
+
+            try:
+                message = json.loads(line)
+            except ValueError as e:
+                self._error(None, PARSE_ERROR, f"Parse error: {e}")
+                continue
+
+            request_id = message.get("id")
+            method = message.get("method")
+
+            # Notifications (e.g. notifications/initialized) get no reply
+            if request_id is None:
+                continue
+
+            if not isinstance(method, str):
+                self._error(request_id, INVALID_REQUEST, "Invalid request")
+                continue
+
+            try:
+                result = self.handle(method, message.get("params") or {})
+            except MethodNotFound:
+                self._error(request_id, METHOD_NOT_FOUND, f"Method not found: {method}")
+            except (TypeError, ValueError) as e:
+                self._error(request_id, INVALID_PARAMS, str(e))
+            except Exception as e:
+                traceback.print_exc(file=sys.stderr)
+                self._error(request_id, INTERNAL_ERROR, f"{type(e).__name__}: {e}")
+            else:
+                self._send({"jsonrpc": "2.0", "id": request_id, "result": result})
+
+
+def main():
+    if len(sys.argv) != 2 or sys.argv[1] not in SERVER_NAMES:
+        print(f"Usage: python mcp_servers/stdio_worker.py [{'|'.join(SERVER_NAMES)}]", file=sys.stderr)
+        sys.exit(2)
+
+    # stdout carries the protocol; the servers' progress prints go to stderr
+    protocol_out = sys.stdout
+    sys.stdout = sys.stderr
+
+    server = create_server(sys.argv[1])
+    StdioWorker(sys.argv[1], server, sys.stdin, protocol_out).serve()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Orchestration helpers used by CollegeAssistantOrchestrator
+"""
+
+from .admission import AdmissionController, ServerBusy, TokenBucket
+from .async_db import AsyncDatabase
+from .breaker import CircuitBreaker
+from .budget import BudgetTracker, QueryBudget
+from .coalesce import SingleFlight
+from .encoding import ResultEncoder, encode_compact
+from .mcp_pool import MCPError, MCPWorkerPool, StdioMCPClient, parse_worker_config
+from .models import ModelTiers, StageStats
+from .sessions import Session, SessionStore
+from .speculative import SpeculativeRetriever, query_similarity
+from .startup import ServerStartup
+from .templates import ResponseTemplates
+from .tracing import InMemoryExporter, JsonlExporter, Span, Tracer, current_span
+
+__all__ = [
+    'AdmissionController',
+    'ServerBusy',
+    'TokenBucket',
+    'AsyncDatabase',
+    'CircuitBreaker',
+    'BudgetTracker',
+    'QueryBudget',
+    'SingleFlight',
+    'ResultEncoder',
+    'encode_compact',
+    'MCPError',
+    'MCPWorkerPool',
+    'StdioMCPClient',
+    'parse_worker_config',
+    'ModelTiers',
+    'StageStats',
+    'Session',
+    'SessionStore',
+    'SpeculativeRetriever',
+    'query_similarity',
+    'ServerStartup',
+    'ResponseTemplates',
+    'InMemoryExporter',
+    'JsonlExporter',
+    'Span',
+    'Tracer',
+    'current_span'
+]
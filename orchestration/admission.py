@@ -0,0 +1,197 @@
+"""
+Admission control for LLM requests
+Token-bucket limits on requests/minute and tokens/minute, a bounded priority queue
+with deadlines, and fast load shedding when the queue cannot be served in time
+"""
+
+import asyncio
+import heapq
+import itertools
+import os
+import threading
+import time
+from collections import deque
+from typing import Any, Dict, Optional
+
+
+class ServerBusy(Exception):
+    """Raised when a request is shed instead of queued"""
+
+    def __init__(self, reason: str, message: str = None):
+        self.reason = reason
+        super().__init__(message or f"LLM queue is busy ({reason})")
+
+
+class TokenBucket:
+    """Refills continuously at rate_per_minute, up to capacity"""
+
+    def __init__(self, rate_per_minute: float, capacity: float = None):
+        self.rate = rate_per_minute / 60.0
+        self.capacity = capacity if capacity is not None else rate_per_minute
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def time_until(self, amount: float) -> float:
+        """Seconds until `amount` tokens are available (0 if they are now)"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    def consume(self, amount: float):
+        """Take tokens; the balance may go negative (debt repaid by refill)"""
+        self._refill()
+        self.tokens -= amount
+
+
+class Ticket:
+    """Proof of admission, used to settle the real token usage afterwards"""
+
+    def __init__(self, tokens: int, waited: float):
+        self.tokens = tokens
+        self.waited = waited
+
+
+class AdmissionController:
+    """
+    Global gate in front of every LLM call
+
+    Requests wait in a priority queue (lower number = served first) until
+    both the request bucket and the token bucket allow them. A request is
+    shed with ServerBusy right away if the queue is full or its estimated
+    wait already exceeds its deadline, and later if the deadline passes
+    while it is still queued.
+    """
+
+    def __init__(self,
+                 requests_per_minute: float = None,
+                 tokens_per_minute: float = None,
+                 max_queue: int = 100,
+                 max_wait_seconds: float = 20.0):
+        self.requests = TokenBucket(
+            requests_per_minute or float(os.getenv("GROQ_RPM", "30"))
+        )
+        self.tokens = TokenBucket(
+            tokens_per_minute or float(os.getenv("GROQ_TPM", "12000"))
+        )
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+
+        self._queue = []
+        self._seq = itertools.count()
+        # Shared across Streamlit threads / event loops
+        self._lock = threading.Lock()
+
+        self._waits = deque(maxlen=1000)
+        self.stats = {
+            "admitted": 0,
+            "shed_queue_full": 0,
+            "shed_deadline": 0,
+            "peak_queue_depth": 0
+        }
+
+    def _estimated_wait(self, tokens: int) -> float:
+        """Lower bound on the wait for a request joining the back of the queue"""
+        tokens_ahead = sum(entry[2] for entry in self._queue)
+        return max(
+            self.requests.time_until(len(self._queue) + 1),
+            self.tokens.time_until(tokens_ahead + tokens)
+        )
+
+    def _remove(self, entry):
+        if entry in self._queue:
+            self._queue.remove(entry)
+            heapq.heapify(self._queue)
+
+    async def acquire(self, tokens: int, priority: int = 10,
+                      timeout: Optional[float] = None) -> Ticket:
+        """
+        Wait for permission to send one LLM request
+
+        Args:
+            tokens: Estimated tokens (prompt + completion) for the request
+            priority: Lower values are admitted first
+            timeout: Seconds the caller can afford to wait (capped at max_wait_seconds)
+
+        Raises:
+            ServerBusy: If the request is shed
+        """
+
+        timeout = self.max_wait_seconds if timeout is None else min(timeout, self.max_wait_seconds)
+        entry = [priority, next(self._seq), tokens]
+
+        with self._lock:
+            if len(self._queue) >= self.max_queue:
+                self.stats["shed_queue_full"] += 1
+                raise ServerBusy("queue_full")
+
+            if self._estimated_wait(tokens) > timeout:
+                self.stats["shed_deadline"] += 1
+                raise ServerBusy("deadline")
+
+            heapq.heappush(self._queue, entry)
+            self.stats["peak_queue_depth"] = max(self.stats["peak_queue_depth"], len(self._queue))
+
+        start = time.monotonic()
+        deadline = start + timeout
+
+        try:
+            while True:
+                with self._lock:
+                    if self._queue[0] is entry:
+                        wait = max(self.requests.time_until(1), self.tokens.time_until(tokens))
+                        if wait <= 0:
+                            heapq.heappop(self._queue)
+                            self.requests.consume(1)
+                            self.tokens.consume(tokens)
+                            waited = time.monotonic() - start
+                            self._waits.append(waited)
+                            self.stats["admitted"] += 1
+                            return Ticket(tokens, waited)
+                    else:
+                        # Someone ahead of us; check again shortly
+                        wait = 0.02
+
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    with self._lock:
+                        self._remove(entry)
+                        self.stats["shed_deadline"] += 1
+                    raise ServerBusy("deadline")
+
+                await asyncio.sleep(min(max(wait, 0.005), remaining, 0.25))
+
+        except ServerBusy:
+            raise
+        except BaseException:
+            with self._lock:
+                self._remove(entry)
+            raise
+
+    def settle(self, ticket: Ticket, actual_tokens: int):
+        """Correct the token bucket once the real usage is known"""
+        if not actual_tokens:
+            return
+        with self._lock:
+            self.tokens.consume(actual_tokens - ticket.tokens)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["queue_depth"] = len(self._queue)
+            waits = sorted(self._waits)
+
+        if waits:
+            stats["avg_wait_seconds"] = round(sum(waits) / len(waits), 4)
+            stats["p95_wait_seconds"] = round(waits[min(int(len(waits) * 0.95), len(waits) - 1)], 4)
+            stats["max_wait_seconds"] = round(waits[-1], 4)
+        else:
+            stats["avg_wait_seconds"] = stats["p95_wait_seconds"] = stats["max_wait_seconds"] = 0.0
+
+        return stats
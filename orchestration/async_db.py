@@ -0,0 +1,119 @@
+"""
+Async facade over the in-process database server
+DatabaseMCPServer is synchronous. Its queries run here on a dedicated thread
+pool, one thread per pooled connection, so a slow query never blocks the event
+loop and never queues behind LLM calls in asyncio's shared default executor.
+"""
+
+import asyncio
+import contextvars
+import functools
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Dict, List, Optional
+
+DEFAULT_THREADS = 4
+
+
+class AsyncDatabase:
+    """
+    Coroutine methods named after the orchestrator's database tools, run on
+    a dedicated thread pool
+
+    Args:
+        server: A DatabaseMCPServer
+        max_workers: Query threads (default: the server's connection pool size)
+    """
+
+    def __init__(self, server, max_workers: int = None):
+        self.server = server
+        self.max_workers = max_workers or getattr(server.pool, "size", 0) or DEFAULT_THREADS
+        self.executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="db-query")
+
+        self._lock = threading.Lock()
+        self._in_flight = 0
+        self.stats = {"calls": 0, "max_in_flight": 0, "queue_wait_ms_total": 0.0, "queue_wait_ms_max": 0.0}
+
+    def _timed(self, fn, submitted: float):
+        # Runs on a query thread: time spent waiting for a free thread
+        waited = (time.perf_counter() - submitted) * 1000
+        with self._lock:
+            self.stats["queue_wait_ms_total"] += waited
+            self.stats["queue_wait_ms_max"] = max(self.stats["queue_wait_ms_max"], waited)
+        return fn()
+
+    async def _run(self, method, *args, **kwargs) -> Dict[str, Any]:
+        with self._lock:
+            self.stats["calls"] += 1
+            self._in_flight += 1
+            self.stats["max_in_flight"] = max(self.stats["max_in_flight"], self._in_flight)
+        try:
+            loop = asyncio.get_running_loop()
+            call = functools.partial(method, *args, **kwargs)
+            # Executor threads don't inherit contextvars; without a copy the
+            # server's db.query spans would lose their parent and start new traces
+            context = contextvars.copy_context()
+            return await loop.run_in_executor(
+                self.executor, context.run, self._timed, call, time.perf_counter()
+            )
+        finally:
+            with self._lock:
+                self._in_flight -= 1
+
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Call a server tool by its server-side name (same shape as MCPWorkerPool)"""
+        return await self._run(self.server.call_tool, tool_name, **arguments)
+
+    # Orchestrator tool names
+
+    async def get_employee(self, employee_id: str) -> Dict[str, Any]:
+        return await self.call_tool("get_employee_info", {"employee_id": employee_id})
+
+    async def get_employees(self, employee_ids: List[str]) -> Dict[str, Any]:
+        return await self.call_tool("get_employees_info", {"employee_ids": employee_ids})
+
+    async def get_leave_balance(self, employee_id: str) -> Dict[str, Any]:
+        return await self.call_tool("get_leave_balance", {"employee_id": employee_id})
+
+    async def get_leave_balances(self, employee_ids: List[str]) -> Dict[str, Any]:
+        return await self.call_tool("get_leave_balances", {"employee_ids": employee_ids})
+
+    async def get_department_summary(self) -> Dict[str, Any]:
+        return await self.call_tool("get_department_summary", {})
+
+    async def get_department_stats(self, department: Optional[str] = None) -> Dict[str, Any]:
+        return await self.call_tool("get_department_stats", {"department": department})
+
+    async def search_employees(self, name: str, **page) -> Dict[str, Any]:
+        return await self.call_tool("search_employees", {"name_contains": name, **page})
+
+    async def get_employees_by_department(self, department: str, **page) -> Dict[str, Any]:
+        return await self.call_tool("search_employees", {"department": department, **page})
+
+    async def get_all_employees(self, **page) -> Dict[str, Any]:
+        return await self.call_tool("search_employees", page)
+
+    async def get_reports(self, employee_id: str, direct_only: bool = False, **page) -> Dict[str, Any]:
+        return await self.call_tool("get_reports", {"employee_id": employee_id, "direct_only": direct_only, **page})
+
+    async def get_management_chain(self, employee_id: str) -> Dict[str, Any]:
+        return await self.call_tool("get_management_chain", {"employee_id": employee_id})
+
+    async def get_team_size(self, employee_id: str) -> Dict[str, Any]:
+        return await self.call_tool("get_team_size", {"employee_id": employee_id})
+
+    def close(self):
+        self.executor.shutdown(wait=True)
+        self.server.pool.close()
+        self.server.cache.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["in_flight"] = self._in_flight
+        stats["threads"] = self.max_workers
+        stats["queue_wait_ms_avg"] = round(stats["queue_wait_ms_total"] / stats["calls"], 3) if stats["calls"] else 0.0
+        stats["queue_wait_ms_total"] = round(stats["queue_wait_ms_total"], 3)
+        stats["queue_wait_ms_max"] = round(stats["queue_wait_ms_max"], 3)
+        return {**self.server.get_stats(), "executor": stats}
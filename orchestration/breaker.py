@@ -0,0 +1,127 @@
+"""
+Circuit breakers for MCP servers
+After repeated failures or timeouts a server's breaker opens and tool calls get a
+fast "source unavailable" result instead of waiting; after a cool-down, a few
+half-open probe calls decide whether it closes again
+"""
+
+import threading
+import time
+from typing import Any, Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+# Seconds a single tool call may take, per server
+DEFAULT_TIMEOUTS = {"database": 5.0, "filesystem": 5.0, "rag": 15.0}
+
+
+class CircuitBreaker:
+    """
+    Closed -> open after failure_threshold consecutive failures,
+    open -> half-open after reset_seconds, half-open -> closed after a
+    successful probe (or back to open if the probe fails)
+
+    Args:
+        failure_threshold: Consecutive failures that open the breaker
+        reset_seconds: How long the breaker stays open before probing
+        half_open_probes: Calls let through at once while half-open
+    """
+
+    def __init__(self, failure_threshold: int = 3, reset_seconds: float = 30.0,
+                 half_open_probes: int = 1):
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.half_open_probes = half_open_probes
+
+        self.state = CLOSED
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self._probes_in_flight = 0
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "calls": 0,
+            "failures": 0,
+            "timeouts": 0,
+            "rejected": 0,
+            "trips": 0,
+            "probes": 0
+        }
+
+    def retry_after(self) -> float:
+        """Seconds until the breaker will allow a probe (0 unless open)"""
+        if self.state != OPEN:
+            return 0.0
+        return max(self.opened_at + self.reset_seconds - time.monotonic(), 0.0)
+
+    def allow(self) -> bool:
+        """Whether a call may go through now; rejected calls are counted"""
+
+        with self._lock:
+            if self.state == OPEN and self.retry_after() <= 0:
+                self.state = HALF_OPEN
+                self._probes_in_flight = 0
+
+            if self.state == CLOSED:
+                self.stats["calls"] += 1
+                return True
+
+            if self.state == HALF_OPEN and self._probes_in_flight < self.half_open_probes:
+                self._probes_in_flight += 1
+                self.stats["calls"] += 1
+                self.stats["probes"] += 1
+                return True
+
+            self.stats["rejected"] += 1
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.consecutive_failures = 0
+            if self.state == HALF_OPEN:
+                self.state = CLOSED
+                self._probes_in_flight = 0
+
+    def release(self):
+        """Give back a call's probe slot when it ended with no outcome (e.g. cancelled)"""
+        with self._lock:
+            if self.state == HALF_OPEN and self._probes_in_flight > 0:
+                self._probes_in_flight -= 1
+
+    def record_failure(self, timeout: bool = False):
+        with self._lock:
+            self.stats["failures"] += 1
+            if timeout:
+                self.stats["timeouts"] += 1
+            self.consecutive_failures += 1
+
+            if self.state == HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+                if self.state != OPEN:
+                    self.stats["trips"] += 1
+                self.state = OPEN
+                self.opened_at = time.monotonic()
+                self._probes_in_flight = 0
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["state"] = self.state
+            stats["consecutive_failures"] = self.consecutive_failures
+            stats["retry_after_seconds"] = round(self.retry_after(), 2)
+        return stats
+
+
+def parse_timeouts(setting: Optional[str]) -> Dict[str, float]:
+    """
+    Parse TOOL_TIMEOUTS, e.g. "rag=10,database=3", over DEFAULT_TIMEOUTS
+    """
+
+    timeouts = dict(DEFAULT_TIMEOUTS)
+    for part in (setting or "").split(","):
+        if not part.strip():
+            continue
+        name, _, seconds = part.partition("=")
+        timeouts[name.strip()] = float(seconds)
+    return timeouts
@@ -0,0 +1,103 @@
+"""
+Budgets for the multi-round tool loop
+Caps how many tool rounds, how much wall-clock time and how many tokens one turn may use
+"""
+
+import time
+from typing import Any, Dict, List, Optional
+
+
+class QueryBudget:
+    """
+    Limits applied to a single user turn
+
+    Tool rounds stop as soon as any limit is hit; the orchestrator then
+    asks the model for a final answer using whatever it has gathered.
+    """
+
+    def __init__(self,
+                 max_rounds: int = 3,
+                 deadline_seconds: float = 30.0,
+                 max_total_tokens: int = 24000,
+                 final_answer_tokens: int = 1024):
+        """
+        Args:
+            max_rounds: Maximum number of tool-calling rounds
+            deadline_seconds: Wall-clock budget for the whole turn
+            max_total_tokens: Prompt + completion tokens across all calls
+            final_answer_tokens: Tokens reserved for the final answer
+        """
+        self.max_rounds = max_rounds
+        self.deadline_seconds = deadline_seconds
+        self.max_total_tokens = max_total_tokens
+        self.final_answer_tokens = final_answer_tokens
+
+    def start(self) -> "BudgetTracker":
+        """Begin tracking a new turn against this budget"""
+        return BudgetTracker(self)
+
+
+class BudgetTracker:
+    """Per-turn usage against a QueryBudget, plus per-round timings"""
+
+    def __init__(self, budget: QueryBudget):
+        self.budget = budget
+        self.started_at = time.perf_counter()
+        self.tokens_used = 0
+        self.rounds: List[Dict[str, Any]] = []
+        self.stop_reason: Optional[str] = None
+        self.final_seconds = 0.0
+
+    def elapsed(self) -> float:
+        return time.perf_counter() - self.started_at
+
+    def remaining_seconds(self) -> float:
+        return max(self.budget.deadline_seconds - self.elapsed(), 0.0)
+
+    def remaining_tokens(self) -> int:
+        """Tokens a tool round may use, keeping the final answer's reservation back (at least 1)"""
+        return max(self.budget.max_total_tokens - self.tokens_used - self.budget.final_answer_tokens, 1)
+
+    def add_usage(self, response) -> int:
+        """Add the token usage reported on a completion response"""
+
+        usage = getattr(response, "usage", None)
+        tokens = getattr(usage, "total_tokens", 0) or 0
+        self.tokens_used += tokens
+        return tokens
+
+    def exhausted(self) -> Optional[str]:
+        """
+        Check whether another tool round is allowed
+
+        Returns:
+            Name of the limit that was hit, or None if the loop may continue
+        """
+
+        if len(self.rounds) >= self.budget.max_rounds:
+            return "max_rounds"
+        if self.elapsed() >= self.budget.deadline_seconds:
+            return "deadline"
+        if self.tokens_used + self.budget.final_answer_tokens >= self.budget.max_total_tokens:
+            return "tokens"
+        return None
+
+    def record_round(self, llm_seconds: float, tool_seconds: float,
+                     tools: List[str], tokens: int):
+        self.rounds.append({
+            "round": len(self.rounds) + 1,
+            "llm_seconds": round(llm_seconds, 4),
+            "tool_seconds": round(tool_seconds, 4),
+            "tools": tools,
+            "tokens": tokens
+        })
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "rounds": self.rounds,
+            "tool_rounds": len(self.rounds),
+            "tokens_used": self.tokens_used,
+            "final_seconds": round(self.final_seconds, 4),
+            "elapsed_seconds": round(self.elapsed(), 4),
+            "stop_reason": self.stop_reason
+        }
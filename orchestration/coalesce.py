@@ -0,0 +1,85 @@
+"""
+Single-flight request coalescing
+Concurrent callers with the same key share one execution instead of each
+running their own (e.g. dozens of people asking about the same announcement)
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+from typing import Any, Awaitable, Callable, Dict, Tuple
+
+
+class _LeaderCancelled(Exception):
+    """The shared execution was cancelled; waiters run their own"""
+
+
+class SingleFlight:
+    """
+    Deduplicates concurrent calls by key
+
+    The first caller for a key (the leader) runs the coroutine; callers that
+    arrive while it is in flight wait for the same result or exception.
+    Results are not cached once the call finishes. Futures are thread-safe,
+    so callers on different event loops (Streamlit) can share a call.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._in_flight: Dict[Any, concurrent.futures.Future] = {}
+        self.stats = {"executions": 0, "coalesced": 0}
+
+    async def do(self, key: Any, fn: Callable[[], Awaitable[Any]]) -> Tuple[Any, bool]:
+        """
+        Run fn() once for all concurrent callers with this key
+
+        Returns:
+            (result, shared) where shared is True if another caller ran it
+        """
+
+        while True:
+            with self._lock:
+                future = self._in_flight.get(key)
+                leader = future is None
+                if leader:
+                    future = concurrent.futures.Future()
+                    self._in_flight[key] = future
+                    self.stats["executions"] += 1
+                else:
+                    self.stats["coalesced"] += 1
+
+            if leader:
+                return await self._lead(key, future, fn), False
+
+            try:
+                return await asyncio.wrap_future(future), True
+            except _LeaderCancelled:
+                with self._lock:
+                    self.stats["coalesced"] -= 1
+                continue
+
+    async def _lead(self, key: Any, future: concurrent.futures.Future,
+                    fn: Callable[[], Awaitable[Any]]) -> Any:
+        try:
+            result = await fn()
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        except BaseException:
+            future.set_exception(_LeaderCancelled())
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["in_flight"] = len(self._in_flight)
+
+        total = stats["executions"] + stats["coalesced"]
+        stats["coalesce_rate"] = round(stats["coalesced"] / total, 3) if total else 0.0
+        return stats
@@ -0,0 +1,119 @@
+"""
+Token-efficient encoding of tool results for the LLM prompt
+Homogeneous lists of dicts become header-once CSV-style tables instead of repeated JSON keys
+"""
+
+import csv
+import io
+import json
+from typing import Any, Dict, List, Union
+
+# Keys that only matter to our code, not to the model
+BOOKKEEPING_KEYS = {"tool"}
+
+ENCODINGS = ("json", "compact")
+
+
+def _is_table(value: Any) -> bool:
+    """A list of >= 2 flat dicts that all share the same keys"""
+
+    if not isinstance(value, list) or len(value) < 2:
+        return False
+    if not all(isinstance(item, dict) for item in value):
+        return False
+
+    keys = list(value[0].keys())
+    for item in value:
+        if list(item.keys()) != keys:
+            return False
+        if any(isinstance(v, (dict, list)) for v in item.values()):
+            return False
+    return True
+
+
+def _cell(value: Any) -> str:
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return "true" if value else "false"
+    return str(value)
+
+
+def _scalar(value: Any) -> str:
+    if isinstance(value, str) and "\n" not in value:
+        return value
+    return json.dumps(value, ensure_ascii=False, default=str)
+
+
+def _table(name: str, rows: List[Dict[str, Any]]) -> str:
+    columns = list(rows[0].keys())
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    for row in rows:
+        writer.writerow([_cell(row[c]) for c in columns])
+    return f"{name}[{len(rows)}]{{{','.join(columns)}}}:\n{buffer.getvalue().rstrip()}"
+
+
+def encode_compact(result: Dict[str, Any]) -> str:
+    """
+    Compact text encoding of a tool result
+
+    - bookkeeping keys (tool, found=True, empty values) are dropped
+    - tables are written as name[rows]{col1,col2}: followed by CSV rows
+    - other values are written as key: value, nested data as inline JSON
+    """
+
+    if not isinstance(result, dict):
+        return json.dumps(result, ensure_ascii=False, default=str)
+
+    lines = []
+    for key, value in result.items():
+        if key in BOOKKEEPING_KEYS or value is None:
+            continue
+        if key == "found" and value is True:
+            continue
+
+        if _is_table(value):
+            lines.append(_table(key, value))
+        else:
+            lines.append(f"{key}: {_scalar(value)}")
+
+    return "\n".join(lines)
+
+
+class ResultEncoder:
+    """
+    Chooses the encoding of each tool's result
+
+    Args:
+        default: Encoding for tools without an override ("json" or "compact")
+        per_tool: Optional {tool_name: encoding} overrides
+    """
+
+    def __init__(self, default: str = "json", per_tool: Dict[str, str] = None):
+        for encoding in [default] + list((per_tool or {}).values()):
+            if encoding not in ENCODINGS:
+                raise ValueError(f"Unknown result encoding: {encoding} (expected one of {ENCODINGS})")
+
+        self.default = default
+        self.per_tool = dict(per_tool or {})
+
+    @classmethod
+    def from_setting(cls, setting: Union[str, Dict[str, str], "ResultEncoder", None]) -> "ResultEncoder":
+        """Build from a name, a per-tool dict (key "*" = default) or an existing encoder"""
+
+        if isinstance(setting, ResultEncoder):
+            return setting
+        if isinstance(setting, dict):
+            per_tool = dict(setting)
+            default = per_tool.pop("*", "json")
+            return cls(default, per_tool)
+        return cls(setting or "json")
+
+    def encoding_for(self, tool_name: str) -> str:
+        return self.per_tool.get(tool_name, self.default)
+
+    def encode(self, tool_name: str, result: Dict[str, Any]) -> str:
+        if self.encoding_for(tool_name) == "compact":
+            return encode_compact(result)
+        return json.dumps(result)
@@ -0,0 +1,225 @@
+"""
+Record / replay harness for LLM traffic
+Records every Groq chat completion (request + response, including tool_calls) to JSONL,
+and replays them offline with simulated latency for deterministic benchmarks and profiling
+"""
+
+import hashlib
+import json
+import os
+import threading
+import time
+from types import SimpleNamespace
+from typing import Any, Dict, List, Optional
+
+DEFAULT_TRAFFIC_PATH = "data/llm_traffic.jsonl"
+
+
+def request_key(request: Dict[str, Any]) -> str:
+    """Stable hash of the parts of a request that decide the model's answer"""
+
+    relevant = {
+        "model": request.get("model"),
+        "messages": request.get("messages"),
+        "tools": [t.get("function", {}).get("name") for t in request.get("tools") or []],
+        "tool_choice": request.get("tool_choice")
+    }
+    encoded = json.dumps(relevant, sort_keys=True, default=str).encode("utf-8")
+    return hashlib.sha256(encoded).hexdigest()
+
+
+def _to_dict(obj: Any) -> Any:
+    """Turn a Groq response (pydantic model) into plain JSON-able data"""
+
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    if isinstance(obj, (list, tuple)):
+        return [_to_dict(item) for item in obj]
+    if isinstance(obj, dict):
+        return {key: _to_dict(value) for key, value in obj.items()}
+    if hasattr(obj, "__dict__"):
+        return {key: _to_dict(value) for key, value in vars(obj).items()}
+    return obj
+
+
+def _to_namespace(data: Any) -> Any:
+    """Inverse of _to_dict: attribute access like the real response objects"""
+
+    if isinstance(data, dict):
+        return SimpleNamespace(**{key: _to_namespace(value) for key, value in data.items()})
+    if isinstance(data, list):
+        return [_to_namespace(item) for item in data]
+    return data
+
+
+class _Completions:
+    def __init__(self, create_fn):
+        self.create = create_fn
+
+
+class _Chat:
+    def __init__(self, create_fn):
+        self.completions = _Completions(create_fn)
+
+
+class RecordingGroqClient:
+    """
+    Wraps a real Groq client and appends every completion to a JSONL file
+
+    Drop-in replacement: exposes client.chat.completions.create(**kwargs).
+    """
+
+    def __init__(self, client, path: str = DEFAULT_TRAFFIC_PATH):
+        self.client = client
+        self.path = path
+        self._lock = threading.Lock()
+        self.chat = _Chat(self._create)
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def _create(self, **kwargs):
+        start = time.perf_counter()
+        response = self.client.chat.completions.create(**kwargs)
+        latency_ms = (time.perf_counter() - start) * 1000
+
+        record = {
+            "key": request_key(kwargs),
+            "recorded_at": time.time(),
+            "latency_ms": round(latency_ms, 3),
+            "request": kwargs,
+            "response": _to_dict(response)
+        }
+        line = json.dumps(record, default=str) + "\n"
+
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as f:
+                f.write(line)
+
+        return response
+
+
+class ReplayGroqClient:
+    """
+    Serves recorded completions back without any network access
+
+    Requests are matched by request_key first; if the exact request was
+    never recorded (e.g. a tool result changed), the next unused record in
+    file order is returned instead. Latency is simulated per call.
+    """
+
+    def __init__(self, path: str = DEFAULT_TRAFFIC_PATH,
+                 latency: str = "recorded",
+                 latency_scale: float = 1.0,
+                 fixed_latency_ms: float = 0.0):
+        """
+        Args:
+            path: JSONL file written by RecordingGroqClient
+            latency: "recorded" to replay recorded latencies, "fixed" for
+                     fixed_latency_ms on every call, "none" for no delay
+            latency_scale: Multiplier applied to recorded latencies
+            fixed_latency_ms: Delay per call when latency="fixed"
+        """
+        if not os.path.exists(path):
+            raise FileNotFoundError(
+                f"❌ LLM traffic recording not found: {path}\n"
+                f"   Record one first with LLM_MODE=record"
+            )
+
+        self.path = path
+        self.latency = latency
+        self.latency_scale = latency_scale
+        self.fixed_latency_ms = fixed_latency_ms
+
+        self.records: List[Dict[str, Any]] = []
+        with open(path, "r", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    self.records.append(json.loads(line))
+
+        self._by_key: Dict[str, List[int]] = {}
+        for index, record in enumerate(self.records):
+            self._by_key.setdefault(record["key"], []).append(index)
+
+        self._used = [False] * len(self.records)
+        self._next = 0
+        self._lock = threading.Lock()
+
+        self.stats = {"exact": 0, "fallback": 0, "missing": 0}
+        self.chat = _Chat(self._create)
+
+    def _take(self, key: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            for index in self._by_key.get(key, []):
+                if not self._used[index]:
+                    self._used[index] = True
+                    self.stats["exact"] += 1
+                    return self.records[index]
+
+            while self._next < len(self.records) and self._used[self._next]:
+                self._next += 1
+
+            if self._next < len(self.records):
+                self._used[self._next] = True
+                self.stats["fallback"] += 1
+                return self.records[self._next]
+
+            self.stats["missing"] += 1
+            return None
+
+    def _delay_seconds(self, record: Dict[str, Any]) -> float:
+        if self.latency == "recorded":
+            return record.get("latency_ms", 0.0) * self.latency_scale / 1000
+        if self.latency == "fixed":
+            return self.fixed_latency_ms / 1000
+        return 0.0
+
+    def _create(self, **kwargs):
+        record = self._take(request_key(kwargs))
+
+        if record is None:
+            raise RuntimeError(f"No recorded LLM response left in {self.path}")
+
+        # Called from a worker thread, so a blocking sleep is fine here
+        time.sleep(self._delay_seconds(record))
+
+        return _to_namespace(record["response"])
+
+    def reset(self):
+        """Start replaying the recording from the beginning again"""
+        with self._lock:
+            self._used = [False] * len(self.records)
+            self._next = 0
+
+
+def build_llm_client(groq_api_key: Optional[str], mode: str = "live",
+                     path: str = None):
+    """
+    Create the chat client for an LLM mode
+
+    Args:
+        groq_api_key: Groq API key (not needed for replay)
+        mode: "live", "record" or "replay"
+        path: Traffic file (default LLM_TRAFFIC_PATH or data/llm_traffic.jsonl)
+    """
+
+    path = path or os.getenv("LLM_TRAFFIC_PATH", DEFAULT_TRAFFIC_PATH)
+
+    if mode == "replay":
+        return ReplayGroqClient(
+            path,
+            latency=os.getenv("LLM_REPLAY_LATENCY", "recorded"),
+            latency_scale=float(os.getenv("LLM_REPLAY_LATENCY_SCALE", "1.0")),
+            fixed_latency_ms=float(os.getenv("LLM_REPLAY_FIXED_MS", "0"))
+        )
+
+    from groq import Groq
+    client = Groq(api_key=groq_api_key)
+
+    if mode == "record":
+        return RecordingGroqClient(client, path)
+    if mode == "live":
+        return client
+
+    raise ValueError(f"Unknown LLM mode: {mode} (expected live, record or replay)")
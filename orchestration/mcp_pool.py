@@ -0,0 +1,298 @@
+"""
+Client side of the MCP stdio transport
+Spawns MCP server worker processes (mcp_servers/stdio_worker.py) and multiplexes
+tool calls across several workers per server, so CPU-heavy retrieval uses all cores
+and a crashed server does not take the orchestrator down with it
+"""
+
+import asyncio
+import concurrent.futures
+import itertools
+import json
+import os
+import subprocess
+import sys
+import threading
+from typing import Any, Dict, List, Optional
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+WORKER_SCRIPT = os.path.join(PROJECT_ROOT, "mcp_servers", "stdio_worker.py")
+PROTOCOL_VERSION = "2024-11-05"
+
+
+class MCPError(Exception):
+    """JSON-RPC error returned by a worker, or a lost worker"""
+
+
+class StdioMCPClient:
+    """
+    One worker process and its JSON-RPC connection
+
+    Requests are written to the worker's stdin; a reader thread matches
+    responses to pending futures by id, so many calls can be in flight.
+    """
+
+    def __init__(self, server_name: str):
+        self.server_name = server_name
+        self.process: Optional[subprocess.Popen] = None
+        self._ids = itertools.count(1)
+        self._pending: Dict[int, concurrent.futures.Future] = {}
+        self._write_lock = threading.Lock()
+        self._pending_lock = threading.Lock()
+        # Set once the reader sees EOF, which can be before the exit is reaped
+        self._eof = False
+
+    @property
+    def alive(self) -> bool:
+        return self.process is not None and not self._eof and self.process.poll() is None
+
+    @property
+    def in_flight(self) -> int:
+        return len(self._pending)
+
+    def start(self, timeout: float = 300.0) -> Dict[str, Any]:
+        """Spawn the worker and run the MCP initialize handshake"""
+
+        self.process = subprocess.Popen(
+            [sys.executable, WORKER_SCRIPT, self.server_name],
+            stdin=subprocess.PIPE,
+            stdout=subprocess.PIPE,
+            stderr=None,          # worker logs go to our stderr
+            cwd=PROJECT_ROOT,
+            text=True,
+            encoding="utf-8",
+            bufsize=1
+        )
+        threading.Thread(
+            target=self._read_loop, name=f"mcp-{self.server_name}-reader", daemon=True
+        ).start()
+
+        result = self.request("initialize", {
+            "protocolVersion": PROTOCOL_VERSION,
+            "capabilities": {},
+            "clientInfo": {"name": "intellihr-orchestrator", "version": "1.0.0"}
+        }).result(timeout=timeout)
+        self.notify("notifications/initialized")
+        return result
+
+    def _read_loop(self):
+        process = self.process
+        for line in process.stdout:
+            try:
+                message = json.loads(line)
+            except ValueError:
+                continue
+
+            with self._pending_lock:
+                future = self._pending.pop(message.get("id"), None)
+            # A late reply to a call the caller gave up on (timed out/cancelled)
+            if future is None or future.done():
+                continue
+
+            if "error" in message:
+                self._settle(future, exception=MCPError(message["error"].get("message", "unknown error")))
+            else:
+                self._settle(future, result=message.get("result"))
+
+        # EOF: the worker exited, fail everything still waiting
+        with self._pending_lock:
+            self._eof = True
+            pending, self._pending = self._pending, {}
+        for future in pending.values():
+            self._settle(future, exception=MCPError(f"{self.server_name} worker exited"))
+
+    @staticmethod
+    def _settle(future: concurrent.futures.Future, result: Any = None, exception: Exception = None):
+        # The caller may cancel between the done() check and here; losing
+        # that race must not kill the reader thread
+        try:
+            if exception is not None:
+                future.set_exception(exception)
+            else:
+                future.set_result(result)
+        except concurrent.futures.InvalidStateError:
+            pass
+
+    def _forget(self, request_id: int, future: concurrent.futures.Future):
+        if future.cancelled():
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+
+    def _write(self, message: Dict[str, Any]):
+        with self._write_lock:
+            self.process.stdin.write(json.dumps(message) + "\n")
+            self.process.stdin.flush()
+
+    def request(self, method: str, params: Dict[str, Any] = None) -> concurrent.futures.Future:
+        request_id = next(self._ids)
+        future: concurrent.futures.Future = concurrent.futures.Future()
+
+        with self._pending_lock:
+            if self._eof:
+                future.set_exception(MCPError(f"{self.server_name} worker exited"))
+                return future
+            self._pending[request_id] = future
+        # A cancelled call no longer counts as in flight
+        future.add_done_callback(lambda done: self._forget(request_id, done))
+
+        try:
+            self._write({"jsonrpc": "2.0", "id": request_id, "method": method, "params": params or {}})
+        except (BrokenPipeError, OSError, ValueError) as e:
+            with self._pending_lock:
+                self._pending.pop(request_id, None)
+            future.set_exception(MCPError(f"{self.server_name} worker unavailable: {e}"))
+
+        return future
+
+    def notify(self, method: str, params: Dict[str, Any] = None):
+        self._write({"jsonrpc": "2.0", "method": method, "params": params or {}})
+
+    def close(self):
+        if self.process is None:
+            return
+        try:
+            self.process.stdin.close()
+            self.process.wait(timeout=5)
+        except Exception:
+            self.process.kill()
+
+
+class MCPWorkerPool:
+    """
+    Several worker processes for one MCP server
+
+    Each call goes to the live worker with the fewest requests in flight.
+    Dead workers are replaced in the background (a RAG worker can take
+    minutes to load its model), so calls keep flowing to the live ones; only
+    when none is left does a call wait for a replacement. The pool is
+    thread-based, so it works from any event loop (Streamlit creates a new
+    loop per query).
+    """
+
+    def __init__(self, server_name: str, size: int = 2):
+        self.server_name = server_name
+        self.size = max(1, size)
+        self.workers: List[StdioMCPClient] = []
+        self._lock = threading.Lock()
+        # Notified whenever a restart finishes
+        self._changed = threading.Condition(self._lock)
+        self._restarting: Dict[int, threading.Thread] = {}
+        self._closed = False
+        self.stats = {"calls": 0, "errors": 0, "restarts": 0, "restart_failures": 0}
+
+    def start(self):
+        """Spawn all workers in parallel and wait until they are initialized"""
+
+        clients = [StdioMCPClient(self.server_name) for _ in range(self.size)]
+        with concurrent.futures.ThreadPoolExecutor(self.size) as executor:
+            list(executor.map(lambda client: client.start(), clients))
+        self.workers = clients
+        return self
+
+    def _restart(self, index: int, worker: StdioMCPClient):
+        """Replace a dead worker (runs on its own thread, without the lock)"""
+
+        print(f"♻️ Restarting {self.server_name} worker {index}")
+        worker.close()
+        replacement = StdioMCPClient(self.server_name)
+        try:
+            replacement.start()
+        except Exception as e:
+            print(f"❌ {self.server_name} worker {index} failed to restart: {e}")
+            replacement.close()
+            replacement = None
+
+        with self._changed:
+            del self._restarting[index]
+            if replacement is None:
+                self.stats["restart_failures"] += 1
+            elif self._closed:
+                replacement.close()
+            else:
+                self.workers[index] = replacement
+                self.stats["restarts"] += 1
+            self._changed.notify_all()
+
+    def _pick(self) -> StdioMCPClient:
+        with self._changed:
+            for index, worker in enumerate(self.workers):
+                if not worker.alive and index not in self._restarting:
+                    thread = threading.Thread(
+                        target=self._restart, args=(index, worker),
+                        name=f"mcp-{self.server_name}-restart-{index}", daemon=True
+                    )
+                    self._restarting[index] = thread
+                    thread.start()
+
+            while True:
+                live = [worker for worker in self.workers if worker.alive]
+                if live:
+                    return min(live, key=lambda worker: worker.in_flight)
+                if not self._restarting:
+                    raise MCPError(f"No {self.server_name} worker could be started")
+                # Every worker is down: wait for a replacement
+                self._changed.wait()
+
+    def call_tool_sync(self, tool_name: str, arguments: Dict[str, Any],
+                       timeout: float = None) -> Dict[str, Any]:
+        """Blocking tools/call; returns the server's result dict"""
+
+        self.stats["calls"] += 1
+        future = self._pick().request("tools/call", {"name": tool_name, "arguments": arguments})
+        try:
+            return self._unwrap(future.result(timeout=timeout))
+        except Exception:
+            self.stats["errors"] += 1
+            # A timed-out call stops counting as in flight on its worker
+            future.cancel()
+            raise
+
+    async def call_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Awaitable tools/call; returns the server's result dict"""
+
+        self.stats["calls"] += 1
+        worker = await asyncio.to_thread(self._pick)
+        future = worker.request("tools/call", {"name": tool_name, "arguments": arguments})
+        try:
+            return self._unwrap(await asyncio.wrap_future(future))
+        except Exception:
+            self.stats["errors"] += 1
+            raise
+
+    @staticmethod
+    def _unwrap(result: Dict[str, Any]) -> Dict[str, Any]:
+        text = "".join(
+            part.get("text", "") for part in result.get("content", []) if part.get("type") == "text"
+        )
+        return json.loads(text) if text else {}
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            workers = list(self.workers)
+        for worker in workers:
+            worker.close()
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["workers"] = len(self.workers)
+        stats["alive"] = sum(1 for worker in self.workers if worker.alive)
+        stats["in_flight"] = sum(worker.in_flight for worker in self.workers)
+        stats["restarting"] = len(self._restarting)
+        return stats
+
+
+def parse_worker_config(setting: Optional[str]) -> Dict[str, int]:
+    """
+    Parse MCP_WORKERS, e.g. "rag=4,database=2"
+
+    Servers that are not listed (or set to 0) run in-process.
+    """
+
+    config = {}
+    for part in (setting or "").split(","):
+        if not part.strip():
+            continue
+        name, _, count = part.partition("=")
+        config[name.strip()] = int(count or 1)
+    return {name: count for name, count in config.items() if count > 0}
@@ -0,0 +1,133 @@
+"""
+Model tiering per pipeline stage
+A small, fast model picks tools; the large model writes answers and takes over when
+the small one produces malformed tool calls
+"""
+
+import json
+import os
+import threading
+from typing import Any, Dict, List, Optional
+
+DEFAULT_ROUTING_MODEL = "llama-3.1-8b-instant"
+DEFAULT_ANSWER_MODEL = "llama-3.3-70b-versatile"
+
+
+class ModelTiers:
+    """
+    Which model (and completion size) each stage uses
+
+    Args:
+        routing_model: Model for the first, tool-selection call
+        answer_model: Model for later rounds, answers that follow tool calls and
+            escalated first rounds
+        routing_max_tokens: Completion cap for tool selection and direct answers
+        answer_max_tokens: Completion cap for answers
+    """
+
+    def __init__(self,
+                 routing_model: str = None,
+                 answer_model: str = None,
+                 routing_max_tokens: int = 1024,
+                 answer_max_tokens: int = 4096):
+        self.routing_model = routing_model or os.getenv("ROUTING_MODEL", DEFAULT_ROUTING_MODEL)
+        self.answer_model = answer_model or os.getenv("ANSWER_MODEL", DEFAULT_ANSWER_MODEL)
+        self.routing_max_tokens = routing_max_tokens
+        self.answer_max_tokens = answer_max_tokens
+
+    @property
+    def tiered(self) -> bool:
+        return self.routing_model != self.answer_model
+
+
+def find_malformed_tool_call(tool_calls, tools: List[Dict[str, Any]]) -> Optional[str]:
+    """
+    Check tool calls against the tool registry
+
+    Returns:
+        Description of the first problem found, or None if all calls are usable
+    """
+
+    schemas = {tool["function"]["name"]: tool["function"]["parameters"] for tool in tools}
+
+    for tool_call in tool_calls:
+        name = tool_call.function.name
+        if name not in schemas:
+            return f"unknown tool {name}"
+
+        try:
+            arguments = json.loads(tool_call.function.arguments or "{}")
+        except (TypeError, ValueError):
+            return f"invalid JSON arguments for {name}"
+
+        if not isinstance(arguments, dict):
+            return f"arguments for {name} are not an object"
+
+        missing = [p for p in schemas[name].get("required", []) if p not in arguments]
+        if missing:
+            return f"{name} is missing {', '.join(missing)}"
+
+    return None
+
+
+def routing_escalation_reason(choice, tools: List[Dict[str, Any]]) -> Optional[str]:
+    """
+    Decide whether a routing-model reply has to be redone on the answer model
+
+    Malformed tool calls are escalated. A direct answer is kept: the routing model only
+    answers directly for greetings, clarifying questions and out-of-scope requests, which
+    need no retrieved facts, and asking the large model again would double the latency
+    of the cheapest turns. A direct answer cut off at routing_max_tokens is escalated.
+
+    Args:
+        choice: First choice of the routing model's completion
+        tools: Tool registry the call was made with
+
+    Returns:
+        Escalation reason, or None if the reply can be used as is
+    """
+
+    tool_calls = choice.message.tool_calls
+    if tool_calls:
+        return "malformed_tool_call" if find_malformed_tool_call(tool_calls, tools) else None
+    if choice.finish_reason == "length":
+        return "truncated_answer"
+    return None
+
+
+def is_tool_use_error(error: Exception) -> bool:
+    """Groq rejects some malformed tool calls server-side with tool_use_failed"""
+    return "tool_use_failed" in str(error)
+
+
+class StageStats:
+    """Latency and token usage aggregated per stage and model"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.stages: Dict[str, Dict[str, Any]] = {}
+        self.escalations: Dict[str, int] = {}
+
+    def record(self, stage: str, model: str, seconds: float, usage):
+        key = f"{stage}:{model}"
+        with self._lock:
+            entry = self.stages.setdefault(key, {
+                "calls": 0, "seconds": 0.0, "prompt_tokens": 0, "completion_tokens": 0
+            })
+            entry["calls"] += 1
+            entry["seconds"] += seconds
+            entry["prompt_tokens"] += getattr(usage, "prompt_tokens", 0) or 0
+            entry["completion_tokens"] += getattr(usage, "completion_tokens", 0) or 0
+
+    def record_escalation(self, reason: str):
+        with self._lock:
+            self.escalations[reason] = self.escalations.get(reason, 0) + 1
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stages = {}
+            for key, entry in self.stages.items():
+                stages[key] = dict(entry)
+                stages[key]["seconds"] = round(entry["seconds"], 4)
+                stages[key]["avg_seconds"] = round(entry["seconds"] / entry["calls"], 4)
+            return {"stages": stages, "escalations": dict(self.escalations)}
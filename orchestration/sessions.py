@@ -0,0 +1,154 @@
+"""
+Session-scoped conversation state
+Lets one orchestrator (and its MCP servers) serve many users without mixing their histories
+"""
+
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional
+
+from .budget import QueryBudget
+
+
+class Session:
+    """
+    State for one user conversation
+
+    Holds the message history, the budget applied to each turn, a small
+    tool-result cache and the stats of the last turn. The lock serializes
+    turns within a session; different sessions run concurrently.
+    """
+
+    def __init__(self, session_id: str, budget: QueryBudget,
+                 cache_size: int = 32, cache_ttl_seconds: float = 60.0):
+        self.session_id = session_id
+        self.history: List[Dict[str, Any]] = []
+        self.budget = budget
+        self.last_turn_stats: Optional[Dict[str, Any]] = None
+        self.lock = asyncio.Lock()
+
+        self.created_at = time.monotonic()
+        self.last_active = self.created_at
+        self.turns = 0
+
+        self.cache_size = cache_size
+        self.cache_ttl_seconds = cache_ttl_seconds
+        self._tool_cache: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def touch(self):
+        self.last_active = time.monotonic()
+
+    def cache_get(self, key: str) -> Optional[Dict[str, Any]]:
+        """Return a cached tool result if it is still fresh"""
+
+        entry = self._tool_cache.get(key)
+        if entry is None:
+            return None
+
+        stored_at, result = entry
+        if time.monotonic() - stored_at > self.cache_ttl_seconds:
+            del self._tool_cache[key]
+            return None
+
+        self._tool_cache.move_to_end(key)
+        return result
+
+    def cache_put(self, key: str, result: Dict[str, Any]):
+        self._tool_cache[key] = (time.monotonic(), result)
+        self._tool_cache.move_to_end(key)
+        while len(self._tool_cache) > self.cache_size:
+            self._tool_cache.popitem(last=False)
+
+    def reset(self):
+        """Clear history and cached tool results"""
+        self.history = []
+        self._tool_cache.clear()
+        self.last_turn_stats = None
+
+
+class SessionStore:
+    """
+    Bounded map of session id -> Session
+
+    Idle sessions expire after ttl_seconds, and the least recently used
+    ones are evicted once more than max_sessions are alive. Sessions with
+    a turn in progress are never evicted.
+    """
+
+    def __init__(self, default_budget: QueryBudget,
+                 max_sessions: int = 5000, ttl_seconds: float = 1800.0):
+        self.default_budget = default_budget
+        self.max_sessions = max_sessions
+        self.ttl_seconds = ttl_seconds
+
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        # Streamlit runs each browser session on its own thread
+        self._lock = threading.Lock()
+
+        self.stats = {
+            "created": 0,
+            "evicted_ttl": 0,
+            "evicted_lru": 0
+        }
+
+    def get(self, session_id: str, budget: QueryBudget = None) -> Session:
+        """Return the session for session_id, creating it if needed"""
+
+        with self._lock:
+            session = self._sessions.get(session_id)
+
+            if session is None:
+                session = Session(session_id, budget or self.default_budget)
+                self._sessions[session_id] = session
+                self.stats["created"] += 1
+            elif budget is not None:
+                session.budget = budget
+
+            session.touch()
+            self._sessions.move_to_end(session_id)
+            self._evict(keep=session_id)
+
+            return session
+
+    def peek(self, session_id: str) -> Optional[Session]:
+        """Return an existing session without touching or creating it"""
+        with self._lock:
+            return self._sessions.get(session_id)
+
+    def remove(self, session_id: str):
+        with self._lock:
+            self._sessions.pop(session_id, None)
+
+    def _evict(self, keep: str):
+        now = time.monotonic()
+
+        # Oldest first; sessions with a turn in flight count as recently used
+        for _ in range(len(self._sessions)):
+            session_id, session = next(iter(self._sessions.items()))
+            if now - session.last_active <= self.ttl_seconds:
+                break
+            if session_id == keep or session.lock.locked():
+                self._sessions.move_to_end(session_id)
+                continue
+            del self._sessions[session_id]
+            self.stats["evicted_ttl"] += 1
+
+        for _ in range(len(self._sessions)):
+            if len(self._sessions) <= self.max_sessions:
+                break
+            session_id, session = next(iter(self._sessions.items()))
+            if session_id == keep or session.lock.locked():
+                self._sessions.move_to_end(session_id)
+                continue
+            del self._sessions[session_id]
+            self.stats["evicted_lru"] += 1
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def get_stats(self) -> Dict[str, Any]:
+        stats = dict(self.stats)
+        stats["active"] = len(self._sessions)
+        return stats
@@ -0,0 +1,146 @@
+"""
+Speculative policy retrieval
+Starts RAG retrieval on the raw user query while the LLM is still picking tools
+"""
+
+import asyncio
+import re
+import time
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def query_similarity(prefetch_query: str, chosen_query: str) -> float:
+    """
+    Share of the model's search terms that appear in the prefetched query
+
+    The model usually searches with a condensed form of the user's question
+    ("sick leave policy" for "What's the leave policy for sick leave?"), so
+    containment is measured rather than overlap of the two word sets.
+
+    Returns:
+        Score between 0.0 (no term in common) and 1.0 (every term covered)
+    """
+    prefetch_words = set(_WORD_RE.findall(prefetch_query.lower()))
+    chosen_words = set(_WORD_RE.findall(chosen_query.lower()))
+
+    if not prefetch_words or not chosen_words:
+        return 0.0
+
+    return len(chosen_words & prefetch_words) / len(chosen_words)
+
+
+class Prefetch:
+    """A single in-flight speculative retrieval for one user turn"""
+
+    def __init__(self, query: str, task: asyncio.Task):
+        self.query = query
+        self.task = task
+        self.consumed = False
+
+
+class SpeculativeRetriever:
+    """
+    Runs policy retrieval in parallel with the tool-selection completion
+
+    The prefetched result is reused when the raw user query covers enough of
+    the model's chosen search terms, and discarded otherwise.
+    """
+
+    def __init__(self, search_fn: Callable[[str], Awaitable[Dict[str, Any]]], threshold: float = 0.75):
+        """
+        Args:
+            search_fn: Async retrieval function taking a query string
+            threshold: Minimum query_similarity needed to reuse a prefetch
+        """
+        self.search_fn = search_fn
+        self.threshold = threshold
+
+        self.stats = {
+            "started": 0,
+            "reused": 0,
+            "rejected": 0,      # model searched, but with a different query
+            "unused": 0,        # model never called search_policies
+            "failed": 0,
+            "latency_saved_seconds": 0.0,
+            "wasted_seconds": 0.0
+        }
+
+    async def _timed_search(self, query: str):
+        start = time.perf_counter()
+        result = await self.search_fn(query)
+        return result, time.perf_counter() - start
+
+    def start(self, query: str) -> Prefetch:
+        """Kick off retrieval for the raw query as a background task"""
+
+        self.stats["started"] += 1
+        task = asyncio.ensure_future(self._timed_search(query))
+        return Prefetch(query, task)
+
+    async def resolve(self, prefetch: Optional[Prefetch], chosen_query: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the prefetched result if it matches the model's query
+
+        Returns:
+            Retrieval result, or None if the caller should run its own search
+        """
+
+        if prefetch is None or prefetch.consumed:
+            return None
+
+        prefetch.consumed = True
+
+        if query_similarity(prefetch.query, chosen_query) < self.threshold:
+            self.stats["rejected"] += 1
+            self._record_waste(prefetch)
+            return None
+
+        wait_start = time.perf_counter()
+        try:
+            result, duration = await prefetch.task
+        except Exception:
+            self.stats["failed"] += 1
+            return None
+        waited = time.perf_counter() - wait_start
+
+        # Errors and unavailable sources are retried by the model's own call
+        if result.get("error"):
+            self.stats["failed"] += 1
+            return None
+
+        self.stats["reused"] += 1
+        self.stats["latency_saved_seconds"] += max(duration - waited, 0.0)
+        return result
+
+    def discard(self, prefetch: Optional[Prefetch]):
+        """Mark a prefetch as unused once the turn is over"""
+
+        if prefetch is None or prefetch.consumed:
+            return
+
+        prefetch.consumed = True
+        self.stats["unused"] += 1
+        self._record_waste(prefetch)
+
+    def _record_waste(self, prefetch: Prefetch):
+        """Count the full retrieval time as wasted once the search finishes"""
+
+        def _on_done(task: asyncio.Task):
+            if task.cancelled() or task.exception() is not None:
+                return
+            _, duration = task.result()
+            self.stats["wasted_seconds"] += duration
+
+        prefetch.task.add_done_callback(_on_done)
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of speculation metrics, including the reuse rate"""
+
+        stats = dict(self.stats)
+        decided = stats["reused"] + stats["rejected"] + stats["unused"] + stats["failed"]
+        stats["hit_rate"] = round(stats["reused"] / decided, 3) if decided else 0.0
+        stats["latency_saved_seconds"] = round(stats["latency_saved_seconds"], 4)
+        stats["wasted_seconds"] = round(stats["wasted_seconds"], 4)
+        return stats
@@ -0,0 +1,107 @@
+"""
+Concurrent MCP server startup
+Builds every server at once in background threads, so cold start is the slowest
+server rather than the sum of all of them, and queries can use a server as soon
+as it is ready
+"""
+
+import asyncio
+import concurrent.futures
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class ServerStartup:
+    """
+    Starts servers concurrently and tracks when each one becomes ready
+
+    Args:
+        factories: {server name: zero-argument callable that builds the server}
+    """
+
+    def __init__(self, factories: Dict[str, Callable[[], Any]]):
+        self.started = time.perf_counter()
+        self._lock = threading.Lock()
+        self.timings: Dict[str, float] = {}
+        self.ready_at: Dict[str, float] = {}
+        self.errors: Dict[str, str] = {}
+
+        executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max(1, len(factories)), thread_name_prefix="mcp-startup"
+        )
+        self.futures: Dict[str, concurrent.futures.Future] = {
+            name: executor.submit(self._build, name, factory)
+            for name, factory in factories.items()
+        }
+        # Threads finish on their own; nothing else is ever submitted
+        executor.shutdown(wait=False)
+
+    def _build(self, name: str, factory: Callable[[], Any]):
+        start = time.perf_counter()
+        try:
+            server = factory()
+        except Exception as e:
+            with self._lock:
+                self.errors[name] = f"{type(e).__name__}: {e}"
+            print(f"❌ {name} server failed to start: {e}")
+            raise
+        finally:
+            now = time.perf_counter()
+            with self._lock:
+                self.timings[name] = now - start
+                self.ready_at[name] = now - self.started
+
+        print(f"✅ {name} server ready in {self.timings[name]:.2f}s")
+        return server
+
+    def is_ready(self, name: str) -> bool:
+        future = self.futures[name]
+        return future.done() and future.exception() is None
+
+    def get_nowait(self, name: str) -> Optional[Any]:
+        """The server if it is ready, otherwise None"""
+        return self.futures[name].result() if self.is_ready(name) else None
+
+    async def get(self, name: str) -> Any:
+        """
+        Wait until a server is ready
+
+        Raises:
+            The server's startup exception if it failed to start
+        """
+        return await asyncio.wrap_future(self.futures[name])
+
+    def wait(self, timeout: float = None) -> bool:
+        """Block until every server has finished starting; True if all are ready"""
+        done, _ = concurrent.futures.wait(self.futures.values(), timeout=timeout)
+        return len(done) == len(self.futures) and not self.errors
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Per-server status and startup seconds"""
+
+        with self._lock:
+            servers = {}
+            for name, future in self.futures.items():
+                if name in self.errors:
+                    status = "failed"
+                elif future.done():
+                    status = "ready"
+                else:
+                    status = "starting"
+
+                servers[name] = {"status": status}
+                if name in self.timings:
+                    servers[name]["seconds"] = round(self.timings[name], 4)
+                    servers[name]["ready_at_seconds"] = round(self.ready_at[name], 4)
+                if name in self.errors:
+                    servers[name]["error"] = self.errors[name]
+
+            finished = len(self.ready_at) == len(self.futures)
+            return {
+                "servers": servers,
+                "complete": finished,
+                # Wall time until the last server finished vs. one-after-another
+                "total_seconds": round(max(self.ready_at.values()), 4) if finished else None,
+                "sequential_seconds": round(sum(self.timings.values()), 4)
+            }
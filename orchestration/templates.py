@@ -0,0 +1,141 @@
+"""
+Template answers for structured lookups
+When a turn is a single lookup with a small, well-known result (an employee's
+profile, a leave balance, the department headcount), the answer is rendered
+locally and the final LLM completion is skipped
+"""
+
+import threading
+from typing import Any, Callable, Dict, Iterable, Optional, Union
+
+# Renderer: tool result -> answer text, or None if the result does not fit
+Renderer = Callable[[Dict[str, Any]], Optional[str]]
+
+EMPLOYEE_KEYS = ("employee_id", "name", "department", "position", "join_date", "email")
+LEAVE_KEYS = ("employee_id", "name", "casual_leave", "earned_leave", "sick_leave", "total_leaves")
+
+
+def _not_found(result: Dict[str, Any]) -> Optional[str]:
+    if result.get("found") is False and result.get("message"):
+        return f"I couldn't find that: {result['message']}."
+    return None
+
+
+def render_employee(result: Dict[str, Any]) -> Optional[str]:
+    if result.get("found") is not True:
+        return _not_found(result)
+    if any(result.get(key) is None for key in EMPLOYEE_KEYS):
+        return None
+
+    text = (f"**{result['name']}** ({result['employee_id']}) is a {result['position']} "
+            f"in {result['department']}")
+    if result.get("manager"):
+        text += f", reporting to {result['manager']}"
+    return text + (f". They joined on {result['join_date']} and can be reached at "
+                   f"{result['email']}.")
+
+
+def render_leave_balance(result: Dict[str, Any]) -> Optional[str]:
+    if result.get("found") is not True:
+        return _not_found(result)
+    if any(result.get(key) is None for key in LEAVE_KEYS):
+        return None
+
+    text = (f"**{result['name']}** ({result['employee_id']}) has {result['total_leaves']} "
+            f"days of leave available:\n\n"
+            f"- Casual leave: {result['casual_leave']}\n"
+            f"- Earned leave: {result['earned_leave']}\n"
+            f"- Sick leave: {result['sick_leave']}")
+    if result.get("last_updated"):
+        text += f"\n\nLast updated {result['last_updated']}."
+    return text
+
+
+def render_department_summary(result: Dict[str, Any]) -> Optional[str]:
+    departments = result.get("departments")
+    if not isinstance(departments, dict) or result.get("total_employees") is None:
+        return None
+
+    lines = "\n".join(f"- {name}: {count}" for name, count in departments.items())
+    return (f"There are {result['total_employees']} employees across "
+            f"{len(departments)} departments:\n\n{lines}")
+
+
+# LLM tool name -> renderer
+DEFAULT_TEMPLATES: Dict[str, Renderer] = {
+    "get_employee": render_employee,
+    "get_leave_balance": render_leave_balance,
+    "get_department_summary": render_department_summary
+}
+
+
+class ResponseTemplates:
+    """
+    Renders answers for single structured tool calls
+
+    Args:
+        enabled: Tool names to template (default: every tool with a template)
+        templates: {tool_name: renderer}, defaults to DEFAULT_TEMPLATES
+    """
+
+    def __init__(self, enabled: Iterable[str] = None, templates: Dict[str, Renderer] = None):
+        self.templates = dict(templates or DEFAULT_TEMPLATES)
+        self.enabled = set(self.templates if enabled is None else enabled)
+
+        unknown = self.enabled - set(self.templates)
+        if unknown:
+            raise ValueError(f"No response template for: {', '.join(sorted(unknown))}")
+
+        self._lock = threading.Lock()
+        self.stats = {"turns": 0, "rendered": 0, "fallbacks": 0}
+        self.per_tool: Dict[str, int] = {}
+
+    @classmethod
+    def from_setting(cls, setting: Union[str, Iterable[str], "ResponseTemplates", None]) -> "ResponseTemplates":
+        """Build from "off" (default), "all", a comma-separated tool list, a list, or an instance"""
+
+        if isinstance(setting, ResponseTemplates):
+            return setting
+        if setting is None:
+            return cls(enabled=[])
+        if isinstance(setting, str):
+            if setting.strip().lower() == "all":
+                return cls()
+            if setting.strip().lower() in ("", "off", "none"):
+                return cls(enabled=[])
+            setting = [name.strip() for name in setting.split(",") if name.strip()]
+        return cls(enabled=setting)
+
+    def record_turn(self):
+        """Count a finished turn (the denominator of the fire rate)"""
+        with self._lock:
+            self.stats["turns"] += 1
+
+    def render(self, tool_name: str, result: Dict[str, Any]) -> Optional[str]:
+        """
+        Answer text for a tool result
+
+        Returns:
+            None if the tool is not templated or the result has an unexpected shape
+        """
+
+        if tool_name not in self.enabled or not isinstance(result, dict) or result.get("error"):
+            return None
+
+        text = self.templates[tool_name](result)
+
+        with self._lock:
+            if text is None:
+                self.stats["fallbacks"] += 1
+            else:
+                self.stats["rendered"] += 1
+                self.per_tool[tool_name] = self.per_tool.get(tool_name, 0) + 1
+        return text
+
+    def get_stats(self) -> Dict[str, Any]:
+        with self._lock:
+            stats = dict(self.stats)
+            stats["per_tool"] = dict(self.per_tool)
+        stats["enabled"] = sorted(self.enabled)
+        stats["fire_rate"] = round(stats["rendered"] / stats["turns"], 3) if stats["turns"] else 0.0
+        return stats
@@ -0,0 +1,242 @@
+"""
+Structured tracing for the query pipeline
+Records one span per stage (LLM calls, tool calls, embedding, vector search, SQL)
+with durations, token counts and payload sizes, and hands them to pluggable exporters
+"""
+
+import atexit
+import contextvars
+import json
+import os
+import queue
+import threading
+import time
+import uuid
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    """One timed stage of a trace"""
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str],
+                 attributes: Dict[str, Any]):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = uuid.uuid4().hex[:16]
+        self.parent_id = parent_id
+        self.attributes = dict(attributes)
+        self.start_time = time.time()
+        self.duration_ms = 0.0
+        self.status = "ok"
+
+    def set(self, **attributes):
+        """Attach attributes (token counts, payload sizes, ...) to the span"""
+        self.attributes.update(attributes)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start_time": self.start_time,
+            "duration_ms": round(self.duration_ms, 3),
+            "status": self.status,
+            "attributes": self.attributes
+        }
+
+
+class InMemoryExporter:
+    """Keeps the most recent spans in memory (bounded)"""
+
+    def __init__(self, max_spans: int = 10000):
+        self.spans: deque = deque(maxlen=max_spans)
+
+    def export(self, span: Dict[str, Any]):
+        self.spans.append(span)
+
+    def get_trace(self, trace_id: str) -> List[Dict[str, Any]]:
+        return [span for span in self.spans if span["trace_id"] == trace_id]
+
+
+class JsonlExporter:
+    """
+    Appends one JSON object per span to a file
+
+    Spans are queued and written by a background thread through one open file,
+    so exporting never does file I/O on the caller's thread. The file rotates
+    once it reaches max_bytes (path.1 is the newest old file); spans that
+    arrive while the queue is full are dropped and counted.
+    """
+
+    def __init__(self, path: str, max_bytes: int = 50 * 1024 * 1024, backups: int = 3,
+                 max_queue: int = 10000):
+        """
+        Args:
+            path: JSONL file to append to
+            max_bytes: Size at which the file is rotated
+            backups: Rotated files to keep (0: start the file over)
+            max_queue: Spans waiting to be written before new ones are dropped
+        """
+        self.path = path
+        self.max_bytes = max_bytes
+        self.backups = backups
+        self.dropped = 0
+
+        self._queue: queue.Queue = queue.Queue(maxsize=max_queue)
+        self._lock = threading.Lock()
+        self._writer: Optional[threading.Thread] = None
+
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def export(self, span: Dict[str, Any]):
+        line = (json.dumps(span, default=str) + "\n").encode("utf-8")
+        self._start_writer()
+        try:
+            self._queue.put_nowait(line)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+
+    def _start_writer(self):
+        with self._lock:
+            if self._writer is None:
+                self._writer = threading.Thread(target=self._write_loop, name="trace-writer", daemon=True)
+                self._writer.start()
+                # Daemon threads die with the interpreter; write what is queued first
+                atexit.register(self.close)
+
+    def _write_loop(self):
+        f = None
+        size = 0
+        while True:
+            line = self._queue.get()
+            try:
+                if line is None:
+                    break
+                if f is None:
+                    f = open(self.path, "ab")
+                    size = f.tell()
+                f.write(line)
+                size += len(line)
+                if size >= self.max_bytes:
+                    f.close()
+                    f = None
+                    self._rotate()
+                elif self._queue.empty():
+                    f.flush()
+            except OSError as e:
+                print(f"⚠️ Trace export failed (JsonlExporter): {e}")
+                f = None
+            finally:
+                self._queue.task_done()
+
+        if f is not None:
+            f.close()
+
+    def _rotate(self):
+        if self.backups <= 0:
+            os.remove(self.path)
+            return
+        for index in range(self.backups - 1, 0, -1):
+            if os.path.exists(f"{self.path}.{index}"):
+                os.replace(f"{self.path}.{index}", f"{self.path}.{index + 1}")
+        os.replace(self.path, f"{self.path}.1")
+
+    def flush(self):
+        """Block until every queued span has been written"""
+        if self._writer is not None:
+            self._queue.join()
+
+    def close(self):
+        """Write the remaining spans and stop the writer thread"""
+        with self._lock:
+            writer, self._writer = self._writer, None
+        if writer is not None:
+            self._queue.put(None)
+            writer.join()
+            atexit.unregister(self.close)
+
+
+class Tracer:
+    """
+    Creates spans and sends finished ones to every exporter
+
+    Spans nest automatically through a context variable, which asyncio
+    tasks and asyncio.to_thread both inherit, so a SQL query run inside a
+    tool call ends up as a child of that tool call's span.
+    """
+
+    def __init__(self, exporters: List[Any] = None):
+        self.exporters = exporters if exporters is not None else []
+
+    @classmethod
+    def default(cls) -> "Tracer":
+        """
+        In-memory exporter plus a JSONL file (TRACE_PATH, default data/traces.jsonl,
+        rotated at TRACE_MAX_MB megabytes, default 50)
+        """
+        return cls([
+            InMemoryExporter(),
+            JsonlExporter(os.getenv("TRACE_PATH", "data/traces.jsonl"),
+                          max_bytes=int(float(os.getenv("TRACE_MAX_MB", "50")) * 1024 * 1024))
+        ])
+
+    @contextmanager
+    def span(self, name: str, **attributes) -> Iterator[Span]:
+        parent = _current_span.get()
+        trace_id = parent.trace_id if parent else uuid.uuid4().hex
+        span = Span(name, trace_id, parent.span_id if parent else None, attributes)
+
+        token = _current_span.set(span)
+        start = time.perf_counter()
+        try:
+            yield span
+        except BaseException as e:
+            span.status = "error"
+            span.set(error=f"{type(e).__name__}: {e}")
+            raise
+        finally:
+            span.duration_ms = (time.perf_counter() - start) * 1000
+            _current_span.reset(token)
+            self._export(span)
+
+    def _export(self, span: Span):
+        data = span.to_dict()
+        for exporter in self.exporters:
+            try:
+                exporter.export(data)
+            except Exception as e:
+                # Tracing must never break a user query
+                print(f"⚠️ Trace export failed ({type(exporter).__name__}): {e}")
+
+    def close(self):
+        """Flush and stop exporters that write in the background"""
+        for exporter in self.exporters:
+            if hasattr(exporter, "close"):
+                exporter.close()
+
+    def get_trace(self, trace_id: str) -> List[Dict[str, Any]]:
+        """Spans of one trace, from the first in-memory exporter"""
+        for exporter in self.exporters:
+            if isinstance(exporter, InMemoryExporter):
+                return exporter.get_trace(trace_id)
+        return []
+
+    def breakdown(self, trace_id: str) -> Dict[str, float]:
+        """Total milliseconds spent per span name within one trace"""
+        totals: Dict[str, float] = {}
+        for span in self.get_trace(trace_id):
+            totals[span["name"]] = round(totals.get(span["name"], 0.0) + span["duration_ms"], 3)
+        return totals
+
+
+def current_span() -> Optional[Span]:
+    """The innermost open span in this context, if any"""
+    return _current_span.get()
@@ -1,17 +1,45 @@
 import asyncio
+import contextvars
+import copy
+import functools
 import json
+import time
 from typing import Any, Dict, List
-from groq import Groq
 import os
 import sys
+from concurrent.futures import ThreadPoolExecutor
 
 # Add project root to path
 sys.path.append(os.path.dirname(os.path.dirname(__file__)))
 
 # Import your ACTUAL MCP servers
-from mcp_servers.database_server import DatabaseMCPServer
-from mcp_servers.filesystem_server import FilesystemMCPServer
+from mcp_servers.database_server import DatabaseMCPServer, EMPLOYEE_FIELDS, MAX_BULK_IDS
+from mcp_servers.filesystem_server import FilesystemMCPServer, ANNOUNCEMENT_FIELDS, MATCH_FIELDS
 from mcp_servers.rag_server import RAGServer
+from orchestration import (
+    AdmissionController, AsyncDatabase, CircuitBreaker, MCPWorkerPool, ModelTiers, QueryBudget, ResponseTemplates,
+    ResultEncoder, ServerBusy, ServerStartup, SingleFlight, Session, SessionStore, SpeculativeRetriever, StageStats, Tracer,
+    parse_worker_config
+)
+from orchestration.breaker import parse_timeouts
+from orchestration.models import is_tool_use_error, routing_escalation_reason
+from orchestration.llm_replay import build_llm_client
+
+# How each server is described to the model when it is unavailable
+SOURCE_LABELS = {
+    "database": "Employee database",
+    "filesystem": "Announcements",
+    "rag": "Policy documents"
+}
+
+# Threads per in-process filesystem/RAG server
+SERVER_THREADS = 4
+
+# Returned right away when the LLM queue sheds a request
+BUSY_MESSAGE = (
+    "⏳ I'm handling a lot of questions right now and couldn't get to yours in time. "
+    "Please try again in a few seconds."
+)
 
 
 class CollegeAssistantOrchestrator:
@@ -20,22 +48,155 @@ class CollegeAssistantOrchestrator:
     to Database, Filesystem, and RAG MCP servers.
     """
     
-    def __init__(self, groq_api_key: str):
-        self.groq_client = Groq(api_key=groq_api_key)
+    def __init__(self, groq_api_key: str, speculative_retrieval: bool = False,
+                 budget: QueryBudget = None, max_sessions: int = 5000,
+                 session_ttl_seconds: float = 1800.0, tracer: Tracer = None,
+                 llm_mode: str = None, result_encoding=None,
+                 admission: AdmissionController = None, models: ModelTiers = None,
+                 workers: Dict[str, int] = None, wait_for_servers: bool = False,
+                 response_templates=None, tool_timeouts: Dict[str, float] = None,
+                 coalesce: bool = True):
+        # live (default), record (to LLM_TRAFFIC_PATH) or replay (offline)
+        self.llm_mode = llm_mode or os.getenv("LLM_MODE", "live")
+        self.groq_client = build_llm_client(groq_api_key, self.llm_mode)
+        
+        # Small model for tool selection, large model for answers
+        self.models = models or ModelTiers()
+        self.stage_stats = StageStats()
         
-        # Initialize all MCP servers
+        # Global RPM/TPM limits and queue shared by every session
+        self.admission = admission or AdmissionController()
+        
+        # Per-stage spans (in-memory + data/traces.jsonl unless overridden)
+        self.tracer = tracer or Tracer.default()
+        
+        # Servers listed here (e.g. {"rag": 4}, or MCP_WORKERS="rag=4,database=2")
+        # run as pools of MCP stdio worker processes; the rest run in-process
+        self.workers = workers if workers is not None else parse_worker_config(os.getenv("MCP_WORKERS"))
+        
+        # Initialize all MCP servers concurrently in the background; a tool
+        # call only waits for the server it needs
         print("🔧 Initializing MCP servers...")
-        self.db_server = DatabaseMCPServer()
-        self.filesystem_server = FilesystemMCPServer()
-        self.rag_server = RAGServer()
+        self.startup = ServerStartup({
+            name: self._server_factory(name, server_class)
+            for name, server_class in (
+                ("database", DatabaseMCPServer),
+                ("filesystem", FilesystemMCPServer),
+                ("rag", RAGServer)
+            )
+        })
+        if wait_for_servers:
+            self.startup.wait()
+        
+        # Per-server call deadlines (TOOL_TIMEOUTS="rag=10,database=3") and
+        # circuit breakers, so a hung source fails fast instead of stalling turns
+        self.tool_timeouts = tool_timeouts or parse_timeouts(os.getenv("TOOL_TIMEOUTS"))
+        self.breakers = {name: CircuitBreaker() for name in SOURCE_LABELS}
+        
+        # In-process filesystem/RAG calls run on threads of their own, so calls
+        # left running after a timeout can't starve the executor LLM calls use
+        self.server_executors = {
+            name: ThreadPoolExecutor(max_workers=SERVER_THREADS, thread_name_prefix=f"{name}-tool")
+            for name in ("filesystem", "rag")
+        }
         
         # Tool registry
         self.tools = self._build_tool_registry()
         
-        # Conversation history
-        self.conversation_history = []
+        # How tool results are written into the prompt: "json", "compact",
+        # or a {tool_name: encoding} dict ("*" sets the default)
+        self.result_encoder = ResultEncoder.from_setting(
+            result_encoding or os.getenv("RESULT_ENCODING")
+        )
+        
+        # Single structured lookups answered locally, skipping the final LLM
+        # call. Opt-in: "off" (default), "all", or a comma-separated list of tools
+        self.templates = ResponseTemplates.from_setting(
+            response_templates if response_templates is not None else os.getenv("RESPONSE_TEMPLATES")
+        )
+        
+        # Limits for the multi-round tool loop (default for new sessions)
+        self.budget = budget or QueryBudget()
+        
+        # Per-user conversation state, bounded by LRU + idle TTL
+        self.sessions = SessionStore(self.budget, max_sessions, session_ttl_seconds)
+        
+        # Single-flight: concurrent identical tool calls, and identical
+        # first-turn queries (no history to differ on), share one execution
+        self.coalesce = coalesce
+        self.tool_flights = SingleFlight()
+        self.query_flights = SingleFlight()
+        
+        # Speculative policy retrieval (runs alongside the first LLM call)
+        self.speculative_retrieval = speculative_retrieval
+        self.speculator = SpeculativeRetriever(
+            lambda query: self._shared_tool("search_policies", {"query": query})
+        )
         
         print(f"✅ Loaded {len(self.tools)} tools from 3 MCP servers")
+    
+    def _server_factory(self, name: str, server_class):
+        """Build an in-process server, or a worker pool if the server runs remote."""
+        
+        def build():
+            if name in self.workers:
+                print(f"🚀 Starting {self.workers[name]} {name} worker process(es)...")
+                return MCPWorkerPool(name, self.workers[name]).start()
+            
+            server = server_class()
+            # Worker processes are traced as a single tool.execute span
+            server.tracer = self.tracer
+            if name == "database":
+                # Queries get their own threads instead of asyncio's default executor
+                return AsyncDatabase(server)
+            return server
+        
+        return build
+    
+    @property
+    def db_server(self):
+        """Async facade over the in-process database server (None while starting or when remote)."""
+        return None if "database" in self.workers else self.startup.get_nowait("database")
+    
+    @property
+    def filesystem_server(self):
+        """In-process filesystem server (None while starting or when remote)."""
+        return None if "filesystem" in self.workers else self.startup.get_nowait("filesystem")
+    
+    @property
+    def rag_server(self):
+        """In-process RAG server (None while starting or when remote)."""
+        return None if "rag" in self.workers else self.startup.get_nowait("rag")
+    
+    @property
+    def worker_pools(self) -> Dict[str, MCPWorkerPool]:
+        """Worker pools that have finished starting."""
+        pools = {name: self.startup.get_nowait(name) for name in self.workers}
+        return {name: pool for name, pool in pools.items() if pool is not None}
+    
+    @staticmethod
+    def _page_properties(fields: List[str]) -> Dict[str, Any]:
+        """Schema for the fields/limit/cursor parameters shared by list tools."""
+        return {
+            "fields": {
+                "type": "array",
+                "items": {"type": "string", "enum": list(fields)},
+                "description": "Only return these fields (omit for the defaults). Ask only for what you need."
+            },
+            "limit": {
+                "type": "integer",
+                "description": "Maximum number of results to return (default 25, max 200)"
+            },
+            "cursor": {
+                "type": "string",
+                "description": "next_cursor from a previous result, to fetch the next page"
+            }
+        }
+    
+    @staticmethod
+    def _page_args(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Pick the pagination arguments out of a tool call."""
+        return {key: arguments.get(key) for key in ("fields", "limit", "cursor")}
         
     def _build_tool_registry(self) -> List[Dict[str, Any]]:
         """Build a registry of all available tools from MCP servers."""
@@ -50,26 +211,109 @@ class CollegeAssistantOrchestrator:
                         "type": "object",
                         "properties": {
                             "employee_id": {
-                                "type": "integer",
-                                "description": "The employee ID number"
+                                "type": "string",
+                                "description": "Employee ID (e.g., 'EMP001')"
                             }
                         },
                         "required": ["employee_id"]
                     }
                 }
             },
+            {
+                "type": "function",
+                "function": {
+                    "name": "get_leave_balance",
+                    "description": "Get an employee's remaining casual, earned and sick leave",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "employee_id": {
+                                "type": "string",
+                                "description": "Employee ID (e.g., 'EMP001')"
+                            }
+                        },
+                        "required": ["employee_id"]
+                    }
+                }
+            },
+            {
+                "type": "function",
+                "function": {
+                    "name": "get_employees",
+                    "description": f"Get details for several employees in one call (up to {MAX_BULK_IDS}). Use this instead of calling get_employee once per person.",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "employee_ids": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Employee IDs (e.g., ['EMP001', 'EMP006'])"
+                            }
+                        },
+                        "required": ["employee_ids"]
+                    }
+                }
+            },
+            {
+                "type": "function",
+                "function": {
+                    "name": "get_leave_balances",
+                    "description": f"Get remaining leave for several employees in one call (up to {MAX_BULK_IDS}). Use this instead of calling get_leave_balance once per person, e.g. to compare a team.",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "employee_ids": {
+                                "type": "array",
+                                "items": {"type": "string"},
+                                "description": "Employee IDs (e.g., ['EMP001', 'EMP006'])"
+                            }
+                        },
+                        "required": ["employee_ids"]
+                    }
+                }
+            },
+            {
+                "type": "function",
+                "function": {
+                    "name": "get_department_summary",
+                    "description": "Get the number of employees in each department",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {},
+                        "required": []
+                    }
+                }
+            },
+            {
+                "type": "function",
+                "function": {
+                    "name": "get_department_stats",
+                    "description": "Get headcount, average tenure in years and total remaining casual, earned and sick leave for each department (or one department)",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "department": {
+                                "type": "string",
+                                "description": "Department name (e.g., 'Sales'); omit for all departments"
+                            }
+                        },
+                        "required": []
+                    }
+                }
+            },
             {
                 "type": "function",
                 "function": {
                     "name": "search_employees",
-                    "description": "Search for employees by name (partial match)",
+                    "description": "Search for employees by name. Matches whole words or word prefixes (e.g. 'raj kum'), best matches first. Results are paginated.",
                     "parameters": {
                         "type": "object",
                         "properties": {
                             "name": {
                                 "type": "string",
                                 "description": "Name or partial name to search for"
-                            }
+                            },
+                            **self._page_properties(EMPLOYEE_FIELDS)
                         },
                         "required": ["name"]
                     }
@@ -79,14 +323,15 @@ class CollegeAssistantOrchestrator:
                 "type": "function",
                 "function": {
                     "name": "get_employees_by_department",
-                    "description": "Get all employees in a specific department",
+                    "description": "Get all employees in a specific department. Results are paginated.",
                     "parameters": {
                         "type": "object",
                         "properties": {
                             "department": {
                                 "type": "string",
                                 "description": "Department name (e.g., 'Engineering', 'HR', 'Sales')"
-                            }
+                            },
+                            **self._page_properties(EMPLOYEE_FIELDS)
                         },
                         "required": ["department"]
                     }
@@ -96,24 +341,80 @@ class CollegeAssistantOrchestrator:
                 "type": "function",
                 "function": {
                     "name": "get_all_employees",
-                    "description": "Get a list of all employees in the database",
+                    "description": "Get a list of all employees in the database. Results are paginated.",
                     "parameters": {
                         "type": "object",
-                        "properties": {},
+                        "properties": self._page_properties(EMPLOYEE_FIELDS),
                         "required": []
                     }
                 }
             },
+            {
+                "type": "function",
+                "function": {
+                    "name": "get_reports",
+                    "description": "List the people who report to a manager, directly or indirectly, nearest level first. Each result has a level (1 = direct report). Results are paginated.",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "employee_id": {
+                                "type": "string",
+                                "description": "Manager's employee ID (e.g., 'EMP010')"
+                            },
+                            "direct_only": {
+                                "type": "boolean",
+                                "description": "Only list direct reports (default false)"
+                            },
+                            **self._page_properties(EMPLOYEE_FIELDS)
+                        },
+                        "required": ["employee_id"]
+                    }
+                }
+            },
+            {
+                "type": "function",
+                "function": {
+                    "name": "get_management_chain",
+                    "description": "Get an employee's managers, from their direct manager up to the CEO",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "employee_id": {
+                                "type": "string",
+                                "description": "Employee ID (e.g., 'EMP006')"
+                            }
+                        },
+                        "required": ["employee_id"]
+                    }
+                }
+            },
+            {
+                "type": "function",
+                "function": {
+                    "name": "get_team_size",
+                    "description": "Count a manager's direct reports and everyone under them",
+                    "parameters": {
+                        "type": "object",
+                        "properties": {
+                            "employee_id": {
+                                "type": "string",
+                                "description": "Manager's employee ID (e.g., 'EMP010')"
+                            }
+                        },
+                        "required": ["employee_id"]
+                    }
+                }
+            },
             
             # Filesystem Server Tools (Announcements)
             {
                 "type": "function",
                 "function": {
                     "name": "list_announcements",
-                    "description": "List all available announcement files",
+                    "description": "List all available announcement files. Results are paginated.",
                     "parameters": {
                         "type": "object",
-                        "properties": {},
+                        "properties": self._page_properties(ANNOUNCEMENT_FIELDS),
                         "required": []
                     }
                 }
@@ -139,14 +440,15 @@ class CollegeAssistantOrchestrator:
                 "type": "function",
                 "function": {
                     "name": "search_announcements",
-                    "description": "Search announcements by keyword",
+                    "description": "Search announcements by keyword. Results are paginated.",
                     "parameters": {
                         "type": "object",
                         "properties": {
                             "keyword": {
                                 "type": "string",
                                 "description": "Keyword to search for in announcements"
-                            }
+                            },
+                            **self._page_properties(MATCH_FIELDS)
                         },
                         "required": ["keyword"]
                     }
@@ -188,43 +490,323 @@ class CollegeAssistantOrchestrator:
     async def _execute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
         """Execute a tool by routing to the appropriate MCP server."""
         
+        with self.tracer.span("tool.execute", tool=tool_name,
+                              args_bytes=len(json.dumps(arguments))) as span:
+            result = await self._route_tool(tool_name, arguments)
+            span.set(result_bytes=len(json.dumps(result, default=str)),
+                     error=bool(result.get("error")),
+                     unavailable=bool(result.get("unavailable")))
+            return result
+    
+    async def _shared_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Execute a tool, sharing one execution between identical concurrent calls."""
+        
+        if not self.coalesce:
+            return await self._execute_tool(tool_name, arguments)
+        
+        key = f"{tool_name}:{json.dumps(arguments, sort_keys=True)}"
+        result, _ = await self.tool_flights.do(key, lambda: self._execute_tool(tool_name, arguments))
+        return result
+    
+    def _resolve_tool(self, tool_name: str, arguments: Dict[str, Any]):
+        """Map an LLM tool call to (server, server tool name, server arguments)."""
+        
+        # Database Server Tools
+        if tool_name == "get_employee":
+            return "database", "get_employee_info", {"employee_id": str(arguments["employee_id"])}
+        elif tool_name == "get_leave_balance":
+            return "database", "get_leave_balance", {"employee_id": str(arguments["employee_id"])}
+        elif tool_name == "get_employees":
+            return "database", "get_employees_info", {"employee_ids": arguments["employee_ids"]}
+        elif tool_name == "get_leave_balances":
+            return "database", "get_leave_balances", {"employee_ids": arguments["employee_ids"]}
+        elif tool_name == "get_department_summary":
+            return "database", "get_department_summary", {}
+        elif tool_name == "get_department_stats":
+            return "database", "get_department_stats", {"department": arguments.get("department")}
+        elif tool_name == "search_employees":
+            return "database", "search_employees", {
+                "name_contains": arguments["name"], **self._page_args(arguments)
+            }
+        elif tool_name == "get_employees_by_department":
+            return "database", "search_employees", {
+                "department": arguments["department"], **self._page_args(arguments)
+            }
+        elif tool_name == "get_all_employees":
+            return "database", "search_employees", self._page_args(arguments)
+        elif tool_name == "get_reports":
+            return "database", "get_reports", {
+                "employee_id": str(arguments["employee_id"]),
+                "direct_only": bool(arguments.get("direct_only", False)),
+                **self._page_args(arguments)
+            }
+        elif tool_name in ("get_management_chain", "get_team_size"):
+            return "database", tool_name, {"employee_id": str(arguments["employee_id"])}
+        
+        # Filesystem Server Tools
+        elif tool_name == "list_announcements":
+            return "filesystem", "list_announcements", self._page_args(arguments)
+        elif tool_name == "read_announcement":
+            return "filesystem", "read_announcement", {"filename": arguments["filename"]}
+        elif tool_name == "search_announcements":
+            return "filesystem", "search_announcements", {
+                "keyword": arguments["keyword"], **self._page_args(arguments)
+            }
+        
+        # RAG Server Tools
+        elif tool_name == "search_policies":
+            return "rag", "query_policies", {"query": arguments["query"]}
+        elif tool_name == "list_policies":
+            return "rag", "list_policies", {}
+        
+        return None
+    
+    async def _call_server(self, server_name: str, tool_name: str,
+                           arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Call a tool on a server's worker pool or the async database facade, or
+        in-process on the server's own threads.
+        
+        Waits for the server to finish starting if it is not ready yet; the
+        call itself raises asyncio.TimeoutError after the server's deadline.
+        """
+        
+        server = await self.startup.get(server_name)
+        if isinstance(server, (MCPWorkerPool, AsyncDatabase)):
+            call = server.call_tool(tool_name, arguments)
+        else:
+            # Like asyncio.to_thread, but bounded per server; the context copy
+            # keeps the server's spans under the current trace
+            call = asyncio.get_running_loop().run_in_executor(
+                self.server_executors[server_name],
+                contextvars.copy_context().run,
+                functools.partial(server.call_tool, tool_name, **arguments)
+            )
+        
+        return await asyncio.wait_for(call, timeout=self.tool_timeouts.get(server_name))
+    
+    async def _route_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Call the MCP server tool behind an LLM tool name."""
+        
         try:
-            # Database Server Tools
-            if tool_name == "get_employee":
-                return await self.db_server.get_employee(arguments["employee_id"])
-            elif tool_name == "search_employees":
-                return await self.db_server.search_employees(arguments["name"])
-            elif tool_name == "get_employees_by_department":
-                return await self.db_server.get_employees_by_department(arguments["department"])
-            elif tool_name == "get_all_employees":
-                return await self.db_server.get_all_employees()
+            target = self._resolve_tool(tool_name, arguments)
+        except KeyError as e:
+            return {"error": f"Tool execution failed: missing argument {e}"}
+        if target is None:
+            return {"error": f"Unknown tool: {tool_name}"}
+        
+        server_name = target[0]
+        breaker = self.breakers[server_name]
+        if not breaker.allow():
+            return self._unavailable(server_name, "circuit_open")
+        
+        try:
+            result = await self._call_server(*target)
+        except asyncio.TimeoutError:
+            breaker.record_failure(timeout=True)
+            return self._unavailable(server_name, "timeout")
+        except Exception as e:
+            breaker.record_failure()
+            return {"error": f"Tool execution failed: {str(e)}"}
+        except BaseException:
+            # Cancelled: no verdict on the server, but a half-open probe slot
+            # must be handed back or the breaker would never close again
+            breaker.release()
+            raise
+        
+        # The server answered. Errors it reports itself (too many IDs, an
+        # unknown field, an expired cursor) are about the call, not the server
+        breaker.record_success()
+        return result
+    
+    def _unavailable(self, server_name: str, reason: str) -> Dict[str, Any]:
+        """Structured result telling the model a source cannot be reached right now."""
+        
+        breaker = self.breakers[server_name]
+        return {
+            "error": True,
+            "unavailable": True,
+            "source": SOURCE_LABELS[server_name],
+            "reason": reason,
+            "retry_after_seconds": round(breaker.retry_after(), 1),
+            "message": f"{SOURCE_LABELS[server_name]} is temporarily unavailable. "
+                       "Answer with what you have and tell the user this source could not be checked."
+        }
+    
+    async def _create_completion(self, stage: str, priority: int = 10,
+                                 timeout: float = None, **kwargs):
+        """
+        Run a blocking Groq completion in a worker thread, traced as llm.<stage>.
+        
+        The call first waits for admission (RPM/TPM limits); ServerBusy is
+        raised if it cannot be admitted within timeout.
+        """
+        
+        request_bytes = len(json.dumps(kwargs.get("messages", []), default=str))
+        
+        with self.tracer.span(f"llm.{stage}", model=kwargs.get("model"),
+                              request_bytes=request_bytes) as span:
+            # Rough estimate (~4 bytes per token) until the real usage comes back
+            ticket = await self.admission.acquire(
+                request_bytes // 4 + 256, priority=priority, timeout=timeout
+            )
+            span.set(queue_wait_ms=round(ticket.waited * 1000, 3))
             
-            # Filesystem Server Tools
-            elif tool_name == "list_announcements":
-                return await self.filesystem_server.list_announcements()
-            elif tool_name == "read_announcement":
-                return await self.filesystem_server.read_announcement(arguments["filename"])
-            elif tool_name == "search_announcements":
-                return await self.filesystem_server.search_announcements(arguments["keyword"])
+            call_start = time.perf_counter()
+            response = await asyncio.to_thread(self.groq_client.chat.completions.create, **kwargs)
+            call_seconds = time.perf_counter() - call_start
             
-            # RAG Server Tools
-            elif tool_name == "search_policies":
-                return self.rag_server.search_policies(arguments["query"])
-            elif tool_name == "list_policies":
-                return self.rag_server.list_policies()
+            usage = getattr(response, "usage", None)
+            self.admission.settle(ticket, getattr(usage, "total_tokens", 0))
+            message = response.choices[0].message
+            span.set(
+                prompt_tokens=getattr(usage, "prompt_tokens", None),
+                completion_tokens=getattr(usage, "completion_tokens", None),
+                response_chars=len(message.content or ""),
+                tool_calls=len(message.tool_calls or [])
+            )
+            # A tool round that answers directly is really the final generation
+            if stage == "tool_selection" and not message.tool_calls:
+                span.name = "llm.final_generation"
             
+            self.stage_stats.record(span.name[len("llm."):], kwargs.get("model"), call_seconds, usage)
+            return response
+    
+    async def _tool_round_completion(self, messages: List[Dict[str, Any]], tracker,
+                                     priority: int, routing: bool):
+        """
+        One tool-calling completion, on the routing model for the first round.
+        
+        Escalates to the answer model when the routing model's tool calls are
+        malformed or rejected by Groq as tool_use_failed, or when its direct
+        answer was cut off (see routing_escalation_reason).
+        """
+        tiers = self.models
+        
+        if routing and tiers.tiered:
+            try:
+                response = await self._create_completion(
+                    "tool_selection",
+                    priority=priority,
+                    timeout=tracker.remaining_seconds(),
+                    model=tiers.routing_model,
+                    messages=messages,
+                    tools=self.tools,
+                    tool_choice="auto",
+                    max_tokens=min(tiers.routing_max_tokens, tracker.remaining_tokens())
+                )
+            except Exception as e:
+                if not is_tool_use_error(e):
+                    raise
+                reason = "tool_use_failed"
             else:
-                return {"error": f"Unknown tool: {tool_name}"}
-                
-        except Exception as e:
-            return {"error": f"Tool execution failed: {str(e)}"}
+                tracker.add_usage(response)
+                reason = routing_escalation_reason(response.choices[0], self.tools)
+                if reason is None:
+                    return response
+            
+            self.stage_stats.record_escalation(reason)
+        
+        # Rounds after the first continue admitted work, so they jump the queue
+        response = await self._create_completion(
+            "tool_selection",
+            priority=priority if routing else priority - 1,
+            timeout=tracker.remaining_seconds(),
+            model=tiers.answer_model,
+            messages=messages,
+            tools=self.tools,
+            tool_choice="auto",
+            max_tokens=min(tiers.answer_max_tokens, tracker.remaining_tokens())
+        )
+        tracker.add_usage(response)
+        return response
     
-    async def process_query(self, user_query: str, verbose: bool = True) -> str:
+    async def process_query(self, session_id: str, user_query: str, verbose: bool = True,
+                            priority: int = 10, raise_on_shed: bool = False) -> str:
         """
         Process a user query using Groq LLM to orchestrate MCP servers.
+        
+        Each session_id has its own history, budget and tool cache, so one
+        orchestrator can serve many users concurrently. Turns within the same
+        session run one at a time. If the LLM queue is overloaded the turn is
+        shed and BUSY_MESSAGE is returned instead of waiting for a timeout
+        (or ServerBusy is raised, with raise_on_shed, for callers that retry).
+        """
+        session = self.sessions.get(session_id)
+        
+        async with session.lock:
+            history_len = len(session.history)
+            # A turn that fails or is shed leaves no stats behind, rather
+            # than the previous turn's
+            session.last_turn_stats = None
+            with self.tracer.span("query", session_id=session_id,
+                                  query_chars=len(user_query)) as span:
+                try:
+                    if self.coalesce and not history_len:
+                        response, shared = await self._run_first_turn(
+                            session, user_query, verbose, priority
+                        )
+                        span.set(coalesced=shared)
+                    else:
+                        response = await self._run_turn(session, user_query, verbose, priority)
+                except ServerBusy as e:
+                    del session.history[history_len:]
+                    span.set(shed=e.reason)
+                    if verbose:
+                        print(f"⏳ Shed by admission control ({e.reason})")
+                    if raise_on_shed:
+                        raise
+                    return BUSY_MESSAGE
+                except Exception:
+                    # Drop the half-finished turn so the next one starts clean
+                    del session.history[history_len:]
+                    raise
+            
+            if session.last_turn_stats is not None:
+                session.last_turn_stats["trace_id"] = span.trace_id
+                session.last_turn_stats["breakdown_ms"] = self.tracer.breakdown(span.trace_id)
+            session.turns += 1
+            session.touch()
+            self.templates.record_turn()
+            return response
+    
+    async def _run_first_turn(self, session: Session, user_query: str, verbose: bool,
+                              priority: int):
+        """
+        Run a session's first turn, sharing it with identical in-flight first turns.
+        
+        The first caller runs the turn; the others copy its messages into their
+        own history.
+        
+        Returns:
+            (response, shared) where shared is True if another session ran it
+        """
+        
+        async def run():
+            response = await self._run_turn(session, user_query, verbose, priority)
+            return response, list(session.history), session.last_turn_stats
+        
+        key = " ".join(user_query.lower().split())
+        (response, messages, stats), shared = await self.query_flights.do(key, run)
+        
+        if shared:
+            if verbose:
+                print("🔗 Joined an identical in-flight query")
+            session.history.extend(copy.deepcopy(messages))
+            session.last_turn_stats = dict(stats, coalesced=True) if stats else None
+        
+        return response, shared
+    
+    async def _run_turn(self, session: Session, user_query: str, verbose: bool,
+                        priority: int = 10) -> str:
+        """
+        Run one user turn against a session's history.
+        
+        The model may chain several tool rounds (e.g. search for an employee,
+        then fetch their leave balance) until it answers or the session budget runs out.
         """
         # Add user message to history
-        self.conversation_history.append({
+        session.history.append({
             "role": "user",
             "content": user_query
         })
@@ -240,100 +822,233 @@ class CollegeAssistantOrchestrator:
 
 Your behavior:
 - Provide direct, accurate answers using the tools available
+- Chain tool calls when one answer depends on another (e.g. find an employee's ID, then look up their details)
 - Be concise and professional
 - Format lists clearly with line breaks between items for better readability
 
 Be confident and helpful."""
         }
         
-        # Prepare messages for Groq
-        messages = [system_message] + self.conversation_history
-        
         if verbose:
             print("\n🤔 Thinking...")
         
-        # First LLM call to determine which tools to use
-        response = self.groq_client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=messages,
-            tools=self.tools,
-            tool_choice="auto",
-            max_tokens=4096
-        )
-        
-        response_message = response.choices[0].message
-        tool_calls = response_message.tool_calls
+        tracker = session.budget.start()
         
-        # If no tools needed, return direct response
-        if not tool_calls:
-            assistant_message = response_message.content
-            self.conversation_history.append({
-                "role": "assistant",
-                "content": assistant_message
-            })
-            return assistant_message
+        # Start policy retrieval on the raw query while the model picks tools
+        prefetch = self.speculator.start(user_query) if self.speculative_retrieval else None
         
-        # Execute all tool calls
-        self.conversation_history.append({
-            "role": "assistant",
-            "content": response_message.content or "",
-            "tool_calls": [
-                {
-                    "id": tc.id,
-                    "type": "function",
-                    "function": {
-                        "name": tc.function.name,
-                        "arguments": tc.function.arguments
-                    }
-                }
-                for tc in tool_calls
-            ]
-        })
+        try:
+            # Tool rounds: keep calling tools until the model answers or a budget runs out
+            while True:
+                stop_reason = tracker.exhausted()
+                if stop_reason:
+                    tracker.stop_reason = stop_reason
+                    break
+                
+                llm_start = time.perf_counter()
+                tokens_before = tracker.tokens_used
+                response = await self._tool_round_completion(
+                    [system_message] + session.history,
+                    tracker,
+                    priority,
+                    routing=not tracker.rounds
+                )
+                llm_seconds = time.perf_counter() - llm_start
+                round_tokens = tracker.tokens_used - tokens_before
+                
+                response_message = response.choices[0].message
+                tool_calls = response_message.tool_calls
+                
+                # No more tools needed, the model answered directly
+                if not tool_calls:
+                    tracker.stop_reason = "answered"
+                    assistant_message = response_message.content
+                    session.history.append({
+                        "role": "assistant",
+                        "content": assistant_message
+                    })
+                    session.last_turn_stats = tracker.summary()
+                    return assistant_message
+                
+                # Execute all tool calls
+                session.history.append({
+                    "role": "assistant",
+                    "content": response_message.content or "",
+                    "tool_calls": [
+                        {
+                            "id": tc.id,
+                            "type": "function",
+                            "function": {
+                                "name": tc.function.name,
+                                "arguments": tc.function.arguments
+                            }
+                        }
+                        for tc in tool_calls
+                    ]
+                })
+                
+                # Execute each tool call
+                tool_start = time.perf_counter()
+                for tool_call in tool_calls:
+                    function_name = tool_call.function.name
+                    try:
+                        function_args = json.loads(tool_call.function.arguments or "{}")
+                        if not isinstance(function_args, dict):
+                            raise ValueError("arguments are not a JSON object")
+                    except (TypeError, ValueError) as e:
+                        # Hand the problem back to the model rather than failing the turn
+                        if verbose:
+                            print(f"⚠️ Bad arguments for {function_name}: {e}")
+                        tool_result = {"error": f"Invalid arguments for {function_name}: {e}"}
+                        session.history.append({
+                            "role": "tool",
+                            "tool_call_id": tool_call.id,
+                            "content": self.result_encoder.encode(function_name, tool_result)
+                        })
+                        continue
+                    
+                    if verbose:
+                        print(f"🔧 Using: {function_name}({json.dumps(function_args, indent=2)})")
+                    
+                    # Execute the tool (reusing the speculative retrieval when it matches)
+                    tool_result = None
+                    if function_name == "search_policies":
+                        tool_result = await self.speculator.resolve(prefetch, function_args.get("query", ""))
+                        if tool_result is not None and verbose:
+                            print("⚡ Reused prefetched policy results")
+                    cache_key = f"{function_name}:{json.dumps(function_args, sort_keys=True)}"
+                    if tool_result is None:
+                        tool_result = session.cache_get(cache_key)
+                    if tool_result is None:
+                        tool_result = await self._shared_tool(function_name, function_args)
+                        if not tool_result.get("error"):
+                            session.cache_put(cache_key, tool_result)
+                    
+                    if verbose:
+                        print(f"✅ Got result from {function_name}")
+                    
+                    # Add tool response to history
+                    session.history.append({
+                        "role": "tool",
+                        "tool_call_id": tool_call.id,
+                        "content": self.result_encoder.encode(function_name, tool_result)
+                    })
+                
+                # The prefetch only applies to the first round
+                self.speculator.discard(prefetch)
+                
+                tracker.record_round(
+                    llm_seconds,
+                    time.perf_counter() - tool_start,
+                    [tc.function.name for tc in tool_calls],
+                    round_tokens
+                )
+                
+                if verbose:
+                    last = tracker.rounds[-1]
+                    print(f"⏱️ Round {last['round']}: LLM {last['llm_seconds']:.2f}s, "
+                          f"tools {last['tool_seconds']:.2f}s, {last['tokens']} tokens")
+                
+                # A single structured lookup is answered from a template,
+                # skipping the completion that would only reformat it
+                if (len(tracker.rounds) == 1 and len(tool_calls) == 1
+                        and function_name in self.templates.enabled):
+                    with self.tracer.span("template.render", tool=function_name) as span:
+                        templated = self.templates.render(function_name, tool_result)
+                        span.set(rendered=templated is not None)
+                    
+                    if templated is not None:
+                        if verbose:
+                            print("📝 Answered from template")
+                        tracker.stop_reason = "templated"
+                        session.history.append({
+                            "role": "assistant",
+                            "content": templated
+                        })
+                        session.last_turn_stats = tracker.summary()
+                        return templated
+        finally:
+            self.speculator.discard(prefetch)
         
-        # Execute each tool call
-        for tool_call in tool_calls:
-            function_name = tool_call.function.name
-            function_args = json.loads(tool_call.function.arguments)
-            
-            if verbose:
-                print(f"🔧 Using: {function_name}({json.dumps(function_args, indent=2)})")
-            
-            # Execute the tool
-            tool_result = await self._execute_tool(function_name, function_args)
-            
-            if verbose:
-                print(f"✅ Got result from {function_name}")
-            
-            # Add tool response to history
-            self.conversation_history.append({
-                "role": "tool",
-                "tool_call_id": tool_call.id,
-                "content": json.dumps(tool_result)
-            })
-        
-        # Second LLM call to generate final response
+        # Budget ran out: answer with whatever the tools returned so far
         if verbose:
-            print("💭 Generating response...")
-            
-        final_response = self.groq_client.chat.completions.create(
-            model="llama-3.3-70b-versatile",
-            messages=[system_message] + self.conversation_history,
-            max_tokens=4096
+            print(f"💭 Generating response... (stopped: {tracker.stop_reason})")
+        
+        final_messages = [system_message] + session.history + [{
+            "role": "system",
+            "content": "No more tool calls are available for this question. "
+                       "Answer using the information gathered so far and say if anything is missing."
+        }]
+        
+        final_start = time.perf_counter()
+        final_response = await self._create_completion(
+            "final_generation",
+            priority=priority - 1,
+            model=self.models.answer_model,
+            messages=final_messages,
+            max_tokens=min(self.models.answer_max_tokens, tracker.budget.final_answer_tokens)
         )
+        tracker.add_usage(final_response)
+        tracker.final_seconds = time.perf_counter() - final_start
         
         final_message = final_response.choices[0].message.content
         
         # Add to history
-        self.conversation_history.append({
+        session.history.append({
             "role": "assistant",
             "content": final_message
         })
         
+        session.last_turn_stats = tracker.summary()
         return final_message
     
-    def reset_conversation(self):
-        """Clear conversation history."""
-        self.conversation_history = []
+    def get_metrics(self) -> Dict[str, Any]:
+        """Runtime metrics for the orchestrator."""
+        return {
+            "speculative_retrieval": self.speculator.get_stats(),
+            "sessions": self.sessions.get_stats(),
+            "admission": self.admission.get_stats(),
+            "models": self.stage_stats.get_stats(),
+            "workers": {name: pool.get_stats() for name, pool in self.worker_pools.items()},
+            "startup": self.startup.get_stats(),
+            "templates": self.templates.get_stats(),
+            "breakers": {name: breaker.get_stats() for name, breaker in self.breakers.items()},
+            "coalescing": {
+                "tool_calls": self.tool_flights.get_stats(),
+                "queries": self.query_flights.get_stats()
+            },
+            # In-process only; worker processes keep their own
+            "database": self.db_server.get_stats() if self.db_server else None
+        }
+    
+    def get_history(self, session_id: str) -> List[Dict[str, Any]]:
+        """Messages exchanged so far in a session (empty if unknown)."""
+        session = self.sessions.peek(session_id)
+        return session.history if session else []
+    
+    def get_last_turn_stats(self, session_id: str) -> Dict[str, Any]:
+        """Per-round timings and budget usage of the session's last turn."""
+        session = self.sessions.peek(session_id)
+        return session.last_turn_stats if session else None
+    
+    def close(self):
+        """Stop any MCP worker processes and the database and server threads."""
+        # Pools still starting would otherwise be left running
+        self.startup.wait()
+        for pool in self.worker_pools.values():
+            pool.close()
+        if self.db_server:
+            self.db_server.close()
+        self.tracer.close()
+        # Don't wait: a call that hung past its timeout may never return
+        for executor in self.server_executors.values():
+            executor.shutdown(wait=False, cancel_futures=True)
+    
+    def reset_conversation(self, session_id: str):
+        """Clear one session's conversation history."""
+        session = self.sessions.peek(session_id)
+        if session:
+            session.reset()
         print("🔄 Conversation history cleared")
 
 
@@ -342,7 +1057,7 @@ async def main():
     
     # Get API key
     groq_api_key = os.getenv("GROQ_API_KEY")
-    if not groq_api_key:
+    if not groq_api_key and os.getenv("LLM_MODE", "live") != "replay":
         print("❌ Error: GROQ_API_KEY not found in environment variables")
         return
     
@@ -357,6 +1072,9 @@ async def main():
         print(f"❌ Failed to initialize orchestrator: {e}")
         return
     
+    # The CLI is a single conversation
+    session_id = "cli"
+    
     # Demo queries
     demo_queries = [
         "What are the recent announcements?",
@@ -373,7 +1091,7 @@ async def main():
         print('='*60)
         
         try:
-            response = await orchestrator.process_query(query)
+            response = await orchestrator.process_query(session_id, query)
             print(f"\n💬 Response:\n{response}\n")
         except Exception as e:
             print(f"❌ Error processing query: {e}")
@@ -399,13 +1117,13 @@ async def main():
                 break
             
             if user_input.lower() == 'reset':
-                orchestrator.reset_conversation()
+                orchestrator.reset_conversation(session_id)
                 continue
             
             if not user_input:
                 continue
             
-            response = await orchestrator.process_query(user_input)
+            response = await orchestrator.process_query(session_id, user_input)
             print(f"\n💬 Assistant: {response}")
             
         except KeyboardInterrupt:
@@ -413,6 +1131,8 @@ async def main():
             break
         except Exception as e:
             print(f"\n❌ Error: {e}")
+    
+    orchestrator.close()
 
 
 if __name__ == "__main__":
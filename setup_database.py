@@ -1,28 +1,51 @@
 """
 Create demo employee database with sample data
 This simulates a real HR database with employees and leave balances
+
+Usage:
+    python setup_database.py                      # 10-employee demo database
+    python setup_database.py --employees 1000000 --departments 20 --depth 7 \\
+        --ledger 6 --seed 42 --output data/employees_1m.db   # synthetic load-test data
 """
 
+import argparse
 import sqlite3
 import os
-from datetime import datetime, timedelta
+import sys
+import time
+from datetime import date, datetime, timedelta
 import random
 
-def create_database():
-    """Create SQLite database with tables and sample data"""
-    
-    db_path = "data/employees.db"
-    
-    # Remove old database if exists
-    if os.path.exists(db_path):
-        os.remove(db_path)
-        print("🗑️  Removed old database")
-    
-    # Create new database
-    conn = sqlite3.connect(db_path)
-    cursor = conn.cursor()
-    
-    print("📦 Creating database tables...")
+sys.path.append(os.path.dirname(os.path.abspath(__file__)))
+
+from mcp_servers.migrations import LEAVE_LEDGER_TABLE_SQL, migrate
+
+# Annual allowance per leave type (days)
+LEAVE_ALLOWANCE = {"casual": 12, "earned": 18, "sick": 7}
+
+DEPARTMENT_NAMES = [
+    "Engineering", "HR", "Sales", "Marketing", "Finance", "Operations", "Support", "Legal",
+    "Product", "Design", "Research", "Security", "Procurement", "Facilities", "Data",
+    "Quality", "Training", "Compliance", "Customer Success", "Infrastructure"
+]
+TITLES = ["Head", "Director", "Manager", "Team Lead", "Senior Associate", "Associate"]
+FIRST_NAMES = [
+    "Rajesh", "Priya", "Amit", "Sneha", "Vikram", "Ananya", "Rahul", "Meera", "Karthik", "Sunita",
+    "Arjun", "Divya", "Rohan", "Kavya", "Nikhil", "Pooja", "Sanjay", "Lakshmi", "Varun", "Neha",
+    "Aditya", "Isha", "Manoj", "Shreya", "Deepak", "Anjali", "Suresh", "Ritu", "Gaurav", "Swati"
+]
+SURNAME_SYLLABLES = ["ka", "ra", "ja", "mi", "na", "vi", "sha", "de", "pa", "ti", "lo", "su",
+                     "ren", "gup", "ny", "ar", "kum", "iy", "dh", "va"]
+
+BATCH_SIZE = 50000
+
+# "Today" for synthetic data: join dates, leave history and balances are all
+# relative to it, so a fixed date keeps the output the same on every run
+REFERENCE_DATE = date(2025, 1, 1)
+
+
+def create_tables(cursor):
+    """Base tables; indexes and the search index are added by migrations"""
     
     # Table 1: Employees
     cursor.execute("""
@@ -49,6 +72,29 @@ def create_database():
     )
     """)
     
+    # Table 3: Leave history
+    cursor.execute(LEAVE_LEDGER_TABLE_SQL)
+
+
+def create_database():
+    """Create SQLite database with tables and sample data"""
+    
+    db_path = "data/employees.db"
+    
+    # Remove old database if exists
+    if os.path.exists(db_path):
+        os.remove(db_path)
+        print("🗑️  Removed old database")
+    
+    # Create new database (WAL lets the server's pooled readers run alongside writes)
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    cursor = conn.cursor()
+    
+    print("📦 Creating database tables...")
+    
+    create_tables(cursor)
+    
     print("✅ Tables created successfully!")
     
     # Insert sample employees
@@ -112,8 +158,10 @@ def create_database():
     
     print(f"✅ Added leave balances for {len(leave_balances)} employees")
     
-    # Commit and close
+    # Commit, then add indexes and the full-text search index
     conn.commit()
+    migrate(conn)
+    print("✅ Applied schema migrations")
     
     # Display sample data
     print("\n" + "="*60)
@@ -143,5 +191,192 @@ def create_database():
     print("\n✅ Database created successfully!")
     print(f"📍 Location: {db_path}")
 
+
+def level_sizes(employees: int, depth: int):
+    """Employees per org level (level 0 is the CEO), growing geometrically"""
+    
+    depth = max(1, min(depth, employees))
+    
+    # Smallest branching factor whose org of this depth holds everyone
+    low, high = 1.0, float(employees)
+    for _ in range(60):
+        mid = (low + high) / 2
+        if sum(mid ** k for k in range(depth)) >= employees:
+            high = mid
+        else:
+            low = mid
+    
+    sizes, remaining = [], employees
+    for level in range(depth):
+        if level == depth - 1:
+            size = remaining
+        else:
+            # Leave at least one person for every deeper level
+            size = min(remaining - (depth - 1 - level), max(1, round(high ** level)))
+        sizes.append(size)
+        remaining -= size
+    return sizes
+
+
+def department_names(count: int):
+    if count <= len(DEPARTMENT_NAMES):
+        return DEPARTMENT_NAMES[:count]
+    return DEPARTMENT_NAMES + [f"Department {i}" for i in range(len(DEPARTMENT_NAMES) + 1, count + 1)]
+
+
+def generate_database(db_path: str, employees: int = 100000, departments: int = 8,
+                      depth: int = 5, ledger_per_employee: int = 4, seed: int = 42,
+                      as_of: date = REFERENCE_DATE, verbose: bool = True):
+    """
+    Create a synthetic database with the demo schema, for load testing
+    
+    Args:
+        db_path: Output file (replaced if it exists)
+        employees: Number of employees
+        departments: Number of departments under the CEO
+        depth: Levels in the reporting hierarchy (CEO = level 1)
+        ledger_per_employee: Average leave_ledger entries per employee
+        seed: Random seed; the same arguments always produce the same data
+        as_of: Date the data is generated as of (latest join, leave and balance date)
+    """
+    
+    rng = random.Random(seed)
+    depts = department_names(departments)
+    width = max(3, len(str(employees)))
+    today = as_of
+    first_day = today - timedelta(days=20 * 365)
+    year_start = today.replace(month=1, day=1).isoformat()
+    
+    for suffix in ("", "-wal", "-shm"):
+        if os.path.exists(db_path + suffix):
+            os.remove(db_path + suffix)
+    
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA journal_mode = WAL")
+    # Durability doesn't matter while generating a throwaway file
+    conn.execute("PRAGMA synchronous = OFF")
+    create_tables(conn.cursor())
+    
+    start = time.perf_counter()
+    counts = {"employees": 0, "leave_ledger": 0}
+    
+    def random_day(after: date) -> date:
+        return after + timedelta(days=rng.randint(0, max((today - after).days, 0)))
+    
+    def insert(batch, balances, ledger):
+        conn.executemany("INSERT INTO employees VALUES (?, ?, ?, ?, ?, ?, ?)", batch)
+        conn.executemany("INSERT INTO leave_balance VALUES (?, ?, ?, ?, ?)", balances)
+        conn.executemany(
+            "INSERT INTO leave_ledger (emp_id, leave_type, days, start_date) VALUES (?, ?, ?, ?)",
+            ledger
+        )
+        counts["employees"] += len(batch)
+        counts["leave_ledger"] += len(ledger)
+        batch.clear(), balances.clear(), ledger.clear()
+    
+    # One transaction for the whole load; indexes come afterwards
+    conn.execute("BEGIN")
+    
+    next_id = 1
+    previous_level = []       # (emp_id, department) of the level above
+    batch, balances, ledger = [], [], []
+    
+    for level, size in enumerate(level_sizes(employees, depth)):
+        current_level = []
+        for _ in range(size):
+            emp_id = f"EMP{next_id:0{width}d}"
+            
+            if level == 0:
+                department, position, manager = "Executive", "CEO", None
+            else:
+                if level == 1:
+                    # Department heads report to the CEO
+                    manager = previous_level[0][0]
+                    department = depts[len(current_level) % len(depts)]
+                else:
+                    manager, department = rng.choice(previous_level)
+                position = f"{department} {TITLES[min(level - 1, len(TITLES) - 1)]}"
+            
+            first = rng.choice(FIRST_NAMES)
+            surname = "".join(
+                rng.choice(SURNAME_SYLLABLES) for _ in range(rng.randint(2, 4))
+            ).capitalize()
+            joined = random_day(first_day)
+            
+            batch.append((
+                emp_id, f"{first} {surname}", department, position, joined.isoformat(),
+                manager, f"{first.lower()}.{surname.lower()}.{next_id}@company.com"
+            ))
+            
+            # Leave history; this year's entries come off the balance
+            taken = dict.fromkeys(LEAVE_ALLOWANCE, 0)
+            for _ in range(rng.randint(0, 2 * ledger_per_employee)):
+                leave_type = rng.choice(("casual", "casual", "earned", "sick"))
+                days = rng.randint(1, 5)
+                start_day = random_day(joined).isoformat()
+                ledger.append((emp_id, leave_type, days, start_day))
+                if start_day >= year_start:
+                    taken[leave_type] += days
+            balances.append((
+                emp_id,
+                *(max(LEAVE_ALLOWANCE[t] - taken[t], 0) for t in ("casual", "earned", "sick")),
+                today.isoformat()
+            ))
+            
+            current_level.append((emp_id, department))
+            next_id += 1
+            
+            if len(batch) >= BATCH_SIZE:
+                insert(batch, balances, ledger)
+                if verbose:
+                    print(f"   ... {counts['employees']:,} employees")
+        
+        previous_level = current_level
+    
+    insert(batch, balances, ledger)
+    conn.commit()
+    load_seconds = time.perf_counter() - start
+    
+    # Deferred: building indexes once is much faster than maintaining them per row
+    index_start = time.perf_counter()
+    migrate(conn, verbose=verbose)
+    conn.execute("PRAGMA synchronous = NORMAL")
+    conn.close()
+    
+    if verbose:
+        rows = counts["employees"] * 2 + counts["leave_ledger"]
+        print(f"✅ {counts['employees']:,} employees, {counts['leave_ledger']:,} ledger entries "
+              f"in {load_seconds:.1f}s ({rows / max(load_seconds, 1e-9):,.0f} rows/s)")
+        print(f"✅ Indexes built in {time.perf_counter() - index_start:.1f}s")
+        print(f"📍 Location: {db_path}")
+    
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description="Create the employee database: the 10-employee demo, or synthetic data "
+                    "at company scale when --employees is given"
+    )
+    parser.add_argument("--employees", type=int, help="generate this many synthetic employees")
+    parser.add_argument("--departments", type=int, default=8, help="departments under the CEO")
+    parser.add_argument("--depth", type=int, default=5, help="levels in the reporting hierarchy")
+    parser.add_argument("--ledger", type=int, default=4, help="average leave ledger entries per employee")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--as-of", type=date.fromisoformat, default=REFERENCE_DATE,
+                        help=f"generate data as of this date (default {REFERENCE_DATE.isoformat()})")
+    parser.add_argument("--output", default="data/employees.db", help="database file")
+    args = parser.parse_args()
+    
+    if args.employees is None:
+        create_database()
+        return
+    
+    print(f"📦 Generating {args.employees:,} employees ({args.departments} departments, "
+          f"depth {args.depth}, seed {args.seed}, as of {args.as_of})...")
+    generate_database(args.output, args.employees, args.departments, args.depth,
+                      args.ledger, args.seed, args.as_of)
+
+
 if __name__ == "__main__":
-    create_database()
\ No newline at end of file
+    main()
\ No newline at end of file
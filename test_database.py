@@ -2,7 +2,25 @@
 Test the employee database with sample queries
 """
 
+import asyncio
+import os
+import shutil
 import sqlite3
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import date
+
+from mcp_servers.database_server import MAX_BULK_IDS, DatabaseMCPServer
+from mcp_servers.migrations import migrate_file
+from mcp_servers.pagination import (
+    MAX_PAGE_SIZE, clamp_limit, decode_cursor, encode_cursor, paginate_list, resolve_fields
+)
+from mcp_servers.sqlite_pool import SQLitePool
+from orchestration.async_db import AsyncDatabase
+from orchestration.templates import ResponseTemplates
+from setup_database import REFERENCE_DATE, generate_database
 
 def test_database():
     print("🧪 Testing Employee Database\n")
@@ -71,5 +89,554 @@ def test_database():
     print("✅ All database tests passed!")
     print("="*50)
 
+# Table scans that are expected, by exact plan step, for the named queries
+# below; any other SCAN in any query fails the check
+ALLOWED_SCANS = {
+    # department_stats has one row per department: reading all of it is the point
+    "get_department_summary": {"SCAN department_stats"},
+    "get_department_stats (all)": {"SCAN department_stats"},
+    # FTS5 answers MATCH from its own index
+    "search_employees (name)": {"SCAN employees_fts VIRTUAL TABLE INDEX 0:M3"},
+    "search_employees (department + name)": {"SCAN employees_fts VIRTUAL TABLE INDEX 0:M3"},
+    # First directory page: walks idx_employees_name in ORDER BY order and
+    # stops after LIMIT rows, with no sort
+    "search_employees (first page)": {"SCAN e USING INDEX idx_employees_name"},
+}
+
+def full_scans(conn, sql, params=()):
+    """Plan steps that read a whole table or index (covering-index scans are fine)"""
+    plan = [row[3] for row in conn.execute("EXPLAIN QUERY PLAN " + sql, params)]
+    return [step for step in plan if step.startswith("SCAN") and "COVERING INDEX" not in step]
+
+
+def test_query_plans():
+    print("🧪 Checking query plans for hot queries\n")
+    
+    # Capture the SQL the server actually runs, labelled by the call that ran it
+    tmp = tempfile.TemporaryDirectory()
+    path = migrated_copy(tmp.name)
+    server = server_on(path)
+    next_page = server.search_employees(limit=3)["next_cursor"]
+    next_department_page = server.search_employees(department="Engineering", limit=1)["next_cursor"]
+    captured = []
+    label = None
+    run_query = server._query
+    
+    def capture(tool, sql, params=(), fetch="all"):
+        captured.append((label, sql, params))
+        return run_query(tool, sql, params, fetch)
+    
+    server._query = capture
+    
+    calls = [
+        ("get_employee_info", lambda: server.get_employee_info("EMP001")),
+        ("get_leave_balance", lambda: server.get_leave_balance("EMP001")),
+        ("get_department_summary", server.get_department_summary),
+        ("search_employees (department)", lambda: server.search_employees(department="Engineering")),
+        ("search_employees (name)", lambda: server.search_employees(name_contains="raj")),
+        ("search_employees (department + name)",
+         lambda: server.search_employees(department="Engineering", name_contains="raj")),
+        ("search_employees (first page)", lambda: server.search_employees(limit=3)),
+        ("search_employees (next page)", lambda: server.search_employees(limit=3, cursor=next_page)),
+        ("search_employees (department, next page)",
+         lambda: server.search_employees(department="Engineering", limit=1, cursor=next_department_page)),
+        ("get_reports", lambda: server.get_reports("EMP010")),
+        ("get_reports (direct)", lambda: server.get_reports("EMP010", direct_only=True)),
+        ("get_management_chain", lambda: server.get_management_chain("EMP006")),
+        ("get_team_size", lambda: server.get_team_size("EMP010")),
+        ("get_department_stats (all)", server.get_department_stats),
+        ("get_department_stats (one)", lambda: server.get_department_stats("Engineering")),
+        ("get_employees_info", lambda: server.get_employees_info(["EMP001", "EMP006", "EMP010"])),
+        ("get_leave_balances", lambda: server.get_leave_balances(["EMP001", "EMP006", "EMP010"])),
+    ]
+    for label, call in calls:
+        server.cache.clear()
+        call()
+    
+    # Reporting chains and tenure lookups
+    captured.append(("reports", "SELECT emp_id, name FROM employees WHERE manager = ?", ("EMP010",)))
+    captured.append(("joined", "SELECT emp_id FROM employees WHERE join_date >= ? ORDER BY join_date", ("2020-01-01",)))
+    
+    conn = sqlite3.connect(path)
+    for label, sql, params in captured:
+        scans = [step for step in full_scans(conn, sql, params)
+                 if step not in ALLOWED_SCANS.get(label, ())]
+        assert not scans, f"{label} regressed to a table scan: {scans}"
+        print(f"   ✅ {label}: no unexpected table scan")
+    conn.close()
+    close_server(server)
+    tmp.cleanup()
+    
+    print("\n✅ Query plan checks passed!")
+
+
+def migrated_copy(directory):
+    """Copy of the demo database with every migration applied, safe to write to"""
+    path = os.path.join(directory, "employees.db")
+    shutil.copy("data/employees.db", path)
+    migrate_file(path, verbose=False)
+    return path
+
+
+def server_on(path, **kwargs):
+    """DatabaseMCPServer on the database at path instead of data/employees.db"""
+    previous = os.environ.get("EMPLOYEE_DB_PATH")
+    os.environ["EMPLOYEE_DB_PATH"] = path
+    try:
+        return DatabaseMCPServer(**kwargs)
+    finally:
+        if previous is None:
+            del os.environ["EMPLOYEE_DB_PATH"]
+        else:
+            os.environ["EMPLOYEE_DB_PATH"] = previous
+
+
+def close_server(server):
+    server.pool.close()
+    server.cache.close()
+
+
+def closure_from_scratch(conn):
+    """(ancestor, descendant, depth) rows rebuilt with a recursive CTE"""
+    return set(conn.execute("""
+    WITH RECURSIVE paths(ancestor, descendant, depth) AS (
+        SELECT emp_id, emp_id, 0 FROM employees
+        UNION ALL
+        SELECT boss.emp_id, p.descendant, p.depth + 1
+        FROM paths p
+        JOIN employees e ON e.emp_id = p.ancestor
+        JOIN employees boss ON boss.emp_id = e.manager
+    )
+    SELECT ancestor, descendant, depth FROM paths
+    """))
+
+
+def stats_from_scratch(conn):
+    """department_stats rows rebuilt with a GROUP BY"""
+    return sorted(conn.execute("""
+    SELECT e.department, COUNT(*),
+           SUM(CAST(julianday(e.join_date) - 2440587.5 AS INTEGER)),
+           COALESCE(SUM(l.casual_leave), 0), COALESCE(SUM(l.earned_leave), 0),
+           COALESCE(SUM(l.sick_leave), 0), COUNT(l.emp_id)
+    FROM employees e LEFT JOIN leave_balance l ON l.emp_id = e.emp_id
+    GROUP BY e.department
+    """))
+
+
+def test_trigger_maintained_tables():
+    print("🧪 Checking employee_hierarchy and department_stats after writes\n")
+    
+    new_employee = "INSERT INTO employees VALUES (?, ?, ?, ?, ?, ?, ?)"
+    writes = [
+        ("insert a report", new_employee,
+         ("EMP011", "Test Hire", "Engineering", "Developer", "2024-05-01", "EMP006", "hire@company.com")),
+        ("insert a leave balance", "INSERT INTO leave_balance VALUES (?, ?, ?, ?, ?)",
+         ("EMP011", 12, 18, 7, "2024-05-01")),
+        ("insert into a new department", new_employee,
+         ("EMP012", "New Head", "Research", "Head of Research", "2023-01-09", "EMP010", "head@company.com")),
+        ("move an employee to another manager", "UPDATE employees SET manager = ? WHERE emp_id = ?",
+         ("EMP012", "EMP003")),
+        ("move a manager with reports", "UPDATE employees SET manager = ? WHERE emp_id = ?",
+         ("EMP009", "EMP001")),
+        ("move an employee to another department", "UPDATE employees SET department = ? WHERE emp_id = ?",
+         ("Research", "EMP006")),
+        ("change a join date", "UPDATE employees SET join_date = ? WHERE emp_id = ?",
+         ("2018-02-01", "EMP002")),
+        ("update a leave balance", "UPDATE leave_balance SET sick_leave = sick_leave - 2 WHERE emp_id = ?",
+         ("EMP006",)),
+        ("delete a leave balance", "DELETE FROM leave_balance WHERE emp_id = ?", ("EMP004",)),
+        ("delete a manager", "DELETE FROM employees WHERE emp_id = ?", ("EMP008",)),
+        ("change a manager's employee ID", "UPDATE employees SET emp_id = ? WHERE emp_id = ?",
+         ("EMP090", "EMP009")),
+        ("change an ID and manager together", "UPDATE employees SET emp_id = ?, manager = ? WHERE emp_id = ?",
+         ("EMP013", "EMP090", "EMP012")),
+        ("reattach reports to the new ID", "UPDATE employees SET manager = ? WHERE manager = ?",
+         ("EMP090", "EMP009")),
+        ("empty a department", "DELETE FROM employees WHERE emp_id IN (?, ?)", ("EMP005", "EMP007")),
+    ]
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        conn = sqlite3.connect(migrated_copy(tmp))
+    
+        def check(description):
+            assert set(conn.execute("SELECT * FROM employee_hierarchy")) == closure_from_scratch(conn), description
+            assert sorted(conn.execute("SELECT * FROM department_stats")) == stats_from_scratch(conn), description
+    
+        check("after migration")
+        for description, sql, params in writes:
+            conn.execute(sql, params)
+            conn.commit()
+            check(description)
+            print(f"   ✅ {description}")
+    
+        # A manager can't move under one of their own reports
+        try:
+            conn.execute("UPDATE employees SET manager = 'EMP006' WHERE emp_id = 'EMP090'")
+            raise AssertionError("reporting cycle was accepted")
+        except sqlite3.IntegrityError:
+            conn.rollback()
+        check("rejected cycle")
+        print("   ✅ reporting cycle rejected")
+        conn.close()
+    
+    print("\n✅ Trigger-maintained tables match a rebuild!")
+
+
+def test_cache_invalidation():
+    print("🧪 Checking the employee cache sees writes from other connections\n")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = migrated_copy(tmp)
+        server = server_on(path)
+    
+        before = server.get_employee_info("EMP001")
+        assert server.get_employee_info("EMP001") == before
+        assert server.cache.get_stats()["hits"] == 1
+    
+        writer = sqlite3.connect(path)
+        writer.execute("UPDATE employees SET position = 'Principal Developer' WHERE emp_id = 'EMP001'")
+        writer.commit()
+        writer.close()
+    
+        after = server.get_employee_info("EMP001")
+        assert after["position"] == "Principal Developer", after
+        assert server.cache.get_stats()["invalidations"] == 1
+        print("   ✅ cached lookup refreshed after another connection's write")
+    
+        close_server(server)
+    
+    print("\n✅ Cache invalidation checks passed!")
+
+
+def test_cursors():
+    print("🧪 Checking pagination cursors\n")
+    
+    state = {"offset": 50, "after": ["Rajesh Kumar", "EMP001"]}
+    assert decode_cursor(encode_cursor(state)) == state
+    assert decode_cursor(None) == {}
+    for bad in ("not a cursor!", encode_cursor([1, 2])[:-1], "W10"):
+        try:
+            decode_cursor(bad)
+            raise AssertionError(f"accepted malformed cursor {bad!r}")
+        except ValueError:
+            pass
+    print("   ✅ cursors round-trip and malformed ones are rejected")
+    
+    assert clamp_limit(None) == 25 and clamp_limit(0) == 1 and clamp_limit(10000) == MAX_PAGE_SIZE
+    assert resolve_fields("name, name,email", ["name", "email"], ["name"]) == ["name", "email"]
+    try:
+        resolve_fields(["salary"], ["name", "email"], ["name"])
+        raise AssertionError("accepted an unknown field")
+    except ValueError:
+        pass
+    
+    items = [{"id": i, "name": f"item {i}", "size": i * 10} for i in range(7)]
+    pages, cursor = [], None
+    while True:
+        page, cursor = paginate_list(items, ["id"], 3, cursor)
+        pages.append(page)
+        if cursor is None:
+            break
+    assert [len(page) for page in pages] == [3, 3, 1]
+    assert [row for page in pages for row in page] == [{"id": i} for i in range(7)]
+    print("   ✅ paginate_list walks every item once, projected")
+    
+    print("\n✅ Cursor checks passed!")
+
+
+def test_keyset_pagination():
+    print("🧪 Checking keyset pagination of employee listings\n")
+    
+    tmp = tempfile.TemporaryDirectory()
+    path = migrated_copy(tmp.name)
+    server = server_on(path)
+    conn = sqlite3.connect(path)
+    expected = [row[0] for row in conn.execute("SELECT emp_id FROM employees ORDER BY name, emp_id")]
+    engineering = [row[0] for row in conn.execute(
+        "SELECT emp_id FROM employees WHERE department = 'Engineering' ORDER BY name, emp_id"
+    )]
+    conn.close()
+    
+    for department, ids in ((None, expected), ("Engineering", engineering)):
+        seen, cursor = [], None
+        while True:
+            page = server.search_employees(department=department, limit=3, cursor=cursor)
+            seen.extend(employee["employee_id"] for employee in page["employees"])
+            cursor = page["next_cursor"]
+            if cursor is None:
+                break
+        assert seen == ids, (department, seen)
+        
+        streamed = [employee["employee_id"]
+                    for chunk in server.iter_employees(department=department, chunk_size=4)
+                    for employee in chunk]
+        assert streamed == ids, (department, streamed)
+    print("   ✅ pages and streamed chunks cover every employee once, in order")
+    
+    # Offset cursors from other tools are not keyset cursors
+    page = server.search_employees(cursor=encode_cursor({"offset": 3}))
+    assert page.get("error"), page
+    print("   ✅ non-keyset cursor rejected")
+    close_server(server)
+    tmp.cleanup()
+    
+    print("\n✅ Keyset pagination checks passed!")
+
+
+def test_async_database():
+    print("🧪 Checking the async database facade\n")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        server = server_on(migrated_copy(tmp))
+        db = AsyncDatabase(server, max_workers=2)
+        
+        # Each coroutine is named after an orchestrator tool and must return
+        # what the matching server call returns
+        cases = [
+            (db.get_employee("EMP001"), server.get_employee_info("EMP001")),
+            (db.get_employees(["EMP006", "EMP001"]), server.get_employees_info(["EMP006", "EMP001"])),
+            (db.get_leave_balance("EMP001"), server.get_leave_balance("EMP001")),
+            (db.get_leave_balances(["EMP001", "EMP999"]), server.get_leave_balances(["EMP001", "EMP999"])),
+            (db.get_department_summary(), server.get_department_summary()),
+            (db.get_department_stats("Engineering"), server.get_department_stats("Engineering")),
+            (db.search_employees("raj", limit=2), server.search_employees(name_contains="raj", limit=2)),
+            (db.get_employees_by_department("Engineering"), server.search_employees(department="Engineering")),
+            (db.get_all_employees(limit=3), server.search_employees(limit=3)),
+            (db.get_reports("EMP010", direct_only=True), server.get_reports("EMP010", direct_only=True)),
+            (db.get_management_chain("EMP006"), server.get_management_chain("EMP006")),
+            (db.get_team_size("EMP010"), server.get_team_size("EMP010")),
+        ]
+        
+        async def run():
+            return await asyncio.gather(*(call for call, _ in cases))
+        
+        results = asyncio.run(run())
+        for result, (_, expected) in zip(results, cases):
+            assert not result.get("error"), result
+            assert result == expected, (result, expected)
+        assert db.get_stats()["executor"]["calls"] == len(cases)
+        print(f"   ✅ {len(cases)} tool coroutines match the server")
+        
+        db.close()
+    
+    print("\n✅ Async database checks passed!")
+
+
+def test_response_templates():
+    print("🧪 Checking template answers against real tool results\n")
+    
+    templates = ResponseTemplates()
+    with tempfile.TemporaryDirectory() as tmp:
+        server = server_on(migrated_copy(tmp))
+    
+        assert templates.render("get_employee", server.get_employee_info("EMP006")) == (
+            "**Ananya Iyer** (EMP006) is a Junior Developer in Engineering, reporting to EMP001. "
+            "They joined on 2023-01-10 and can be reached at ananya.iyer@company.com."
+        )
+        # No manager: the reporting line is left out
+        assert "reporting to" not in templates.render("get_employee", server.get_employee_info("EMP010"))
+        print("   ✅ get_employee")
+    
+        assert templates.render("get_leave_balance", server.get_leave_balance("EMP001")) == (
+            "**Rajesh Kumar** (EMP001) has 28 days of leave available:\n\n"
+            "- Casual leave: 10\n- Earned leave: 12\n- Sick leave: 6\n\n"
+            f"Last updated {server.get_leave_balance('EMP001')['last_updated']}."
+        )
+        print("   ✅ get_leave_balance")
+    
+        summary = templates.render("get_department_summary", server.get_department_summary())
+        assert summary.startswith("There are 10 employees across 6 departments:\n\n- Engineering: 3\n")
+        assert summary.count("\n- ") == 6
+        print("   ✅ get_department_summary")
+    
+        assert templates.render("get_employee", server.get_employee_info("EMP999")) == \
+            "I couldn't find that: Employee EMP999 not found."
+        assert templates.render("get_leave_balance", server.get_leave_balance("EMP999")) == \
+            "I couldn't find that: Leave balance not found for EMP999."
+        print("   ✅ unknown employees answered from the not-found message")
+    
+        # Results the templates don't recognise go back to the LLM
+        partial = dict(server.get_employee_info("EMP001"), email=None)
+        assert templates.render("get_employee", partial) is None
+        assert templates.render("get_employee", {"error": "Database error: locked"}) is None
+        assert templates.render("search_employees", server.search_employees(name_contains="raj")) is None
+        assert ResponseTemplates.from_setting("off").render("get_employee", server.get_employee_info("EMP001")) is None
+        close_server(server)
+    
+    stats = templates.get_stats()
+    assert stats["rendered"] == 6 and stats["fallbacks"] == 1
+    assert stats["per_tool"] == {"get_employee": 3, "get_leave_balance": 2, "get_department_summary": 1}
+    print("   ✅ unexpected results, errors and untemplated tools fall back to the LLM")
+    
+    print("\n✅ Response template checks passed!")
+
+
+def test_connection_pool():
+    print("🧪 Checking connection pool checkout and return under concurrency\n")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = migrated_copy(tmp)
+        pool = SQLitePool(path, size=2)
+        assert pool.wal
+    
+        lock = threading.Lock()
+        state = {"in_use": 0, "max_in_use": 0}
+        used = set()
+    
+        def lookup(_):
+            with pool.connection() as conn:
+                with lock:
+                    state["in_use"] += 1
+                    state["max_in_use"] = max(state["max_in_use"], state["in_use"])
+                    used.add(id(conn))
+                time.sleep(0.02)
+                count = conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0]
+                with lock:
+                    state["in_use"] -= 1
+                return count
+    
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            assert list(executor.map(lookup, range(16))) == [10] * 16
+    
+        stats = pool.get_stats()
+        assert state["max_in_use"] == 2 and len(used) == 2
+        assert (stats["checkouts"], stats["opened"], stats["open"], stats["idle"]) == (16, 2, 2, 2)
+        assert stats["waits"] > 0
+        print("   ✅ 16 lookups from 8 threads shared 2 connections, never more at once")
+    
+        # Read-only connections refuse writes; the failed one is replaced
+        try:
+            with pool.connection() as conn:
+                conn.execute("DELETE FROM employees")
+            raise AssertionError("read-only pool connection accepted a write")
+        except sqlite3.OperationalError:
+            pass
+        assert pool.get_stats()["open"] == 1
+        assert lookup(0) == 10 and lookup(0) == 10
+        assert pool.get_stats()["opened"] == 2
+        print("   ✅ broken connections closed and replaced")
+        pool.close()
+        assert pool.get_stats()["idle"] == 0
+    
+        # An uncommitted write is rolled back before the connection is reused
+        pool = SQLitePool(path, size=1, read_only=False)
+        with pool.connection() as conn:
+            conn.execute("DELETE FROM employees")
+        with pool.connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0] == 10
+        pool.close()
+        print("   ✅ open transactions rolled back on return")
+    
+        pool = SQLitePool(path, size=0)
+        with pool.connection() as conn:
+            assert conn.execute("SELECT COUNT(*) FROM employees").fetchone()[0] == 10
+        assert pool.get_stats()["open"] == 0 and pool.get_stats()["idle"] == 0
+        print("   ✅ size 0 opens a connection per call")
+    
+    print("\n✅ Connection pool checks passed!")
+
+
+def test_generator_determinism():
+    print("🧪 Checking the synthetic data generator is reproducible\n")
+    
+    def dump(path):
+        conn = sqlite3.connect(path)
+        try:
+            return list(conn.iterdump())
+        finally:
+            conn.close()
+    
+    def latest_date(path):
+        conn = sqlite3.connect(path)
+        try:
+            return max(conn.execute(
+                "SELECT MAX(join_date) FROM employees UNION ALL SELECT MAX(start_date) FROM leave_ledger "
+                "UNION ALL SELECT MAX(last_updated) FROM leave_balance"
+            ).fetchall())[0]
+        finally:
+            conn.close()
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        def generate(name, **kwargs):
+            path = os.path.join(tmp, f"{name}.db")
+            counts = generate_database(path, 300, departments=4, depth=4, ledger_per_employee=2,
+                                       verbose=False, **kwargs)
+            return path, counts
+    
+        first, first_counts = generate("first", seed=7)
+        second, second_counts = generate("second", seed=7)
+        assert first_counts == second_counts and first_counts["employees"] == 300
+        assert dump(first) == dump(second)
+        print("   ✅ same seed and date: identical contents, migrations included")
+    
+        # Regenerating over an existing file replaces it
+        generate("first", seed=7)
+        assert dump(first) == dump(second)
+        print("   ✅ regenerating in place gives the same database")
+    
+        other, _ = generate("other", seed=8)
+        assert dump(other) != dump(first)
+        later, _ = generate("later", seed=7, as_of=date(2026, 6, 30))
+        assert dump(later) != dump(first)
+        assert latest_date(first) <= REFERENCE_DATE.isoformat()
+        assert latest_date(later) <= "2026-06-30"
+        print("   ✅ seed and as-of date change the data; nothing dated after as-of")
+    
+    print("\n✅ Generator determinism checks passed!")
+
+
+def test_bulk_lookups():
+    print("🧪 Checking bulk employee and leave lookups\n")
+    
+    with tempfile.TemporaryDirectory() as tmp:
+        path = migrated_copy(tmp)
+        # An employee without a leave balance row
+        conn = sqlite3.connect(path)
+        conn.execute("DELETE FROM leave_balance WHERE emp_id = 'EMP004'")
+        conn.commit()
+        conn.close()
+        server = server_on(path)
+    
+        def single(result):
+            return {key: value for key, value in result.items() if key not in ("tool", "found")}
+    
+        result = server.get_employees_info(["EMP006", " EMP001", "EMP999", "EMP006", "EMP010"])
+        assert [e["employee_id"] for e in result["employees"]] == ["EMP006", "EMP001", "EMP010"]
+        assert result["count"] == 3 and result["not_found"] == ["EMP999"]
+        assert result["employees"] == [single(server.get_employee_info(i)) for i in ("EMP006", "EMP001", "EMP010")]
+        print("   ✅ employees in request order, duplicates dropped, missing IDs reported")
+    
+        result = server.get_leave_balances("EMP010, EMP004,EMP999,EMP002")
+        assert [b["employee_id"] for b in result["balances"]] == ["EMP010", "EMP002"]
+        assert result["not_found"] == ["EMP004", "EMP999"]
+        assert result["balances"] == [single(server.get_leave_balance(i)) for i in ("EMP010", "EMP002")]
+        print("   ✅ balances in request order; no balance row counts as not found")
+    
+        ids = [f"EMP{i:03d}" for i in range(MAX_BULK_IDS, 0, -1)]
+        result = server.get_employees_info(ids)
+        assert result["count"] == 10 and len(result["not_found"]) == MAX_BULK_IDS - 10
+        assert [e["employee_id"] for e in result["employees"]] == [f"EMP{i:03d}" for i in range(10, 0, -1)]
+    
+        for lookup in (server.get_employees_info, server.get_leave_balances):
+            assert lookup([" ", ""])["error"] is True
+            too_many = lookup([f"EMP{i}" for i in range(MAX_BULK_IDS + 1)])
+            assert too_many["error"] is True and str(MAX_BULK_IDS) in too_many["message"]
+        print(f"   ✅ up to {MAX_BULK_IDS} IDs per call; empty or oversized lists rejected")
+    
+        close_server(server)
+    
+    print("\n✅ Bulk lookup checks passed!")
+
+
 if __name__ == "__main__":
-    test_database()
\ No newline at end of file
+    test_database()
+    test_query_plans()
+    test_trigger_maintained_tables()
+    test_cache_invalidation()
+    test_cursors()
+    test_keyset_pagination()
+    test_async_database()
+    test_response_templates()
+    test_connection_pool()
+    test_generator_determinism()
+    test_bulk_lookups()
\ No newline at end of file
@@ -0,0 +1,790 @@
+"""
+Test the orchestration helpers (no LLM or MCP servers needed)
+"""
+
+import asyncio
+import json
+import os
+import tempfile
+import threading
+import time
+from types import SimpleNamespace
+
+from orchestration import mcp_pool
+from orchestration.admission import AdmissionController, ServerBusy
+from orchestration.breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from orchestration.budget import QueryBudget
+from orchestration.coalesce import SingleFlight
+from orchestration.encoding import ResultEncoder, encode_compact
+from orchestration.llm_replay import RecordingGroqClient, ReplayGroqClient
+from orchestration.models import StageStats, find_malformed_tool_call, routing_escalation_reason
+from orchestration.sessions import SessionStore
+from orchestration.speculative import SpeculativeRetriever, query_similarity
+from orchestration.startup import ServerStartup
+from orchestration.tracing import InMemoryExporter, JsonlExporter, Tracer
+
+
+def test_circuit_breaker():
+    print("🧪 Testing circuit breaker transitions\n")
+
+    breaker = CircuitBreaker(failure_threshold=2, reset_seconds=0.05)
+
+    # Closed until failure_threshold consecutive failures
+    assert breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_success()
+    breaker.record_failure()
+    assert breaker.state == CLOSED
+    breaker.record_failure(timeout=True)
+    assert breaker.state == OPEN
+    assert not breaker.allow()
+    print("   ✅ closed -> open after consecutive failures")
+
+    # Half-open after the cool-down: one probe at a time
+    time.sleep(0.06)
+    assert breaker.allow()
+    assert breaker.state == HALF_OPEN
+    assert not breaker.allow()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+    print("   ✅ failed probe reopens")
+
+    time.sleep(0.06)
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.allow()
+    print("   ✅ successful probe closes")
+
+    stats = breaker.get_stats()
+    assert stats["trips"] == 2 and stats["timeouts"] == 1 and stats["rejected"] == 2
+
+    print("\n✅ Circuit breaker tests passed!")
+
+
+def test_cancelled_probe_releases_slot():
+    print("🧪 Testing a cancelled half-open probe\n")
+
+    breaker = CircuitBreaker(failure_threshold=1, reset_seconds=0.05)
+    breaker.record_failure()
+    time.sleep(0.06)
+
+    async def probe():
+        assert breaker.allow()
+        try:
+            await asyncio.sleep(10)
+        except BaseException:
+            breaker.release()
+            raise
+
+    async def run():
+        task = asyncio.create_task(probe())
+        await asyncio.sleep(0.01)
+        task.cancel()
+        try:
+            await task
+        except asyncio.CancelledError:
+            pass
+
+    asyncio.run(run())
+
+    # The slot came back, so the next call can probe and close the breaker
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    print("   ✅ probe slot released on cancellation")
+
+    print("\n✅ Cancelled probe tests passed!")
+
+
+def test_query_budget():
+    print("🧪 Testing per-turn budgets\n")
+
+    def completion(tokens):
+        return SimpleNamespace(usage=SimpleNamespace(total_tokens=tokens))
+
+    tracker = QueryBudget(max_rounds=2, deadline_seconds=30, max_total_tokens=1000,
+                          final_answer_tokens=200).start()
+    assert tracker.exhausted() is None
+    tracker.record_round(0.1, 0.05, ["get_employee"], tracker.add_usage(completion(300)))
+    assert tracker.exhausted() is None
+    tracker.record_round(0.1, 0.05, ["get_leave_balance"], tracker.add_usage(completion(100)))
+    assert tracker.exhausted() == "max_rounds"
+    print("   ✅ stops after max_rounds")
+
+    # The final answer's reservation counts against the token limit
+    tracker = QueryBudget(max_rounds=5, max_total_tokens=1000, final_answer_tokens=200).start()
+    assert tracker.remaining_tokens() == 800
+    tracker.add_usage(completion(799))
+    assert tracker.exhausted() is None
+    assert tracker.remaining_tokens() == 1
+    tracker.add_usage(completion(1))
+    assert tracker.exhausted() == "tokens"
+    tracker.add_usage(completion(500))
+    assert tracker.remaining_tokens() == 1
+    tracker.add_usage(SimpleNamespace(usage=None))
+    assert tracker.tokens_used == 1300
+    print("   ✅ tool rounds can't spend the final answer's tokens")
+
+    tracker = QueryBudget(deadline_seconds=0.02).start()
+    time.sleep(0.03)
+    assert tracker.exhausted() == "deadline"
+    assert tracker.remaining_seconds() == 0.0
+    print("   ✅ stops at the deadline")
+
+    summary = tracker.summary()
+    assert summary["tool_rounds"] == 0 and summary["stop_reason"] is None
+
+    print("\n✅ Budget tests passed!")
+
+
+def test_session_eviction():
+    print("🧪 Testing session eviction\n")
+
+    store = SessionStore(QueryBudget(), max_sessions=2, ttl_seconds=60)
+    first = store.get("a")
+    first.history.append({"role": "user", "content": "hi"})
+    store.get("b")
+    assert store.get("a") is first and first.history
+    store.get("c")
+    assert store.peek("b") is None and store.peek("a") is first
+    assert store.get_stats()["evicted_lru"] == 1
+    print("   ✅ least recently used session evicted")
+
+    async def busy_turn():
+        async with store.get("a").lock:
+            store.get("d")
+            store.get("e")
+            # A session with a turn in flight is skipped, even if oldest
+            assert store.peek("a") is first
+
+    asyncio.run(busy_turn())
+    print("   ✅ session with a turn in progress kept")
+
+    store = SessionStore(QueryBudget(), max_sessions=10, ttl_seconds=0.02)
+    store.get("idle")
+    time.sleep(0.03)
+    store.get("fresh")
+    assert store.peek("idle") is None and len(store) == 1
+    assert store.get_stats()["evicted_ttl"] == 1
+    print("   ✅ idle session expired")
+
+    print("\n✅ Session eviction tests passed!")
+
+
+def test_result_encoding():
+    print("🧪 Testing tool result encoding\n")
+
+    result = {
+        "employees": [
+            {"employee_id": "EMP001", "name": "Rajesh Kumar", "manager": "EMP010", "active": True},
+            {"employee_id": "EMP006", "name": "Kumar, Ananya", "manager": None, "active": False}
+        ],
+        "count": 2,
+        "found": True,
+        "next_cursor": None,
+        "filters": {"department": "Engineering"},
+        "tool": "search_employees"
+    }
+    assert encode_compact(result) == (
+        "employees[2]{employee_id,name,manager,active}:\n"
+        "EMP001,Rajesh Kumar,EMP010,true\n"
+        'EMP006,"Kumar, Ananya",,false\n'
+        "count: 2\n"
+        'filters: {"department": "Engineering"}'
+    )
+    print("   ✅ tables written once as CSV, bookkeeping dropped")
+
+    # Mixed or nested rows stay JSON
+    assert encode_compact({"rows": [{"a": 1}, {"b": 2}]}) == 'rows: [{"a": 1}, {"b": 2}]'
+    assert encode_compact({"rows": [{"a": [1]}, {"a": [2]}]}) == 'rows: [{"a": [1]}, {"a": [2]}]'
+    assert encode_compact({"text": "two\nlines"}) == 'text: "two\\nlines"'
+    print("   ✅ non-tabular values kept as JSON")
+
+    encoder = ResultEncoder.from_setting({"*": "compact", "search_policies": "json"})
+    assert encoder.encode("search_policies", result) == json.dumps(result)
+    assert encoder.encode("search_employees", result) == encode_compact(result)
+    assert ResultEncoder.from_setting(None).encoding_for("anything") == "json"
+    try:
+        ResultEncoder("yaml")
+        raise AssertionError("accepted an unknown encoding")
+    except ValueError:
+        pass
+    print("   ✅ per-tool encoding choice")
+
+    print("\n✅ Encoding tests passed!")
+
+
+def test_admission_shedding():
+    print("🧪 Testing admission control\n")
+
+    async def shed_reason(admission, **kwargs):
+        try:
+            await admission.acquire(100, **kwargs)
+        except ServerBusy as e:
+            return e.reason
+        return None
+
+    async def run():
+        # 600 requests/minute with a burst of 2: the third waits about 0.1s
+        admission = AdmissionController(requests_per_minute=600, tokens_per_minute=100000,
+                                        max_queue=10, max_wait_seconds=5)
+        admission.requests.capacity = admission.requests.tokens = 2
+        assert await shed_reason(admission) is None
+        assert await shed_reason(admission) is None
+        assert await shed_reason(admission, timeout=0.05) == "deadline"
+
+        # Interactive work (lower number) is admitted before queued batch work
+        order = []
+
+        async def request(name, priority):
+            await admission.acquire(100, priority=priority)
+            order.append(name)
+
+        batch = asyncio.create_task(request("batch", 20))
+        await asyncio.sleep(0.01)
+        interactive = asyncio.create_task(request("interactive", 5))
+        await asyncio.gather(batch, interactive)
+        assert order == ["interactive", "batch"], order
+
+        full = AdmissionController(requests_per_minute=1, tokens_per_minute=100000,
+                                   max_queue=1, max_wait_seconds=120)
+        full.requests.tokens = 0
+        waiting = asyncio.create_task(full.acquire(100))
+        await asyncio.sleep(0.01)
+        assert await shed_reason(full) == "queue_full"
+        waiting.cancel()
+        await asyncio.gather(waiting, return_exceptions=True)
+        # A cancelled request leaves the queue
+        assert full.get_stats()["queue_depth"] == 0
+
+        return admission.get_stats()
+
+    stats = asyncio.run(run())
+    assert stats["admitted"] == 4 and stats["shed_deadline"] == 1
+    print("   ✅ shed on a full queue or a missed deadline, priority order kept")
+
+    print("\n✅ Admission control tests passed!")
+
+
+def test_single_flight():
+    print("🧪 Testing request coalescing\n")
+
+    flights = SingleFlight()
+    calls = []
+
+    async def lookup(key, fail=False):
+        calls.append(key)
+        await asyncio.sleep(0.02)
+        if fail:
+            raise RuntimeError("lookup failed")
+        return f"result {key}"
+
+    async def run():
+        results = await asyncio.gather(
+            *(flights.do("a", lambda: lookup("a")) for _ in range(5)),
+            flights.do("b", lambda: lookup("b"))
+        )
+        assert [result for result, _ in results] == ["result a"] * 5 + ["result b"]
+        assert [shared for _, shared in results] == [False, True, True, True, True, False]
+        assert calls == ["a", "b"]
+
+        # Nothing is cached once the call is done
+        assert await flights.do("a", lambda: lookup("a")) == ("result a", False)
+
+        # Waiters get the leader's exception
+        errors = await asyncio.gather(
+            *(flights.do("c", lambda: lookup("c", fail=True)) for _ in range(3)),
+            return_exceptions=True
+        )
+        assert all(isinstance(e, RuntimeError) for e in errors)
+        assert calls.count("c") == 1
+
+        # A cancelled leader doesn't fail its waiters; one of them runs instead
+        leader = asyncio.create_task(flights.do("d", lambda: lookup("d")))
+        await asyncio.sleep(0)
+        waiter = asyncio.create_task(flights.do("d", lambda: lookup("d")))
+        await asyncio.sleep(0)
+        leader.cancel()
+        assert await waiter == ("result d", False)
+        assert calls.count("d") == 2
+
+    asyncio.run(run())
+    stats = flights.get_stats()
+    assert stats["in_flight"] == 0 and stats["coalesced"] == 6
+    print("   ✅ one execution per key, shared results and errors, cancellation handled")
+
+    print("\n✅ Coalescing tests passed!")
+
+
+def tool_call(name, arguments):
+    return SimpleNamespace(function=SimpleNamespace(name=name, arguments=arguments))
+
+
+def routing_choice(tool_calls=None, finish_reason="stop"):
+    return SimpleNamespace(message=SimpleNamespace(tool_calls=tool_calls), finish_reason=finish_reason)
+
+
+def test_model_escalation():
+    print("🧪 Testing routing model escalation\n")
+
+    tools = [{"type": "function", "function": {
+        "name": "get_employee_info",
+        "parameters": {"type": "object", "properties": {"employee_id": {"type": "string"}},
+                       "required": ["employee_id"]}
+    }}]
+
+    assert find_malformed_tool_call([tool_call("get_employee_info", '{"employee_id": "EMP001"}')], tools) is None
+    assert find_malformed_tool_call([tool_call("get_salary", "{}")], tools) == "unknown tool get_salary"
+    assert find_malformed_tool_call([tool_call("get_employee_info", '{"employee_id": ')], tools) == \
+        "invalid JSON arguments for get_employee_info"
+    assert find_malformed_tool_call([tool_call("get_employee_info", '["EMP001"]')], tools) == \
+        "arguments for get_employee_info are not an object"
+    assert find_malformed_tool_call([tool_call("get_employee_info", None)], tools) == \
+        "get_employee_info is missing employee_id"
+    print("   ✅ unknown tools, bad JSON, non-objects and missing arguments detected")
+
+    good = tool_call("get_employee_info", '{"employee_id": "EMP001"}')
+    bad = tool_call("get_employee_info", "{}")
+    assert routing_escalation_reason(routing_choice([good]), tools) is None
+    assert routing_escalation_reason(routing_choice([good, bad]), tools) == "malformed_tool_call"
+    # Tool calls cut off at the cap are caught as malformed, not as truncated answers
+    assert routing_escalation_reason(routing_choice([tool_call("get_employee_info", '{"emp')], "length"),
+                                     tools) == "malformed_tool_call"
+    assert routing_escalation_reason(routing_choice(), tools) is None
+    assert routing_escalation_reason(routing_choice(finish_reason="length"), tools) == "truncated_answer"
+    print("   ✅ malformed calls and truncated direct answers escalate, others are kept")
+
+    stats = StageStats()
+    stats.record_escalation("malformed_tool_call")
+    stats.record_escalation("malformed_tool_call")
+    stats.record_escalation("truncated_answer")
+    assert stats.get_stats()["escalations"] == {"malformed_tool_call": 2, "truncated_answer": 1}
+    print("   ✅ escalations counted by reason")
+
+    print("\n✅ Model escalation tests passed!")
+
+
+def test_speculative_retrieval():
+    print("🧪 Testing speculative policy retrieval\n")
+
+    question = "What's the leave policy for sick leave?"
+    assert query_similarity(question, "sick leave policy") == 1.0
+    assert query_similarity(question, "maternity leave policy") == 2 / 3
+    assert query_similarity(question, "") == 0.0
+    print("   ✅ condensed model queries are covered by the user's question")
+
+    searches = []
+
+    async def search(query):
+        searches.append(query)
+        await asyncio.sleep(0.01)
+        if "broken" in query:
+            return {"error": True, "unavailable": True, "reason": "timeout"}
+        return {"query": query, "results": ["policy chunk"]}
+
+    async def run():
+        retriever = SpeculativeRetriever(search)
+
+        prefetch = retriever.start(question)
+        assert await retriever.resolve(prefetch, "sick leave policy") == {
+            "query": question, "results": ["policy chunk"]
+        }
+        # A prefetch is used at most once
+        assert await retriever.resolve(prefetch, "sick leave policy") is None
+
+        prefetch = retriever.start(question)
+        assert await retriever.resolve(prefetch, "maternity leave eligibility") is None
+        retriever.discard(prefetch)
+
+        prefetch = retriever.start("broken sick leave policy")
+        assert await retriever.resolve(prefetch, "sick leave policy") is None
+
+        prefetch = retriever.start(question)
+        retriever.discard(prefetch)
+        await prefetch.task
+        return retriever.get_stats()
+
+    stats = asyncio.run(run())
+    assert len(searches) == 4
+    assert (stats["started"], stats["reused"], stats["rejected"], stats["failed"], stats["unused"]) == (4, 1, 1, 1, 1)
+    assert stats["hit_rate"] == 0.25 and stats["wasted_seconds"] > 0
+    print("   ✅ matching prefetches reused once; different queries, errors and unused prefetches discarded")
+
+    print("\n✅ Speculative retrieval tests passed!")
+
+
+def test_tracing():
+    print("🧪 Testing trace spans and the JSONL exporter\n")
+
+    memory = InMemoryExporter()
+    tracer = Tracer([memory])
+
+    def query():
+        with tracer.span("db.query"):
+            pass
+
+    async def turn():
+        with tracer.span("query") as root:
+            with tracer.span("llm.tool_selection"):
+                pass
+            with tracer.span("tool.execute"):
+                await asyncio.gather(asyncio.to_thread(query), asyncio.create_task(asyncio.to_thread(query)))
+        return root
+
+    root = asyncio.run(turn())
+    spans = {span["span_id"]: span for span in tracer.get_trace(root.trace_id)}
+    parents = sorted((span["name"], spans[span["parent_id"]]["name"] if span["parent_id"] else None)
+                     for span in spans.values())
+    assert parents == [("db.query", "tool.execute"), ("db.query", "tool.execute"),
+                       ("llm.tool_selection", "query"), ("query", None), ("tool.execute", "query")]
+    assert len(memory.spans) == 5
+    print("   ✅ nested spans, tasks and worker threads get the right parent")
+
+    try:
+        with tracer.span("tool.execute"):
+            raise ValueError("boom")
+    except ValueError:
+        pass
+    assert memory.spans[-1]["status"] == "error" and memory.spans[-1]["attributes"]["error"] == "ValueError: boom"
+    print("   ✅ failed spans marked as errors")
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "traces", "spans.jsonl")
+        exporter = JsonlExporter(path, max_bytes=4000, backups=2)
+        tracer = Tracer([exporter])
+        for index in range(10):
+            with tracer.span("llm.final_generation", index=index):
+                pass
+        exporter.flush()
+        with open(path, encoding="utf-8") as f:
+            assert [json.loads(line)["attributes"]["index"] for line in f] == list(range(10))
+        print("   ✅ spans written in order by the background writer")
+
+        for index in range(200):
+            with tracer.span("llm.final_generation", index=index):
+                pass
+        tracer.close()
+        assert sorted(os.listdir(os.path.dirname(path))) == ["spans.jsonl", "spans.jsonl.1", "spans.jsonl.2"]
+        assert all(os.path.getsize(f"{path}{suffix}") < 4000 + 300 for suffix in ("", ".1", ".2"))
+        with open(path, encoding="utf-8") as f:
+            assert json.loads(f.readlines()[-1])["attributes"]["index"] == 199
+        print("   ✅ file rotated at max_bytes, older files capped at backups")
+
+    print("\n✅ Tracing tests passed!")
+
+
+def test_llm_record_replay():
+    print("🧪 Testing LLM traffic record and replay\n")
+
+    class FakeGroq:
+        def __init__(self):
+            self.chat = SimpleNamespace(completions=SimpleNamespace(create=self.create))
+            self.calls = 0
+
+        def create(self, **kwargs):
+            self.calls += 1
+            question = kwargs["messages"][-1]["content"]
+            tool_call = SimpleNamespace(id=f"call_{self.calls}", type="function", function=SimpleNamespace(
+                name="get_employee", arguments=json.dumps({"employee_id": "EMP001"})))
+            message = SimpleNamespace(role="assistant", content=f"answer to {question}",
+                                      tool_calls=[tool_call] if "who" in question else None)
+            return SimpleNamespace(choices=[SimpleNamespace(message=message, finish_reason="stop")],
+                                   usage=SimpleNamespace(total_tokens=10 * self.calls))
+
+    def request(question):
+        return {"model": "llama-3.3-70b-versatile", "messages": [{"role": "user", "content": question}],
+                "tools": [{"type": "function", "function": {"name": "get_employee"}}], "tool_choice": "auto"}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "traffic", "llm.jsonl")
+        try:
+            ReplayGroqClient(path)
+            raise AssertionError("replay started without a recording")
+        except FileNotFoundError:
+            pass
+
+        live = FakeGroq()
+        recorder = RecordingGroqClient(live, path)
+        recorded = [recorder.chat.completions.create(**request(q)) for q in ("who is EMP001?", "hello", "thanks")]
+        assert live.calls == 3
+        print("   ✅ recorded requests pass through to the real client")
+
+        replay = ReplayGroqClient(path, latency="none")
+        response = replay.chat.completions.create(**request("hello"))
+        assert response.choices[0].message.content == "answer to hello"
+        assert response.usage.total_tokens == 20
+        response = replay.chat.completions.create(**request("who is EMP001?"))
+        tool_call = response.choices[0].message.tool_calls[0]
+        assert (tool_call.id, tool_call.function.name) == (recorded[0].choices[0].message.tool_calls[0].id, "get_employee")
+        assert json.loads(tool_call.function.arguments) == {"employee_id": "EMP001"}
+        assert replay.stats == {"exact": 2, "fallback": 0, "missing": 0}
+        print("   ✅ exact requests replay their own responses, tool calls included")
+
+        # Unrecorded requests get the next unused record in file order
+        assert replay.chat.completions.create(**request("bye")).choices[0].message.content == "answer to thanks"
+        try:
+            replay.chat.completions.create(**request("bye"))
+            raise AssertionError("replay returned a response past the end of the recording")
+        except RuntimeError:
+            pass
+        assert replay.stats == {"exact": 2, "fallback": 1, "missing": 1}
+        print("   ✅ unknown requests fall back in file order, then run out")
+
+        replay.reset()
+        assert replay.chat.completions.create(**request("bye")).choices[0].message.content == "answer to who is EMP001?"
+        assert live.calls == 3
+        print("   ✅ reset replays from the start, with no live calls")
+
+    print("\n✅ Record/replay tests passed!")
+
+
+def test_batch_resume():
+    print("🧪 Testing batch runner resume\n")
+
+    # Imported here: batch_runner pulls in the orchestrator and its servers
+    from batch_runner import BatchRunner, load_completed, load_queries
+
+    class FakeOrchestrator:
+        def __init__(self):
+            self.histories = {}
+            self.asked = []
+
+        def get_history(self, session_id):
+            return self.histories.get(session_id, [])
+
+        def get_last_turn_stats(self, session_id):
+            return {"tool_rounds": 0}
+
+        async def process_query(self, session_id, query, **kwargs):
+            self.asked.append(query)
+            if "busy" in query:
+                raise ServerBusy("queue full")
+            self.histories.setdefault(session_id, []).append({"role": "assistant", "content": query.upper()})
+            return query.upper()
+
+    lines = [
+        {"id": "q1", "query": "sick leave policy"},
+        {"id": "q2", "query": "who is EMP006", "session_id": "conv"},
+        {"id": "q3", "query": "and their manager", "session_id": "conv"},
+        {"id": "q4", "query": "busy question"},
+        {"query": "latest announcements"},
+    ]
+    previous = [
+        {"id": "q1", "answer": "SICK LEAVE POLICY", "error": None},
+        {"id": "q2", "answer": "WHO IS EMP006", "error": None},
+        {"id": "q3", "answer": None, "error": "ServerBusy: queue full"},
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp:
+        input_path = os.path.join(tmp, "queries.jsonl")
+        output_path = os.path.join(tmp, "answers.jsonl")
+        with open(input_path, "w", encoding="utf-8") as f:
+            f.write("\n".join(json.dumps(line) for line in lines) + "\n\n")
+        with open(output_path, "w", encoding="utf-8") as f:
+            f.write("".join(json.dumps(record) + "\n" for record in previous))
+            f.write('{"id": "q4", "answ')
+
+        queries = load_queries(input_path)
+        assert [(q["id"], q["session_id"]) for q in queries] == [
+            ("q1", "batch-q1"), ("q2", "conv"), ("q3", "conv"), ("q4", "batch-q4"), ("5", "batch-5")
+        ]
+        done = load_completed(output_path)
+        assert done == {"q1", "q2"}
+        print("   ✅ only successful ids count as done; errors and cut-off lines are retried")
+
+        orchestrator = FakeOrchestrator()
+        runner = BatchRunner(orchestrator, output_path, concurrency=2)
+        asyncio.run(runner.run(queries, done))
+
+        assert "sick leave policy" not in orchestrator.asked
+        assert sorted(orchestrator.asked) == ["and their manager", "busy question", "latest announcements",
+                                              "who is EMP006"]
+        # q2 was replayed to rebuild the conversation, before q3
+        assert orchestrator.asked.index("who is EMP006") < orchestrator.asked.index("and their manager")
+        print("   ✅ finished sessions skipped, partly finished ones replayed in order")
+
+        with open(output_path, encoding="utf-8") as f:
+            written = [json.loads(line) for line in f.read().splitlines()[len(previous) + 1:]]
+        assert sorted(record["id"] for record in written) == ["5", "q3", "q4"]
+        assert {record["id"]: bool(record["error"]) for record in written} == {"5": False, "q3": False, "q4": True}
+        assert runner.errors == 1 and len(runner.latencies) == 2
+        assert load_completed(output_path) == {"q1", "q2", "q3", "5"}
+        print("   ✅ only new results appended; shed turns recorded as errors for the next resume")
+
+    print("\n✅ Batch resume tests passed!")
+
+
+def test_server_startup():
+    print("🧪 Testing concurrent server startup\n")
+
+    release = threading.Event()
+
+    def slow():
+        release.wait(5)
+        return "slow server"
+
+    def broken():
+        raise RuntimeError("index missing")
+
+    startup = ServerStartup({"fast": lambda: "fast server", "slow": slow, "broken": broken})
+    assert startup.wait(timeout=0.2) is False
+    stats = startup.get_stats()
+    assert {name: server["status"] for name, server in stats["servers"].items()} == {
+        "fast": "ready", "slow": "starting", "broken": "failed"
+    }
+    assert stats["servers"]["broken"]["error"] == "RuntimeError: index missing"
+    assert stats["complete"] is False and stats["total_seconds"] is None
+    assert startup.get_nowait("fast") == "fast server"
+    assert startup.get_nowait("slow") is None and startup.get_nowait("broken") is None
+    assert startup.is_ready("fast") and not startup.is_ready("slow") and not startup.is_ready("broken")
+    print("   ✅ ready, starting and failed servers reported; wait times out")
+
+    async def use_servers():
+        waiter = asyncio.ensure_future(startup.get("slow"))
+        await asyncio.sleep(0.05)
+        assert not waiter.done()
+        release.set()
+        assert await asyncio.wait_for(waiter, timeout=5) == "slow server"
+        try:
+            await startup.get("broken")
+            raise AssertionError("failed server was returned")
+        except RuntimeError as e:
+            assert str(e) == "index missing"
+
+    asyncio.run(use_servers())
+    print("   ✅ get waits for a starting server and raises a startup failure")
+
+    assert startup.wait(timeout=5) is False
+    stats = startup.get_stats()
+    assert stats["servers"]["slow"]["status"] == "ready" and stats["complete"] is True
+    assert stats["total_seconds"] >= stats["servers"]["slow"]["seconds"] >= 0.2
+    assert ServerStartup({"a": lambda: 1, "b": lambda: 2}).wait(timeout=5) is True
+    print("   ✅ wait is only True when every server started")
+
+    print("\n✅ Server startup tests passed!")
+
+
+# Stands in for mcp_servers/stdio_worker.py: tools/call sleeps for
+# arguments["seconds"], then replies (or exits if arguments["exit"])
+FAKE_WORKER = """
+import json, os, sys, time
+time.sleep(float(os.environ.get("FAKE_WORKER_START_SECONDS", 0)))
+for line in sys.stdin:
+    message = json.loads(line)
+    if "id" not in message:
+        continue
+    result = {}
+    if message["method"] == "tools/call":
+        arguments = message["params"]["arguments"]
+        time.sleep(arguments.get("seconds", 0))
+        if arguments.get("exit"):
+            sys.exit(1)
+        result = {"content": [{"type": "text", "text": json.dumps({"slept": arguments.get("seconds", 0)})}]}
+    print(json.dumps({"jsonrpc": "2.0", "id": message["id"], "result": result}), flush=True)
+"""
+
+
+def fake_worker_script(directory):
+    path = os.path.join(directory, "fake_worker.py")
+    with open(path, "w") as f:
+        f.write(FAKE_WORKER)
+    return path
+
+
+def test_worker_timeout_then_call():
+    print("🧪 Testing a worker call after an earlier call timed out\n")
+
+    original = mcp_pool.WORKER_SCRIPT
+    with tempfile.TemporaryDirectory() as tmp:
+        mcp_pool.WORKER_SCRIPT = fake_worker_script(tmp)
+        try:
+            pool = mcp_pool.MCPWorkerPool("fake", size=1).start()
+
+            async def run():
+                try:
+                    await asyncio.wait_for(pool.call_tool("sleep", {"seconds": 0.2}), timeout=0.05)
+                    raise AssertionError("call did not time out")
+                except asyncio.TimeoutError:
+                    pass
+                assert pool.get_stats()["in_flight"] == 0
+                # The late reply to the first call arrives while this one waits
+                return await asyncio.wait_for(pool.call_tool("sleep", {"seconds": 0}), timeout=5)
+
+            assert asyncio.run(run()) == {"slept": 0}
+            assert pool.get_stats()["in_flight"] == 0
+            print("   ✅ late reply discarded, worker keeps serving")
+
+            try:
+                pool.call_tool_sync("sleep", {"seconds": 0.2}, timeout=0.05)
+                raise AssertionError("call did not time out")
+            except Exception as e:
+                assert not isinstance(e, AssertionError)
+            assert pool.get_stats()["in_flight"] == 0
+            assert pool.call_tool_sync("sleep", {"seconds": 0}, timeout=5) == {"slept": 0}
+            print("   ✅ same for blocking calls")
+            pool.close()
+        finally:
+            mcp_pool.WORKER_SCRIPT = original
+
+    print("\n✅ Worker timeout tests passed!")
+
+
+def test_worker_restart_in_background():
+    print("🧪 Testing dead worker replacement\n")
+
+    original = mcp_pool.WORKER_SCRIPT
+    with tempfile.TemporaryDirectory() as tmp:
+        mcp_pool.WORKER_SCRIPT = fake_worker_script(tmp)
+        try:
+            pool = mcp_pool.MCPWorkerPool("fake", size=2).start()
+            # Replacements take a while to start, like a RAG worker loading its model
+            os.environ["FAKE_WORKER_START_SECONDS"] = "0.5"
+
+            try:
+                pool.call_tool_sync("exit", {"exit": True}, timeout=5)
+                raise AssertionError("worker did not exit")
+            except mcp_pool.MCPError:
+                pass
+
+            start = time.perf_counter()
+            assert pool.call_tool_sync("sleep", {"seconds": 0}, timeout=5) == {"slept": 0}
+            assert time.perf_counter() - start < 0.3
+            assert pool.get_stats()["restarting"] == 1
+            print("   ✅ calls go to the live worker while the dead one restarts")
+
+            # With every worker down, a call waits for a replacement
+            pool.workers[0].process.kill()
+            pool.workers[1].process.kill()
+            time.sleep(0.05)
+            assert pool.call_tool_sync("sleep", {"seconds": 0}, timeout=5) == {"slept": 0}
+            stats = pool.get_stats()
+            assert stats["alive"] >= 1 and stats["restarts"] >= 1
+            print("   ✅ a call waits when no worker is alive")
+
+            pool.close()
+        finally:
+            os.environ.pop("FAKE_WORKER_START_SECONDS", None)
+            mcp_pool.WORKER_SCRIPT = original
+
+    print("\n✅ Worker restart tests passed!")
+
+
+if __name__ == "__main__":
+    test_circuit_breaker()
+    test_cancelled_probe_releases_slot()
+    test_query_budget()
+    test_session_eviction()
+    test_result_encoding()
+    test_admission_shedding()
+    test_single_flight()
+    test_model_escalation()
+    test_speculative_retrieval()
+    test_tracing()
+    test_llm_record_replay()
+    test_batch_resume()
+    test_server_startup()
+    test_worker_timeout_then_call()
+    test_worker_restart_in_background()